@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Model catalog benchmark: header scan vs. persisted index, and search."""
+
+import argparse
+import json
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from playai.ai.catalog import (  # noqa: E402
+    CheckpointCatalog,
+    SearchIndex,
+    describe_model
+)
+
+
+def make_checkpoints(directory: Path, count: int, tensors: int) -> None:
+    """Write safetensors files whose headers list many tensors."""
+    header = {
+        f"layer.{i}.weight": {
+            "dtype": "F16", "shape": [4096, 4096], "data_offsets": [0, 0]
+        }
+        for i in range(tensors)
+    }
+    for i in range(count):
+        header["__metadata__"] = {"modelspec.architecture": "stable-diffusion-xl"}
+        encoded = json.dumps(header).encode("utf-8")
+        (directory / f"model-{i:04}.safetensors").write_bytes(
+            struct.pack("<Q", len(encoded)) + encoded
+        )
+
+
+def timed(catalog: CheckpointCatalog) -> float:
+    """Return milliseconds taken to list the catalog."""
+    start = time.perf_counter()
+    catalog.entries()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_search(count: int, repeat: int = 200) -> None:
+    """Time index builds and paged queries over synthetic entries."""
+    types = ("text-to-image", "text-to-audio", "text-to-video", "text-generation")
+    words = (
+        "portrait", "anime", "landscape", "voice",
+        "chat", "cinematic", "pixel", "sketch"
+    )
+    entries = [
+        {
+            "name": f"{words[i % 8]}-{words[(i // 8) % 8]}-{i}",
+            "model_type": types[i % 4],
+            "description": f"{words[(i * 7) % 8]} style checkpoint number {i}",
+        }
+        for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    index = SearchIndex(entries)
+    build = (time.perf_counter() - start) * 1000
+
+    queries = [
+        {"model_type": "text-to-image", "q": "portrait"},
+        {"q": "anime sketch"},
+        {"q": "cine"},
+        {"model_type": "text-generation"},
+    ]
+    start = time.perf_counter()
+    for i in range(repeat):
+        page = index.query(limit=50, **queries[i % len(queries)])
+        if page.next_cursor:
+            index.query(limit=50, cursor=page.next_cursor, **queries[i % len(queries)])
+    query = (time.perf_counter() - start) * 1000 / (repeat * 2)
+
+    print(f"entries={count}")
+    print(f"search index build:       {build:8.1f} ms")
+    print(f"query page of 50:         {query:8.3f} ms")
+
+
+def main():
+    """List a generated checkpoint directory cold, indexed and warm."""
+    parser = argparse.ArgumentParser(description="Benchmark the model catalog")
+    parser.add_argument("--models", type=int, default=300)
+    parser.add_argument("--entries", type=int, default=20000,
+                        help="Synthetic entries for the search benchmark")
+    parser.add_argument("--tensors", type=int, default=1000,
+                        help="Tensor entries per checkpoint header")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        make_checkpoints(Path(directory), args.models, args.tensors)
+        first = timed(CheckpointCatalog(directory, describe_model))
+        catalog = CheckpointCatalog(directory, describe_model)
+        indexed = timed(catalog)
+        warm = timed(catalog)
+
+    print(f"models={args.models} tensors/header={args.tensors}")
+    print(f"no index (reads headers): {first:8.1f} ms")
+    print(f"new process, with index:  {indexed:8.1f} ms")
+    print(f"warm catalog:             {warm:8.1f} ms")
+    bench_search(args.entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""CLI output format benchmark: serialization time and size per format."""
+
+import argparse
+import io
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from playai.utils.helpers import format_response, utc_timestamp  # noqa: E402
+from playai.utils.wire import FORMATS, check_format, write_response  # noqa: E402
+
+
+def make_catalog(count: int):
+    """Build a catalog-sized list of model entries."""
+    return [
+        {
+            "name": f"checkpoint-{i}",
+            "model_type": "text-to-image",
+            "description": f"Fine-tuned checkpoint number {i}",
+            "parameters": {
+                "width": 1024, "height": 1024, "steps": 30, "guidance_scale": 7.5
+            },
+            "file_path": f"models/checkpoint-{i}.safetensors",
+        }
+        for i in range(count)
+    ]
+
+
+def bench_format(response, fmt: str, repeat: int):
+    """Return (milliseconds per encode, encoded bytes) for one format."""
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        stream = io.BytesIO()
+        start = time.perf_counter()
+        write_response(response, stream, fmt)
+        best = min(best, time.perf_counter() - start)
+        size = len(stream.getvalue())
+    return best * 1000, size
+
+
+def bench_timestamps(count: int) -> None:
+    """Compare per-response timestamp formatting."""
+    start = time.perf_counter()
+    for _ in range(count):
+        datetime.utcnow().isoformat() + "Z"
+    previous = (time.perf_counter() - start) * 1e9 / count
+
+    start = time.perf_counter()
+    for _ in range(count):
+        utc_timestamp()
+    current = (time.perf_counter() - start) * 1e9 / count
+
+    print(
+        f"timestamp: utcnow().isoformat() {previous:6.0f} ns, "
+        f"utc_timestamp() {current:6.0f} ns"
+    )
+
+
+def main():
+    """Encode a large response in every format and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI output formats")
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    response = format_response(make_catalog(args.entries))
+    print(f"entries={args.entries}")
+    baseline = None
+    for fmt in FORMATS:
+        try:
+            check_format(fmt)
+        except ValueError as e:
+            print(f"{fmt:8} skipped: {e}")
+            continue
+        ms, size = bench_format(response, fmt, args.repeat)
+        baseline = baseline or (ms, size)
+        print(
+            f"{fmt:8} {ms:8.1f} ms {size / 1024:10.1f} KiB "
+            f"({baseline[0] / ms:.1f}x faster, {size / baseline[1]:.0%} of pretty size)"
+        )
+    bench_timestamps(100000)
+
+
+if __name__ == "__main__":
+    main()
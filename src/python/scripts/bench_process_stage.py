@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Post-processing throughput benchmark: worker threads vs. process stage."""
+
+import argparse
+import array
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from playai.ai.process_pool import ProcessStage, SharedBuffer  # noqa: E402
+from playai.ai.processing import resample_linear  # noqa: E402
+
+
+def make_clip(samples: int) -> SharedBuffer:
+    """Create a float32 clip in shared memory."""
+    data = array.array("f", (((i % 200) - 100) / 100 for i in range(samples)))
+    return SharedBuffer.from_bytes(data, format="f")
+
+
+def bench(stage: ProcessStage, jobs: int, threads: int, samples: int) -> float:
+    """Return resampled clips per second, submitting from generation threads."""
+    sources = [make_clip(samples) for _ in range(jobs)]
+    targets = [SharedBuffer(samples * 2 * 4, format="f") for _ in range(jobs)]
+    stage.run(resample_linear, sources[0], targets[0])  # start the workers
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(
+            lambda pair: stage.run(resample_linear, *pair),
+            zip(sources, targets)
+        ))
+    elapsed = time.perf_counter() - start
+
+    for buffer in sources + targets:
+        buffer.close()
+    stage.shutdown()
+    return jobs / elapsed
+
+
+def main():
+    """Run both execution paths and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark the process stage")
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=4,
+                        help="Generation worker threads submitting stages")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--samples", type=int, default=48000)
+    args = parser.parse_args()
+
+    options = (args.jobs, args.threads, args.samples)
+    inline = bench(ProcessStage(0), *options)
+    pooled = bench(ProcessStage(args.workers), *options)
+
+    print(f"jobs={args.jobs} threads={args.threads} samples={args.samples}")
+    print(f"inline threads:       {inline:8.1f} clips/s")
+    print(
+        f"process stage ({args.workers:>2}):   {pooled:8.1f} clips/s "
+        f"({pooled / inline:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
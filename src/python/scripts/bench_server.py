@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: socket server vs. spawning the CLI per call."""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from playai.server.socket_server import SocketServer  # noqa: E402
+
+
+def bench_spawn(calls: int) -> float:
+    """Return calls per second when spawning `playai list-models` per call."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        subprocess.run(
+            [sys.executable, "-m", "playai.cli", "list-models"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=Path(__file__).parent.parent / "src"
+        )
+    return calls / (time.perf_counter() - start)
+
+
+async def bench_socket(calls: int, connections: int) -> float:
+    """Return calls per second against a warm socket server."""
+    server = SocketServer(port=0, max_connections=connections)
+    await server.start()
+
+    async def client(count: int) -> None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        for i in range(count):
+            message = {"id": i, "method": "list-models"}
+            writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        for _ in range(count):
+            await reader.readline()
+        writer.close()
+
+    per_client = max(1, calls // connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(per_client) for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    await server.close()
+    return per_client * connections / elapsed
+
+
+def main():
+    """Run both benchmarks and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark the PlayAI socket server")
+    parser.add_argument("--spawn-calls", type=int, default=20)
+    parser.add_argument("--socket-calls", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=100)
+    args = parser.parse_args()
+
+    spawn_rate = bench_spawn(args.spawn_calls)
+    print(
+        f"spawn-per-call: {spawn_rate:10.1f} calls/s "
+        f"({1000 / spawn_rate:.1f} ms/call)"
+    )
+
+    socket_rate = asyncio.run(bench_socket(args.socket_calls, args.connections))
+    print(
+        f"socket server:  {socket_rate:10.1f} calls/s "
+        f"({1000 / socket_rate:.3f} ms/call) "
+        f"across {args.connections} connections"
+    )
+    print(f"speedup:        {socket_rate / spawn_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
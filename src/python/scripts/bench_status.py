@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Status polling benchmark: manager lock vs. lock-free snapshots."""
+
+import argparse
+import sys
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from playai.ai.generator import GenerationManager, GenerationResponse  # noqa: E402
+from playai.ai.registry import GenerationRegistry  # noqa: E402
+
+STATUSES = ("pending", "processing")
+
+
+def make_manager(generations: int) -> GenerationManager:
+    """Create a manager with an in-memory registry holding active generations."""
+    registry = GenerationRegistry("sqlite://", GenerationResponse, flush_interval=0.5)
+    manager = GenerationManager(max_workers=1, registry=registry)
+    for i in range(generations):
+        response = GenerationResponse(
+            success=False,
+            generation_id=f"gen-{i}",
+            status="pending",
+            data={"prompt": "benchmark", "step": 0}
+        )
+        registry.add(response, "text-to-image")
+    return manager
+
+
+def writer(
+    manager: GenerationManager,
+    generations: int,
+    interval: float,
+    stop: threading.Event
+) -> None:
+    """Flip statuses the way worker threads do, under the manager lock."""
+    i = 0
+    while not stop.wait(interval):
+        generation_id = f"gen-{i % generations}"
+        with manager._lock:
+            response = manager.generations.get(generation_id)
+            response.status = STATUSES[i % 2]
+            response.data = {"prompt": "benchmark", "step": i}
+            manager.generations.save(generation_id)
+        i += 1
+
+
+def read_locked(manager: GenerationManager, generation_id: str):
+    """Previous read path: take the manager lock, copy the live response."""
+    with manager._lock:
+        response = manager.generations.get(generation_id)
+    return asdict(response)
+
+
+def read_snapshot(manager: GenerationManager, generation_id: str):
+    """Current read path: fetch the immutable snapshot without locking."""
+    return manager.get_generation_status(generation_id).to_dict()
+
+
+def bench(
+    read,
+    readers: int,
+    writers: int,
+    generations: int,
+    interval: float,
+    seconds: float
+) -> float:
+    """Return reads per second while writers update statuses."""
+    manager = make_manager(generations)
+    stop = threading.Event()
+    counts = [0] * readers
+
+    def reader(index: int) -> None:
+        i = index
+        while not stop.is_set():
+            read(manager, f"gen-{i % generations}")
+            counts[index] += 1
+            i += 7
+
+    threads = [
+        threading.Thread(target=writer, args=(manager, generations, interval, stop))
+        for _ in range(writers)
+    ]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    manager.generations.close()
+    return sum(counts) / seconds
+
+
+def main():
+    """Run both read paths and print a comparison."""
+    parser = argparse.ArgumentParser(description="Benchmark status polling")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--generations", type=int, default=1000)
+    parser.add_argument("--write-interval", type=float, default=0.0005,
+                        help="Seconds each writer waits between status updates")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    options = (
+        args.readers, args.writers, args.generations, args.write_interval, args.seconds
+    )
+    locked = bench(read_locked, *options)
+    snapshot = bench(read_snapshot, *options)
+
+    print(
+        f"readers={args.readers} writers={args.writers} generations={args.generations} "
+        f"write_interval={args.write_interval}s"
+    )
+    print(f"manager lock: {locked:12.0f} reads/s")
+    print(f"snapshots:    {snapshot:12.0f} reads/s ({snapshot / locked:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
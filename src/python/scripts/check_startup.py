@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Startup regression check for lightweight PlayAI CLI commands."""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from playai.utils.startup import STARTUP_COMMANDS, measure_startup  # noqa: E402
+
+
+def main():
+    """Measure every lightweight command and fail if any exceeds its budget."""
+    parser = argparse.ArgumentParser(description="Check PlayAI CLI cold-start budgets")
+    parser.add_argument("commands", nargs="*", default=list(STARTUP_COMMANDS))
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as cwd:
+        for command in args.commands:
+            report = measure_startup(command, cwd=cwd)
+            mark = "ok  " if report.within_budget else "FAIL"
+            print(
+                f"{mark} {command:12} {report.import_ms:7.1f} ms "
+                f"(budget {report.budget_ms} ms)"
+            )
+
+            if report.heavy_modules:
+                print(f"     heavy modules imported: {', '.join(report.heavy_modules)}")
+
+            slowest = sorted(report.modules.items(), key=lambda item: -item[1])
+            for name, ms in slowest[:args.top]:
+                print(f"     {ms:7.1f} ms  {name}")
+
+            failed = failed or not report.within_budget
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
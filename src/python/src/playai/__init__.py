@@ -4,7 +4,17 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .core import main_function
-from .config import settings
+from typing import Any
 
-__all__ = ["main_function", "settings"] 
\ No newline at end of file
+__all__ = ["main_function", "settings"]
+
+
+def __getattr__(name: str) -> Any:
+    # Deferred so that `import playai.cli` stays cheap for lightweight commands.
+    if name == "main_function":
+        from .core import main_function
+        return main_function
+    if name == "settings":
+        from .config import settings
+        return settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}") 
\ No newline at end of file
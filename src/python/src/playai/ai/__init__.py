@@ -1,19 +1,50 @@
 """AI generation functionality for PlayAI."""
 
-from .generator import (
-    generate_content,
-    get_available_models,
-    get_available_loras,
-    get_generation_status,
-    cancel_generation,
-    initialize_backend
-)
+from importlib import import_module
+from typing import Any, Dict
 
-__all__ = [
-    "generate_content",
-    "get_available_models",
-    "get_available_loras",
-    "get_generation_status",
-    "cancel_generation",
-    "initialize_backend"
-] 
\ No newline at end of file
+# Exports are imported on first use, so that importing one submodule (as
+# the lightweight CLI commands do) does not load the whole backend
+_EXPORTS: Dict[str, str] = {
+    **dict.fromkeys(
+        (
+            "generate_content",
+            "get_available_models",
+            "get_available_loras",
+            "query_models",
+            "query_loras",
+            "get_generation_status",
+            "cancel_generation",
+            "subscribe_generation",
+            "get_model_cache_stats",
+            "get_queue_stats",
+            "get_generation_metrics",
+            "get_prometheus_metrics",
+            "initialize_backend",
+        ),
+        "generator"
+    ),
+    "ProgressEvent": "events",
+    "OutputHandle": "outputs",
+    "open_output": "outputs",
+    "QueueFullError": "scheduler",
+    **dict.fromkeys(
+        (
+            "generate_async",
+            "submit_async",
+            "stream",
+            "GenerationHandle",
+            "GenerationFailed",
+        ),
+        "aio"
+    ),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
@@ -0,0 +1,148 @@
+"""Asyncio API for submitting and awaiting generations.
+
+Waiting is driven by the push-based progress events: a coroutine awaiting a
+generation parks on an event-loop future that the publishing worker thread
+resolves, so no thread is tied up per waiting caller and nothing polls.
+Only the generations that are actually running occupy worker threads.
+
+Example::
+
+    result = await generate_async({"model_type": "text-to-image", "prompt": "cat"})
+
+    handle = await submit_async(request_data)
+    async for event in handle.events():
+        print(event.kind, event.step, event.total)
+    result = await handle.result(timeout=30)
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
+
+from .cancellation import GenerationCancelled
+from .events import CANCELLED, COMPLETED, ProgressEvent
+from .generator import generate_content, get_generation_manager
+from .registry import StatusSnapshot
+
+
+class GenerationFailed(RuntimeError):
+    """Raised when an awaited generation failed."""
+
+
+class GenerationHandle:
+    """Awaitable reference to a submitted generation."""
+
+    def __init__(self, generation_id: str):
+        self.generation_id = generation_id
+
+    def __repr__(self) -> str:
+        return f"GenerationHandle({self.generation_id!r})"
+
+    def __await__(self) -> Generator[Any, None, Dict[str, Any]]:
+        return self.result().__await__()
+
+    def status(self) -> Optional[StatusSnapshot]:
+        """Get the current status snapshot."""
+        return get_generation_manager().get_generation_status(self.generation_id)
+
+    def cancel(self) -> bool:
+        """Cancel the generation; see GenerationManager.cancel_generation."""
+        return get_generation_manager().cancel_generation(self.generation_id)
+
+    def events(self) -> AsyncGenerator[ProgressEvent, None]:
+        """Iterate over progress events until the generation finishes."""
+        return stream(self.generation_id)
+
+    async def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for the generation to finish.
+
+        The generation keeps running if the wait times out.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            Generated content
+
+        Raises:
+            asyncio.TimeoutError: If the timeout expires first
+            GenerationFailed: If the generation failed
+            GenerationCancelled: If the generation was cancelled
+        """
+        return await asyncio.wait_for(self._wait(), timeout)
+
+    async def _wait(self) -> Dict[str, Any]:
+        events = stream(self.generation_id)
+        try:
+            async for event in events:
+                if event.terminal:
+                    return _outcome(event)
+        finally:
+            await events.aclose()
+        raise GenerationFailed(
+            f"Generation {self.generation_id} stopped reporting progress"
+        )
+
+
+def _outcome(event: ProgressEvent) -> Dict[str, Any]:
+    if event.kind == COMPLETED:
+        return event.data if event.data is not None else {}
+    if event.kind == CANCELLED:
+        raise GenerationCancelled(f"Generation {event.generation_id} was cancelled")
+    error = (event.data or {}).get("error", "unknown error")
+    raise GenerationFailed(f"Generation {event.generation_id} failed: {error}")
+
+
+async def submit_async(request_data: Dict[str, Any]) -> GenerationHandle:
+    """
+    Start a generation without blocking the event loop.
+
+    Args:
+        request_data: Same request dictionary as generate_content
+
+    Returns:
+        Handle to await or stream the generation
+
+    Raises:
+        QueueFullError: If the generation queue is at capacity
+    """
+    loop = asyncio.get_running_loop()
+    started = await loop.run_in_executor(None, generate_content, request_data)
+    return GenerationHandle(started["generation_id"])
+
+
+async def generate_async(
+    request_data: Dict[str, Any],
+    timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run a generation and wait for its result.
+
+    Args:
+        request_data: Same request dictionary as generate_content
+        timeout: Maximum seconds to wait for the result
+
+    Returns:
+        Generated content
+    """
+    handle = await submit_async(request_data)
+    return await handle.result(timeout)
+
+
+async def stream(
+    generation_id: Optional[str] = None
+) -> AsyncGenerator[ProgressEvent, None]:
+    """
+    Iterate over progress events of one generation, or of all generations.
+
+    A single-generation stream ends after the terminal event.
+
+    Args:
+        generation_id: Generation to follow (None follows every generation)
+
+    Yields:
+        Progress events
+    """
+    with get_generation_manager().subscribe(generation_id) as subscription:
+        async for event in subscription:
+            yield event
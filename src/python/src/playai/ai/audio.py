@@ -0,0 +1,257 @@
+"""Chunked, streaming text-to-audio output.
+
+Long prompts are split into sentence or phrase chunks. Each chunk is
+synthesized and then appended to a growing WAV file. Synthesis and
+encoding run as a two-stage pipeline: while one chunk is converted to PCM
+and written, the next one is being synthesized. The time to the first
+audio is therefore bounded by the first chunk rather than the whole text.
+At most a few chunks of samples are alive at once, so peak memory does not
+grow with the length of the input.
+
+The WAV header is rewritten after every chunk. A player can open the file
+while it grows and play the audio synthesized so far. Files are written
+with ``soundfile`` (install ``playai[audio]``) and fall back to the
+standard library ``wave`` module when it is not installed.
+"""
+
+import queue
+import re
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+SAMPLE_RATE = 24000
+
+# Speaking rate used to size the synthesized audio of a chunk
+CHARS_PER_SECOND = 15.0
+
+# Longest chunk handed to the synthesizer
+MAX_CHUNK_CHARS = 200
+
+# Chunks synthesized ahead of the one being written
+PIPELINE_DEPTH = 2
+
+# libsndfile command that rewrites the header after every write (sndfile.h)
+SFC_SET_UPDATE_HEADER_AUTO = 0x1061
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+|\n\s*\n")
+_PHRASE_END = re.compile(r"(?<=[,—])\s+")
+
+
+def _pack(pieces: Iterable[str], max_chars: int, separator: str = " ") -> Iterator[str]:
+    """Join consecutive pieces into chunks of at most max_chars."""
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(separator) + len(piece) > max_chars:
+            yield current
+            current = piece
+        else:
+            current = f"{current}{separator}{piece}" if current else piece
+    if current:
+        yield current
+
+
+def _phrases(sentence: str, max_chars: int) -> Iterator[str]:
+    """Break an overlong sentence at commas, then at spaces, then anywhere."""
+    for phrase in _pack(_PHRASE_END.split(sentence), max_chars):
+        if len(phrase) <= max_chars:
+            yield phrase
+            continue
+        for words in _pack(phrase.split(), max_chars):
+            for start in range(0, len(words), max_chars):
+                yield words[start:start + max_chars]
+
+
+def split_text(text: str, max_chars: int = MAX_CHUNK_CHARS) -> Iterator[str]:
+    """
+    Split text into chunks for synthesis.
+
+    Every sentence is a chunk of its own, so the first audio waits only for
+    the first sentence. Sentences longer than ``max_chars`` are broken at
+    phrase boundaries, then between words.
+
+    Args:
+        text: Text to speak
+        max_chars: Longest chunk
+
+    Yields:
+        Non-empty chunks in reading order
+    """
+    for sentence in _SENTENCE_END.split(text):
+        sentence = " ".join(sentence.split())
+        if sentence:
+            yield from _phrases(sentence, max_chars)
+
+
+def chunk_samples(text: str, sample_rate: int = SAMPLE_RATE) -> int:
+    """Get the number of samples synthesized for a chunk of text."""
+    return max(1, round(len(text) / CHARS_PER_SECOND * sample_rate))
+
+
+class WavWriter:
+    """Appends 16-bit PCM to a WAV file that stays playable while it grows."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        sample_rate: int = SAMPLE_RATE,
+        channels: int = 1
+    ):
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            import soundfile  # type: ignore[import-not-found]
+        except ImportError:
+            soundfile = None
+
+        self._raw = None
+        if soundfile is not None:
+            self._file = soundfile.SoundFile(
+                str(self.path),
+                "w",
+                samplerate=sample_rate,
+                channels=channels,
+                format="WAV",
+                subtype="PCM_16"
+            )
+            # libsndfile otherwise writes the data size only on close
+            soundfile._snd.sf_command(
+                self._file._file, SFC_SET_UPDATE_HEADER_AUTO, soundfile._ffi.NULL, 1
+            )
+        else:
+            import wave
+
+            self._raw = open(self.path, "wb")
+            self._file = wave.open(self._raw, "wb")
+            self._file.setnchannels(channels)
+            self._file.setsampwidth(2)
+            self._file.setframerate(sample_rate)
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio written so far."""
+        return self.frames / self.sample_rate
+
+    def append(self, pcm: bytes) -> None:
+        """
+        Append native-endian 16-bit samples and update the header.
+
+        Args:
+            pcm: Interleaved int16 samples
+        """
+        if self._raw is None:
+            self._file.buffer_write(pcm, dtype="int16")
+            self._file.flush()
+        else:
+            if sys.byteorder == "big":
+                samples = array("h")
+                samples.frombytes(pcm)
+                samples.byteswap()
+                pcm = samples.tobytes()
+            # wave patches the header's sizes after every write
+            self._file.writeframes(pcm)
+            self._raw.flush()
+        self.frames += len(pcm) // (2 * self.channels)
+
+    def close(self) -> None:
+        """Finish the file."""
+        self._file.close()
+        if self._raw is not None:
+            self._raw.close()
+
+    def __enter__(self) -> "WavWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+_DONE = object()
+
+
+def pipeline(
+    items: Iterable[T],
+    produce: Callable[[T], U],
+    consume: Callable[[U], Any],
+    depth: int = PIPELINE_DEPTH,
+    discard: Optional[Callable[[U], Any]] = None
+) -> int:
+    """
+    Run two stages over a stream of items concurrently.
+
+    ``produce`` runs on the calling thread. ``consume`` runs on a helper
+    thread, in order, on the produced values. At most ``depth`` produced
+    values wait for the consumer, so the producer stays a bounded distance
+    ahead. Once either stage fails, produced values that were not
+    consumed are handed to ``discard`` so they can be freed.
+
+    Args:
+        items: Input items, read lazily
+        produce: First stage
+        consume: Second stage
+        depth: Maximum produced values waiting for the consumer
+        discard: Called with each produced value that is not consumed
+
+    Returns:
+        Number of items consumed
+
+    Raises:
+        Exception: The first error raised by either stage, after both stopped
+    """
+    handoff: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, depth))
+    errors: List[BaseException] = []
+    consumed = 0
+
+    def run_consumer() -> None:
+        nonlocal consumed
+        while True:
+            value = handoff.get()
+            if value is _DONE:
+                return
+            if errors:
+                # Keep draining so the producer never blocks
+                if discard is not None:
+                    discard(value)
+                continue
+            try:
+                consume(value)
+                consumed += 1
+            except BaseException as e:
+                errors.append(e)
+
+    consumer = threading.Thread(
+        target=run_consumer, name="playai-pipeline", daemon=True
+    )
+    consumer.start()
+    try:
+        for item in items:
+            if errors:
+                break
+            handoff.put(produce(item))
+    except BaseException as e:
+        errors.insert(0, e)
+    finally:
+        handoff.put(_DONE)
+        consumer.join()
+
+    if errors:
+        raise errors[0]
+    return consumed
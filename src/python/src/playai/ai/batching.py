@@ -0,0 +1,138 @@
+"""Micro-batching of compatible generation requests.
+
+Requests that share a batch key (same model, LoRA and shape-determining
+parameters) join an open batch instead of queueing on their own. A batch is
+a single scheduler job: it keeps accepting members while it waits in the
+queue, and once a worker picks it up it waits at most ``max_wait`` seconds
+from when it was opened for more members before running them all as one
+batched forward pass. Full batches run without waiting.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .scheduler import GenerationScheduler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Batch:
+    """Requests that will run together in one forward pass."""
+    batch_id: str
+    key: Optional[Hashable]
+    items: Dict[str, Any] = field(default_factory=dict)
+    opened_at: float = field(default_factory=time.monotonic)
+    sealed: bool = False
+
+
+class MicroBatcher:
+    """Groups compatible requests into scheduler jobs."""
+
+    def __init__(
+        self,
+        scheduler: GenerationScheduler,
+        run_batch: Callable[[List[Any]], None],
+        max_batch_size: int = 8,
+        max_wait: float = 0.01
+    ):
+        self.scheduler = scheduler
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._open: Dict[Hashable, Batch] = {}
+        self._members: Dict[str, Batch] = {}
+        self._ids = itertools.count()
+        self._condition = threading.Condition()
+
+    def submit(
+        self,
+        generation_id: str,
+        model_type: str,
+        key: Optional[Hashable],
+        item: Any,
+        priority: int = 0
+    ) -> Batch:
+        """
+        Add a request to an open batch with the same key, or open a new one.
+
+        Args:
+            generation_id: Generation the request belongs to
+            model_type: Model type used by the scheduler
+            key: Batch key (None runs the request on its own)
+            item: Value handed to run_batch for this request
+            priority: Scheduler priority of a newly opened batch
+
+        Returns:
+            The batch the request joined
+
+        Raises:
+            QueueFullError: If a new batch is needed and the queue is full
+        """
+        with self._condition:
+            batch = self._open.get(key) if key is not None else None
+            if batch is None:
+                batch = Batch(batch_id=f"batch-{next(self._ids)}", key=key)
+                self.scheduler.submit(
+                    batch.batch_id,
+                    model_type,
+                    lambda: self._run(batch),
+                    priority=priority
+                )
+                if key is not None:
+                    self._open[key] = batch
+
+            batch.items[generation_id] = item
+            self._members[generation_id] = batch
+            if len(batch.items) >= self.max_batch_size:
+                self._close(batch)
+            self._condition.notify_all()
+            return batch
+
+    def cancel(self, generation_id: str) -> bool:
+        """
+        Remove a request from a batch that has not started yet.
+
+        The batch's scheduler job is dropped once it has no members left.
+
+        Returns:
+            True if the request was removed before running
+        """
+        with self._condition:
+            batch = self._members.pop(generation_id, None)
+            if batch is None or batch.sealed:
+                return False
+
+            del batch.items[generation_id]
+            if not batch.items:
+                self._close(batch)
+                self.scheduler.cancel(batch.batch_id)
+            return True
+
+    def _close(self, batch: Batch) -> None:
+        if batch.key is not None and self._open.get(batch.key) is batch:
+            del self._open[batch.key]
+
+    def _run(self, batch: Batch) -> None:
+        with self._condition:
+            deadline = batch.opened_at + self.max_wait
+            while 0 < len(batch.items) < self.max_batch_size and batch.key is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._open.get(batch.key) is not batch:
+                    break
+                self._condition.wait(remaining)
+
+            batch.sealed = True
+            self._close(batch)
+            for generation_id in batch.items:
+                self._members.pop(generation_id, None)
+            items = list(batch.items.values())
+
+        if items:
+            if len(items) > 1:
+                logger.debug(f"Running {batch.batch_id} with {len(items)} requests")
+            self.run_batch(items)
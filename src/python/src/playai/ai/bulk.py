@@ -0,0 +1,237 @@
+"""Bulk generation of request streams for offline dataset jobs.
+
+``run_bulk`` reads generation requests one JSON object per line, keeps up to
+``max_in_flight`` of them submitted to the generation manager at a time and
+yields one result record per request. All completions are collected from a
+single event subscription, so no thread waits on any one generation.
+
+A ``BulkCheckpoint`` records which input lines have finished. Re-running the
+same input with the same checkpoint skips them, so a crashed job resumes
+where it stopped instead of repeating finished work. A line is marked only
+when the consumer asks for the record after it, i.e. after its own record
+was written, so a crash may repeat a record but never loses one.
+"""
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from .generator import (
+    TERMINAL_STATUSES,
+    GenerationManager,
+    get_generation_manager,
+    parse_request
+)
+from .scheduler import QueueFullError
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a completion before checking the queue again
+POLL_INTERVAL = 0.5
+
+
+class BulkCheckpoint:
+    """Append-only record of finished input line numbers."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Load the finished lines of an earlier run, if any.
+
+        The file holds one finished line number per line. It is compacted on
+        load to a single ``<=N`` line meaning "every line below N" followed
+        by the finished lines above that watermark.
+        """
+        self.path = Path(path)
+        self.watermark = 0
+        self._done: Set[int] = set()
+        if self.path.exists():
+            self._load()
+            self._compact()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __contains__(self, index: int) -> bool:
+        return index < self.watermark or index in self._done
+
+    def __len__(self) -> int:
+        return self.watermark + len(self._done)
+
+    def mark(self, index: int) -> None:
+        """Record that an input line has finished."""
+        if index in self:
+            return
+        self._done.add(index)
+        while self.watermark in self._done:
+            self._done.remove(self.watermark)
+            self.watermark += 1
+        self._file.write(f"{index}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the checkpoint file."""
+        self._file.close()
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                try:
+                    if line.startswith("<="):
+                        self.watermark = max(self.watermark, int(line[2:]))
+                    elif line:
+                        self._done.add(int(line))
+                except ValueError:
+                    # A line cut short by a crash; that item simply runs again
+                    logger.warning(f"Ignoring malformed checkpoint line: {line!r}")
+        self._done = {index for index in self._done if index >= self.watermark}
+        while self.watermark in self._done:
+            self._done.remove(self.watermark)
+            self.watermark += 1
+
+    def _compact(self) -> None:
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(f"<={self.watermark}\n")
+            for index in sorted(self._done):
+                f.write(f"{index}\n")
+        os.replace(tmp_path, self.path)
+
+
+def _record(
+    index: int,
+    request_data: Any,
+    generation_id: Optional[str] = None,
+    status: str = "failed",
+    data: Any = None,
+    error: Optional[str] = None
+) -> Dict[str, Any]:
+    record = {"index": index, "generation_id": generation_id, "status": status}
+    if isinstance(request_data, dict) and "id" in request_data:
+        record["id"] = request_data["id"]
+    if data is not None:
+        record["data"] = data
+    if error is not None:
+        record["error"] = error
+    return record
+
+
+def run_bulk(
+    lines: Iterable[str],
+    max_in_flight: int = 64,
+    ordered: bool = False,
+    checkpoint: Optional[BulkCheckpoint] = None,
+    manager: Optional[GenerationManager] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run a stream of generation requests with bounded concurrency.
+
+    Each non-blank line is a generate request object; an optional ``id``
+    field is copied to its result record. Lines are read lazily, so inputs
+    of any size are processed in constant memory.
+
+    Args:
+        lines: Request lines, e.g. an open file or sys.stdin
+        max_in_flight: Maximum requests submitted but not yet yielded
+        ordered: Yield records in input order instead of completion order
+        checkpoint: Skip lines it lists and mark lines once their records are consumed
+        manager: Generation manager (default: the process-wide one)
+
+    Yields:
+        Records with the input line ``index``, ``id``, ``generation_id``,
+        ``status`` and either ``data`` or ``error``
+    """
+    manager = manager or get_generation_manager()
+    max_in_flight = max(1, max_in_flight)
+    pending: Dict[str, List[tuple]] = {}
+    finished: Dict[int, Dict[str, Any]] = {}
+    submitted: Deque[int] = deque()  # Unyielded indices in input order (ordered mode)
+    in_flight = 0
+    source = enumerate(lines)
+    exhausted = False
+
+    def finish(index: int, record: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        nonlocal in_flight
+        if not ordered:
+            in_flight -= 1
+            yield record
+            if checkpoint is not None:
+                checkpoint.mark(index)
+            return
+        finished[index] = record
+        while submitted and submitted[0] in finished:
+            head = submitted.popleft()
+            in_flight -= 1
+            yield finished.pop(head)
+            if checkpoint is not None:
+                checkpoint.mark(head)
+
+    def settle(generation_id: str) -> Iterator[Dict[str, Any]]:
+        snapshot = manager.get_generation_status(generation_id)
+        for index, request_data in pending.pop(generation_id, ()):
+            if snapshot is None:
+                record = _record(
+                    index, request_data, generation_id, error="Generation expired"
+                )
+            else:
+                record = _record(
+                    index,
+                    request_data,
+                    generation_id,
+                    snapshot.status,
+                    snapshot.data if snapshot.status == "completed" else None,
+                    snapshot.error
+                )
+            yield from finish(index, record)
+
+    with manager.subscribe() as subscription:
+        while not exhausted or in_flight:
+            # Fill the window
+            while not exhausted and in_flight < max_in_flight:
+                try:
+                    index, line = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if not line.strip() or (checkpoint is not None and index in checkpoint):
+                    continue
+
+                in_flight += 1
+                if ordered:
+                    submitted.append(index)
+                request_data = None
+                try:
+                    request_data = json.loads(line)
+                    request = parse_request(request_data)
+                    while True:
+                        try:
+                            generation_id = manager.start_generation(request)
+                            break
+                        except QueueFullError:
+                            time.sleep(POLL_INTERVAL / 10)
+                except Exception as e:
+                    yield from finish(index, _record(index, request_data, error=str(e)))
+                    continue
+
+                pending.setdefault(generation_id, []).append((index, request_data))
+                snapshot = manager.get_generation_status(generation_id)
+                if snapshot is not None and snapshot.status in TERMINAL_STATUSES:
+                    yield from settle(generation_id)
+
+            if not in_flight:
+                continue
+
+            # Wait for completions
+            event = subscription.get(POLL_INTERVAL)
+            if event is None:
+                # Catch up on generations whose terminal event never reached us
+                for generation_id in list(pending):
+                    snapshot = manager.get_generation_status(generation_id)
+                    if snapshot is None or snapshot.status in TERMINAL_STATUSES:
+                        yield from settle(generation_id)
+            while event is not None:
+                if event.terminal and event.generation_id in pending:
+                    yield from settle(event.generation_id)
+                event = subscription.get(0)
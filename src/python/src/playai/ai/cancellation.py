@@ -0,0 +1,44 @@
+"""Cooperative cancellation for running generations."""
+
+import threading
+from typing import Optional
+
+
+class GenerationCancelled(Exception):
+    """Raised inside a generation once it has been cancelled."""
+
+
+class CancellationToken:
+    """Flag checked by generation code between inference steps."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Request cancellation. Safe to call from any thread."""
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Stop the current generation if cancellation was requested.
+
+        Raises:
+            GenerationCancelled: If the token has been cancelled
+        """
+        if self._event.is_set():
+            raise GenerationCancelled()
+
+    def sleep(self, seconds: Optional[float]) -> None:
+        """
+        Wait for up to ``seconds``, waking immediately on cancellation.
+
+        Raises:
+            GenerationCancelled: If the token is cancelled before or while waiting
+        """
+        if self._event.wait(seconds):
+            raise GenerationCancelled()
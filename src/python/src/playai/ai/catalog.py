@@ -0,0 +1,460 @@
+"""Model and LoRA catalog discovered from local checkpoint files.
+
+Checkpoints dropped into the models or LoRA directory are listed next to the
+built-in entries. Metadata comes from the file header only (the JSON header
+of a safetensors file), so weights are never read. What was read is kept in
+an index file inside the directory, keyed by each file's mtime and size, and
+a scan only re-reads headers of files that were added or changed. Listing a
+directory of hundreds of checkpoints therefore costs one ``scandir`` and a
+``stat`` per file, even in a fresh process.
+
+Browsing goes through an in-memory inverted index over each entry's name,
+description and model type, rebuilt whenever the entries change. Queries
+return one page at a time with an opaque cursor for the next page and the
+total number of matches.
+"""
+
+import base64
+import binascii
+import bisect
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIXES = (".safetensors", ".ckpt", ".pt", ".pth", ".bin", ".gguf")
+INDEX_NAME = ".playai-index.json"
+INDEX_VERSION = 1
+
+# Refuse headers larger than this; real ones are at most a few megabytes
+MAX_HEADER_BYTES = 100 * 1024 ** 2
+
+# Substrings of modelspec.architecture mapped to model types, checked in order
+ARCHITECTURE_TYPES = (
+    ("video", "text-to-video"),
+    ("audio", "text-to-audio"),
+    ("tts", "text-to-audio"),
+    ("whisper", "text-to-audio"),
+    ("llama", "text-generation"),
+    ("mistral", "text-generation"),
+    ("gpt", "text-generation"),
+    ("diffusion", "text-to-image"),
+)
+DEFAULT_MODEL_TYPE = "text-to-image"
+
+# Fields of an entry that free-text queries match against
+SEARCH_FIELDS = ("name", "description", "model_type")
+DEFAULT_PAGE_SIZE = 50
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+Describe = Callable[[Path, Dict[str, str]], Dict[str, Any]]
+
+
+def read_safetensors_metadata(path: Union[str, Path]) -> Dict[str, str]:
+    """
+    Read the ``__metadata__`` of a safetensors file without loading tensors.
+
+    Args:
+        path: Checkpoint file
+
+    Returns:
+        Metadata strings (empty if the header has none)
+
+    Raises:
+        ValueError: If the file is not a valid safetensors file
+        OSError: If the file cannot be read
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(8)
+        if len(prefix) < 8:
+            raise ValueError("File is too short for a safetensors header")
+        (length,) = struct.unpack("<Q", prefix)
+        if length > MAX_HEADER_BYTES:
+            raise ValueError(f"Header of {length} bytes exceeds {MAX_HEADER_BYTES}")
+        header = json.loads(f.read(length))
+
+    if not isinstance(header, dict):
+        raise ValueError("Header is not a JSON object")
+    metadata = header.get("__metadata__") or {}
+    if not isinstance(metadata, dict):
+        raise ValueError("__metadata__ is not an object")
+    return {str(key): str(value) for key, value in metadata.items()}
+
+
+def _model_type(metadata: Dict[str, str]) -> str:
+    if "playai.model_type" in metadata:
+        return metadata["playai.model_type"]
+    architecture = metadata.get("modelspec.architecture", "").lower()
+    for token, model_type in ARCHITECTURE_TYPES:
+        if token in architecture:
+            return model_type
+    return DEFAULT_MODEL_TYPE
+
+
+def _description(metadata: Dict[str, str]) -> str:
+    return metadata.get("modelspec.description") or metadata.get("description", "")
+
+
+def describe_model(path: Path, metadata: Dict[str, str]) -> Dict[str, Any]:
+    """Build a model entry (ModelInfo fields) from checkpoint metadata."""
+    try:
+        parameters = json.loads(metadata.get("playai.parameters", "{}"))
+    except ValueError:
+        parameters = {}
+    return {
+        "name": path.stem,
+        "model_type": _model_type(metadata),
+        "description": _description(metadata),
+        "parameters": parameters if isinstance(parameters, dict) else {},
+        "file_path": str(path),
+    }
+
+
+def describe_lora(path: Path, metadata: Dict[str, str]) -> Dict[str, Any]:
+    """Build a LoRA entry (LoraInfo fields) from adapter metadata."""
+    try:
+        strength = float(metadata.get("playai.strength", 1.0))
+    except ValueError:
+        strength = 1.0
+    return {
+        "name": path.stem,
+        "model_type": _model_type(metadata),
+        "description": _description(metadata),
+        "strength": strength,
+        "file_path": str(path),
+    }
+
+
+def tokenize(text: Any) -> List[str]:
+    """Split text into lowercase alphanumeric search tokens."""
+    return TOKEN_PATTERN.findall(str(text).lower()) if text else []
+
+
+def encode_cursor(position: int) -> str:
+    """Encode the position of the last entry on a page as a cursor."""
+    return base64.urlsafe_b64encode(f"p{position}".encode("ascii")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor into the position of the last entry already returned.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        decoded = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii")
+        if decoded.startswith("p"):
+            return int(decoded[1:])
+    except (binascii.Error, UnicodeError, ValueError):
+        pass
+    raise ValueError(f"Invalid cursor: {cursor}")
+
+
+@dataclass
+class CatalogPage:
+    """One page of catalog query results."""
+    items: List[Dict[str, Any]]
+    total: int
+    next_cursor: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "items": self.items,
+            "total": self.total,
+            "next_cursor": self.next_cursor,
+        }
+
+
+class SearchIndex:
+    """Inverted index from search tokens and model types to entry positions."""
+
+    def __init__(self, entries: List[Dict[str, Any]], cache_size: int = 64):
+        """
+        Args:
+            entries: Entries to index, in listing order
+            cache_size: Number of recent match lists kept for paging
+        """
+        self.entries = entries
+        self.cache_size = cache_size
+        self._postings: Dict[str, List[int]] = {}
+        self._types: Dict[Any, List[int]] = {}
+        self._results: "OrderedDict[tuple, List[int]]" = OrderedDict()
+
+        for position, entry in enumerate(entries):
+            tokens = set()
+            for name in SEARCH_FIELDS:
+                tokens.update(tokenize(entry.get(name)))
+            for token in tokens:
+                self._postings.setdefault(token, []).append(position)
+            self._types.setdefault(entry.get("model_type"), []).append(position)
+        self._tokens = sorted(self._postings)
+
+    def search(
+        self, model_type: Optional[str] = None, q: Optional[str] = None
+    ) -> List[int]:
+        """
+        Find matching entries.
+
+        Every query token must match the start of a token of the entry.
+
+        Args:
+            model_type: Only entries of this model type
+            q: Free-text query
+
+        Returns:
+            Sorted positions of the matching entries
+        """
+        terms = tuple(sorted(set(tokenize(q))))
+        key = (model_type, terms)
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        candidates: Optional[Set[int]] = None
+        if model_type is not None:
+            candidates = set(self._types.get(model_type, ()))
+        for term in terms:
+            matches = self._prefix_matches(term)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                break
+
+        if candidates is None:
+            positions = list(range(len(self.entries)))
+        else:
+            positions = sorted(candidates)
+
+        self._results[key] = positions
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return positions
+
+    def query(
+        self,
+        model_type: Optional[str] = None,
+        q: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> CatalogPage:
+        """
+        Get one page of matching entries.
+
+        Args:
+            model_type: Only entries of this model type
+            q: Free-text query
+            limit: Maximum entries on the page (0 only counts matches)
+            cursor: next_cursor of the previous page
+
+        Returns:
+            The page, the total number of matches and the next cursor
+
+        Raises:
+            ValueError: If the limit is negative or the cursor is malformed
+        """
+        if limit < 0:
+            raise ValueError("limit must not be negative")
+        positions = self.search(model_type, q)
+        start = bisect.bisect_right(positions, decode_cursor(cursor)) if cursor else 0
+        page = positions[start:start + limit]
+
+        next_cursor = None
+        if page and start + limit < len(positions):
+            next_cursor = encode_cursor(page[-1])
+        return CatalogPage(
+            items=[dict(self.entries[position]) for position in page],
+            total=len(positions),
+            next_cursor=next_cursor
+        )
+
+    def _prefix_matches(self, term: str) -> Set[int]:
+        matches: Set[int] = set()
+        start = bisect.bisect_left(self._tokens, term)
+        for token in self._tokens[start:]:
+            if not token.startswith(term):
+                break
+            matches.update(self._postings[token])
+        return matches
+
+
+class CheckpointCatalog:
+    """Entries of one checkpoint directory merged over built-in entries."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        describe: Describe,
+        builtin: Sequence[Dict[str, Any]] = (),
+        rescan_interval: float = 0.0
+    ):
+        """
+        Args:
+            directory: Directory to scan (need not exist)
+            describe: Turns a file path and its metadata into an entry
+            builtin: Entries listed even without files; files override by name
+            rescan_interval: Seconds during which the last scan is reused
+        """
+        self.directory = Path(directory)
+        self.describe = describe
+        self.builtin = list(builtin)
+        self.rescan_interval = rescan_interval
+        self.headers_read = 0
+        self._scanned_at: Optional[float] = None
+        self._search: Optional[SearchIndex] = None
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Get every entry, rescanning files whose mtime or size changed.
+
+        Returns:
+            Built-in entries followed by discovered ones, as new dictionaries
+        """
+        with self._lock:
+            return [dict(entry) for entry in self._current()]
+
+    def query(
+        self,
+        model_type: Optional[str] = None,
+        q: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> CatalogPage:
+        """
+        Search the entries one page at a time; see SearchIndex.query.
+
+        Cursors stay valid until the directory contents change.
+        """
+        with self._lock:
+            entries = self._current()
+            if self._search is None:
+                self._search = SearchIndex(entries)
+            return self._search.query(model_type, q, limit, cursor)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get one entry by name."""
+        for entry in self.entries():
+            if entry["name"] == name:
+                return entry
+        return None
+
+    def _current(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        if (
+            self._entries is not None
+            and self._scanned_at is not None
+            and now - self._scanned_at < self.rescan_interval
+        ):
+            return self._entries
+
+        changed = self._refresh()
+        self._scanned_at = now
+        if changed or self._entries is None:
+            self._entries = self._merge()
+            self._search = None
+        return self._entries
+
+    @property
+    def index_path(self) -> Path:
+        """Location of the persisted index."""
+        return self.directory / INDEX_NAME
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        files: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(CHECKPOINT_SUFFIXES):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return files
+
+    def _refresh(self) -> bool:
+        index = self._load_index()
+        files = self._scan()
+        changed = False
+
+        for name in [name for name in index if name not in files]:
+            del index[name]
+            changed = True
+
+        for name, (mtime_ns, size) in files.items():
+            cached = index.get(name)
+            if cached and cached["mtime_ns"] == mtime_ns and cached["size"] == size:
+                continue
+            path = self.directory / name
+            index[name] = {
+                "mtime_ns": mtime_ns,
+                "size": size,
+                "entry": self.describe(path, self._read_metadata(path)),
+            }
+            changed = True
+
+        if changed:
+            self._save_index(index)
+        return changed
+
+    def _read_metadata(self, path: Path) -> Dict[str, str]:
+        if path.suffix != ".safetensors":
+            return {}
+        self.headers_read += 1
+        try:
+            return read_safetensors_metadata(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read header of {path}: {e}")
+            return {}
+
+    def _merge(self) -> List[Dict[str, Any]]:
+        discovered = {
+            record["entry"]["name"]: record["entry"]
+            for _, record in sorted(self._load_index().items())
+        }
+        entries = [discovered.pop(entry["name"], entry) for entry in self.builtin]
+        return entries + list(discovered.values())
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is None:
+            self._index = {}
+            try:
+                data = json.loads(self.index_path.read_text(encoding="utf-8"))
+                if data.get("version") == INDEX_VERSION:
+                    self._index = data["files"]
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                logger.warning(
+                    f"Ignoring unreadable catalog index {self.index_path}: {e}"
+                )
+        return self._index
+
+    def _save_index(self, index: Dict[str, Dict[str, Any]]) -> None:
+        if not self.directory.is_dir():
+            return
+        data = json.dumps({"version": INDEX_VERSION, "files": index}, sort_keys=True)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(data, encoding="utf-8")
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Failed to write catalog index {self.index_path}: {e}")
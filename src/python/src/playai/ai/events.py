@@ -0,0 +1,232 @@
+"""Push-based progress events for generations.
+
+The generation manager publishes a :class:`ProgressEvent` whenever a
+generation is queued, starts, finishes an inference step, has a partial
+preview, or reaches a terminal state. Consumers subscribe to one generation
+(or all of them) and read events through a blocking iterator or an async
+iterator instead of polling the status.
+
+A subscriber that falls behind never blocks the publisher: pending ``step``
+and ``preview`` events for the same generation are coalesced so only the
+latest one is delivered, while lifecycle events are always kept.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+
+QUEUED = "queued"
+STARTED = "started"
+STEP = "step"
+PREVIEW = "preview"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+TERMINAL_EVENTS = (COMPLETED, FAILED, CANCELLED)
+COALESCED_EVENTS = (STEP, PREVIEW)
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """A single progress update for a generation."""
+    generation_id: str
+    kind: str
+    step: Optional[int] = None
+    total: Optional[int] = None
+    data: Optional[Dict[str, Any]] = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def terminal(self) -> bool:
+        """Whether this is the last event of its generation."""
+        return self.kind in TERMINAL_EVENTS
+
+
+class Subscription:
+    """Buffered stream of events for one subscriber."""
+
+    def __init__(self, bus: "EventBus", generation_id: Optional[str] = None):
+        self.generation_id = generation_id
+        self.coalesced = 0
+        self._bus = bus
+        self._pending: "OrderedDict[Hashable, ProgressEvent]" = OrderedDict()
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._waiters: List[Tuple["asyncio.AbstractEventLoop", "asyncio.Future"]] = []
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """Whether the subscription has been closed."""
+        return self._closed
+
+    def push(self, event: ProgressEvent) -> None:
+        """Queue an event for this subscriber without blocking."""
+        if event.kind in COALESCED_EVENTS:
+            key: Hashable = (event.generation_id, event.kind)
+        else:
+            key = next(self._seq)
+
+        with self._condition:
+            if self._closed:
+                return
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = event
+            self._condition.notify()
+            waiters, self._waiters = self._waiters, []
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[ProgressEvent]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits forever)
+
+        Returns:
+            Next event, or None on timeout or once closed and drained
+        """
+        with self._condition:
+            if not self._pending and not self._closed:
+                self._condition.wait(timeout)
+            return self._pop()
+
+    def close(self) -> None:
+        """Stop receiving events; buffered events can still be read."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            waiters, self._waiters = self._waiters, []
+        self._bus.unsubscribe(self)
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[ProgressEvent]:
+        while True:
+            event = self.get()
+            if event is None:
+                return
+            yield event
+            if self._finished(event):
+                return
+
+    def __aiter__(self) -> AsyncIterator[ProgressEvent]:
+        return self._aiter()
+
+    async def _aiter(self) -> AsyncIterator[ProgressEvent]:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                event = self._pop()
+                if event is None:
+                    if self._closed:
+                        return
+                    future = loop.create_future()
+                    self._waiters.append((loop, future))
+            if event is None:
+                await future
+                continue
+            yield event
+            if self._finished(event):
+                return
+
+    def _pop(self) -> Optional[ProgressEvent]:
+        if not self._pending:
+            return None
+        return self._pending.popitem(last=False)[1]
+
+    def _finished(self, event: ProgressEvent) -> bool:
+        if self.generation_id is not None and event.terminal:
+            self.close()
+            return True
+        return False
+
+
+def _resolve(future: "asyncio.Future") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class EventBus:
+    """Fan-out of progress events to subscriptions."""
+
+    def __init__(self) -> None:
+        self._by_generation: Dict[str, Set[Subscription]] = {}
+        self._all: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, generation_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to one generation's events, or to all events.
+
+        A subscription to a single generation ends after its terminal event.
+
+        Args:
+            generation_id: Generation to follow (None follows every generation)
+
+        Returns:
+            New subscription
+        """
+        subscription = Subscription(self, generation_id)
+        with self._lock:
+            if generation_id is None:
+                self._all.add(subscription)
+            else:
+                self._by_generation.setdefault(generation_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription from the bus."""
+        with self._lock:
+            if subscription.generation_id is None:
+                self._all.discard(subscription)
+                return
+
+            subscribers = self._by_generation.get(subscription.generation_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_generation[subscription.generation_id]
+
+    def publish(self, event: ProgressEvent) -> None:
+        """Deliver an event to every matching subscription."""
+        with self._lock:
+            targets = list(self._all)
+            targets.extend(self._by_generation.get(event.generation_id, ()))
+
+        for subscription in targets:
+            subscription.push(event)
+
+    def has_subscribers(self, generation_id: str) -> bool:
+        """Whether anyone is listening to a generation's events."""
+        with self._lock:
+            return bool(self._all) or generation_id in self._by_generation
@@ -1,19 +1,41 @@
-"""AI content generation module."""
+"""AI content generation module.
+
+Only what the lightweight CLI commands need is imported at module load.
+The scheduler, caches, metrics and output stores are imported when the
+first GenerationManager is created.
+"""
+
+from __future__ import annotations
 
-import asyncio
-import json
 import logging
+import random
 import threading
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, asdict
+from contextlib import ExitStack
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
 from enum import Enum
 
 from ..config import settings
-from ..utils.helpers import format_response
+from ..utils import profiling
+from ..utils.lazy import lazy_import
+from .catalog import DEFAULT_PAGE_SIZE, CheckpointCatalog, describe_lora, describe_model
+from .cancellation import CancellationToken, GenerationCancelled
+from . import events
+from .events import EventBus, ProgressEvent, Subscription
+
+if TYPE_CHECKING:
+    from . import metrics
+    from .metrics import Timings
+    from .model_cache import LoadedModel
+    from .process_pool import ProcessStage
+    from .registry import GenerationRegistry, StatusSnapshot
+    from .result_cache import ResultCache
+    from .scheduler import GenerationScheduler
+else:
+    metrics = lazy_import(f"{__package__}.metrics")
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +56,7 @@ class GenerationRequest:
     parameters: Dict[str, Any]
     model_name: Optional[str] = None
     lora_name: Optional[str] = None
+    priority: int = 0
 
 
 @dataclass
@@ -66,16 +89,281 @@ class LoraInfo:
     file_path: Optional[str] = None
 
 
+@dataclass(eq=False)
+class GenerationContext:
+    """Per-generation state handed to the model-specific generate methods."""
+    generation_id: str
+    request: GenerationRequest
+    token: CancellationToken
+    events: EventBus
+    resources: ExitStack = field(default_factory=ExitStack)
+    model: Optional[LoadedModel] = None
+    lora: Optional[LoadedModel] = None
+    batch: List["GenerationContext"] = field(default_factory=list, repr=False)
+    steps_run: Optional[int] = None
+    stage: Optional[ProcessStage] = field(default=None, repr=False)
+    timings: Timings = field(default_factory=lambda: metrics.Timings(), repr=False)
+    
+    @property
+    def model_name(self) -> str:
+        """Name of the loaded model."""
+        if self.model is None:
+            raise RuntimeError("No model is loaded for this generation")
+        return self.model.name
+    
+    def check(self) -> None:
+        """Stop here if the generation has been cancelled."""
+        self.token.raise_if_cancelled()
+    
+    def step(self, step: int, total: int) -> None:
+        """Report a finished inference step, then check for cancellation."""
+        self.events.publish(ProgressEvent(self.generation_id, events.STEP, step, total))
+        self.check()
+    
+    def preview(self, data: Dict[str, Any], step: Optional[int] = None,
+                total: Optional[int] = None) -> None:
+        """Announce that a partial preview is available."""
+        self.events.publish(
+            ProgressEvent(self.generation_id, events.PREVIEW, step, total, data)
+        )
+    
+    def run_stage(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a CPU-bound stage function in the process pool, if there is one."""
+        from .process_pool import ProcessStage
+        
+        stage = self.stage or ProcessStage()
+        return stage.run(fn, *args, token=self.token)
+
+
+# Default number of inference steps per model type, and the request
+# parameter that overrides it
+INFERENCE_STEPS = {
+    ModelType.TEXT_TO_IMAGE.value: ("steps", 50),
+    ModelType.TEXT_TO_AUDIO.value: ("chunks", 10),
+    ModelType.TEXT_TO_VIDEO.value: ("frames", 25),
+    ModelType.TEXT_GENERATION.value: ("max_tokens", 256),
+}
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Request parameters that must match for generations to share a forward pass
+BATCH_PARAMETERS = {
+    ModelType.TEXT_TO_IMAGE.value: ("width", "height", "steps"),
+    ModelType.TEXT_TO_AUDIO.value: ("chunks",),
+    ModelType.TEXT_TO_VIDEO.value: ("width", "height", "frames", "fps"),
+    ModelType.TEXT_GENERATION.value: (),
+}
+
+# Model used when a request does not name one
+DEFAULT_MODEL_NAMES = {
+    ModelType.TEXT_TO_IMAGE.value: "default_image_model",
+    ModelType.TEXT_TO_AUDIO.value: "default_audio_model",
+    ModelType.TEXT_TO_VIDEO.value: "default_video_model",
+    ModelType.TEXT_GENERATION.value: "default_text_model",
+}
+
+# Approximate resident size of each model's weights, used for cache budgeting
+MODEL_SIZE_ESTIMATES = {
+    "stable-diffusion-xl": 6_940_000_000,
+    "whisper-large": 3_090_000_000,
+    "llama-2-7b": 13_500_000_000,
+    "stable-video-diffusion": 9_560_000_000,
+}
+DEFAULT_MODEL_SIZE = 2 * 1024 ** 3
+
+# Approximate size of LoRA adapter weights
+DEFAULT_LORA_SIZE = 150 * 1024 ** 2
+
+# Raw audio output samples per chunk (one second at 24 kHz)
+AUDIO_CHUNK_SAMPLES = 24000
+
+# Seconds between cancellation checks while a batched step runs
+STEP_POLL_INTERVAL = 0.02
+
+
+def _output_mode(request: GenerationRequest) -> str:
+    """Get the output mode a request asks for."""
+    return str(request.parameters.get("output", settings.output_mode))
+
+
+def _streams_to_file(request: GenerationRequest) -> bool:
+    """Whether a request's output is written to a file rather than a raw buffer."""
+    from .outputs import FILE
+    
+    return _output_mode(request) == FILE
+
+
+def batch_key(request: GenerationRequest) -> Optional[Hashable]:
+    """
+    Get the key under which a request may be batched with others.
+    
+    Text requests are grouped by max_tokens rounded up to a power of two.
+    Audio written to a file is streamed from each request's own text, so
+    it always runs on its own.
+    
+    Returns:
+        Hashable key, or None if the request must run on its own
+    """
+    if request.model_type not in BATCH_PARAMETERS:
+        return None
+    is_audio = request.model_type == ModelType.TEXT_TO_AUDIO.value
+    if is_audio and _streams_to_file(request):
+        return None
+    
+    shape = [
+        (name, request.parameters.get(name))
+        for name in BATCH_PARAMETERS[request.model_type]
+    ]
+    if request.model_type == ModelType.TEXT_GENERATION.value:
+        parameter, default = INFERENCE_STEPS[request.model_type]
+        try:
+            max_tokens = max(1, int(request.parameters.get(parameter, default)))
+        except (TypeError, ValueError):
+            return None
+        shape.append(("max_tokens_bucket", 1 << (max_tokens - 1).bit_length()))
+    
+    key = (
+        request.model_type,
+        request.model_name,
+        request.lora_name,
+        request.parameters.get("lora_strength"),
+        tuple(shape)
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _requested_profiler(request: GenerationRequest) -> Optional[str]:
+    """
+    Get the profiler a request asks for with its ``profile`` parameter.
+    
+    True asks for the sampling profiler.
+    
+    Raises:
+        ValueError: If the profiler is unknown
+    """
+    requested = request.parameters.get("profile")
+    if not requested:
+        return None
+    mode = profiling.SAMPLING if requested is True else str(requested)
+    profiling.check_profiler(mode)
+    return mode
+
+
+def _model_name(request: GenerationRequest) -> str:
+    """Get the name of the model a request runs on."""
+    if request.model_name:
+        return request.model_name
+    return DEFAULT_MODEL_NAMES.get(request.model_type, request.model_type)
+
+
+def open_registry() -> GenerationRegistry:
+    """Open the generation registry configured in the settings."""
+    from .registry import GenerationRegistry
+    
+    return GenerationRegistry(
+        settings.database_url,
+        GenerationResponse,
+        ttl=settings.generation_ttl_seconds or None,
+        max_entries=settings.generation_max_entries or None
+    )
+
+
 class GenerationManager:
     """Manages ongoing generations."""
     
-    def __init__(self):
-        self.generations: Dict[str, GenerationResponse] = {}
-        self.executor = ThreadPoolExecutor(max_workers=4)
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        scheduler: Optional[GenerationScheduler] = None,
+        result_cache: Optional[ResultCache] = None,
+        registry: Optional[GenerationRegistry] = None,
+        simulated_duration: float = 2.0,
+        inference_cost: Optional[Callable[[GenerationRequest], float]] = None
+    ):
+        from .batching import MicroBatcher
+        from .lora import LoraCache
+        from .metrics import GenerationMetrics
+        from .model_cache import ModelCache
+        from .outputs import OutputStore
+        from .process_pool import ProcessStage
+        from .result_cache import ResultCache
+        from .scheduler import GenerationScheduler
+        
+        self.generations = registry or open_registry()
+        self.scheduler = scheduler or GenerationScheduler(
+            max_workers=max_workers or settings.generation_workers,
+            max_queue_size=max_queue_size or settings.generation_queue_size
+        )
+        self.batcher = MicroBatcher(
+            self.scheduler,
+            self._run_batch,
+            max_batch_size=settings.batch_max_size,
+            max_wait=settings.batch_max_wait_ms / 1000
+        )
+        self.simulated_duration = simulated_duration
+        # Seconds a request's simulated inference takes (default: simulated_duration)
+        self.inference_cost = inference_cost
+        self.events = EventBus()
+        self.models = ModelCache(settings.model_cache_bytes, self._load_model)
+        self.loras = LoraCache(
+            self.models,
+            self._load_lora,
+            self._fuse_lora,
+            settings.lora_cache_bytes
+        )
+        self.results = result_cache or ResultCache(
+            settings.result_cache_dir,
+            settings.result_cache_bytes
+        )
+        self.stage = ProcessStage(settings.process_workers)
+        self.outputs = OutputStore(settings.raw_output_dir)
+        self.generations.on_evict = self._evicted
+        self.metrics = GenerationMetrics()
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._in_flight: Dict[str, str] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._queued: Dict[str, Tuple[float, GenerationRequest]] = {}  # Submission time
         self._lock = threading.Lock()
     
     def start_generation(self, request: GenerationRequest) -> str:
-        """Start a new generation."""
+        """
+        Start a new generation.
+        
+        Seeded requests are deterministic: one whose result is cached
+        completes immediately, and one identical to a generation still in
+        flight returns that generation's id instead of starting another.
+        
+        Raises:
+            ValueError: If the request asks for an unknown profiler, or for
+                shared-memory output and the output store has shared memory
+                turned off
+            QueueFullError: If the scheduler queue is full
+        """
+        from .outputs import SHM
+        from .result_cache import request_fingerprint
+        from .scheduler import QueueFullError
+        
+        if (
+            request.model_type != ModelType.TEXT_GENERATION.value
+            and _output_mode(request) == SHM
+        ):
+            self.outputs.check_kind(SHM)
+        _requested_profiler(request)
+        
+        fingerprint = request_fingerprint(
+            request.model_type,
+            request.prompt,
+            request.parameters,
+            request.model_name,
+            request.lora_name
+        )
+        cached = self.results.get(fingerprint) if fingerprint else None
+        
         generation_id = str(uuid.uuid4())
         
         response = GenerationResponse(
@@ -85,128 +373,701 @@ class GenerationManager:
         )
         
         with self._lock:
-            self.generations[generation_id] = response
+            if cached is not None:
+                response.success = True
+                response.data = cached
+                response.status = "completed"
+                self.generations.add(response, request.model_type)
+                self.events.publish(
+                    ProgressEvent(generation_id, events.COMPLETED, data=cached)
+                )
+                self.metrics.observe(request.model_type, _model_name(request), "cached")
+                return generation_id
+            
+            if fingerprint is not None:
+                in_flight = self._in_flight.get(fingerprint)
+                if in_flight is not None:
+                    logger.debug(f"Coalescing duplicate request into {in_flight}")
+                    return in_flight
+                self._in_flight[fingerprint] = generation_id
+                self._fingerprints[generation_id] = fingerprint
+            
+            self.generations.add(response, request.model_type)
+            self._tokens[generation_id] = CancellationToken()
+            self._queued[generation_id] = (time.perf_counter(), request)
+            # Before a worker can see the job, so "queued" always comes first
+            self.events.publish(ProgressEvent(generation_id, events.QUEUED))
         
-        # Start generation in background
-        self.executor.submit(self._run_generation, generation_id, request)
+        # Queue generation for a background worker, batched with compatible requests
+        try:
+            self.batcher.submit(
+                generation_id,
+                request.model_type,
+                batch_key(request),
+                (generation_id, request),
+                priority=request.priority
+            )
+        except QueueFullError as e:
+            with self._lock:
+                self.generations.discard(generation_id)
+                del self._tokens[generation_id]
+                del self._queued[generation_id]
+                self._release_fingerprint(generation_id)
+                self.events.publish(
+                    ProgressEvent(generation_id, events.FAILED, data={"error": str(e)})
+                )
+            raise
         
         return generation_id
     
+    def _response(self, generation_id: str) -> GenerationResponse:
+        """Get the response of a generation this manager has not finished."""
+        response: Optional[GenerationResponse] = self.generations.get(generation_id)
+        if response is None:
+            raise KeyError(f"Generation {generation_id} is not registered")
+        return response
+    
+    def _evicted(self, generation_id: str) -> None:
+        """Free the raw output of a generation evicted from the registry."""
+        self.outputs.release(generation_id)
+    
+    def _release_fingerprint(self, generation_id: str) -> Optional[str]:
+        """Stop coalescing requests into a generation. Call with the lock held."""
+        fingerprint = self._fingerprints.pop(generation_id, None)
+        if fingerprint is None:
+            return None
+        if self._in_flight.get(fingerprint) == generation_id:
+            del self._in_flight[fingerprint]
+        return fingerprint
+    
     def _run_generation(self, generation_id: str, request: GenerationRequest):
-        """Run generation in background thread."""
+        """Run a single generation in a background thread."""
+        self._run_batch([(generation_id, request)])
+    
+    def _run_batch(self, items: List[Tuple[str, GenerationRequest]]) -> None:
+        """
+        Run a batch of compatible generations in a background thread.
+        
+        The first member to reach inference runs the batched forward pass
+        for every member; the rest only build their results.
+        """
+        # Another process sharing the registry may have cancelled a member
+        cancelled_elsewhere = {
+            generation_id for generation_id, _ in items
+            if self.generations.persisted_status(generation_id) == "cancelled"
+        }
+        
+        contexts: List[GenerationContext] = []
+        with self._lock:
+            for generation_id, request in items:
+                token = self._tokens.get(generation_id)
+                if token is None or token.cancelled:
+                    continue
+                timings = self._dequeue(generation_id)
+                if generation_id in cancelled_elsewhere:
+                    token.cancel()
+                    self._tokens.pop(generation_id)
+                    self._response(generation_id).status = "cancelled"
+                    self.generations.save(generation_id)
+                    self.events.publish(ProgressEvent(generation_id, events.CANCELLED))
+                    self._release_fingerprint(generation_id)
+                    self._observe(request, "cancelled", timings)
+                    continue
+                self._response(generation_id).status = "processing"
+                self.generations.save(generation_id)
+                self.events.publish(ProgressEvent(generation_id, events.STARTED))
+                contexts.append(GenerationContext(
+                    generation_id, request, token, self.events, timings=timings
+                ))
+        
+        for context in contexts:
+            context.batch = contexts
+            context.stage = self.stage
+        for context in contexts:
+            self._run_context(context)
+    
+    def _profile_mode(self, request: GenerationRequest) -> Optional[str]:
+        """
+        Get the profiler to run a generation under, if any.
+        
+        The ``profile`` parameter names a profiler, or is true for the
+        sampling profiler. Other generations are profiled with the sampling
+        profiler at the PROFILE_SAMPLE_RATE setting.
+        """
+        requested = _requested_profiler(request)
+        if requested:
+            return requested
+        rate = settings.profile_sample_rate
+        if rate > 0 and random.random() < rate:
+            return profiling.SAMPLING
+        return None
+    
+    def _dequeue(self, generation_id: str) -> Timings:
+        """
+        Take a generation off the queue and time its wait.
+        
+        Call with the lock held.
+        """
+        submitted, _ = self._queued.pop(generation_id, (None, None))
+        timings = metrics.Timings(submitted)
+        timings.add(metrics.QUEUED, time.perf_counter() - timings.start)
+        return timings
+    
+    def _observe(
+        self, request: GenerationRequest, status: str, timings: Timings
+    ) -> None:
+        """Fold a finished generation's timings into the aggregate metrics."""
+        timings.finish()
+        self.metrics.observe(request.model_type, _model_name(request), status, timings)
+    
+    def _run_context(self, context: GenerationContext) -> None:
+        """Run one generation of a batch and record its outcome."""
+        generation_id = context.generation_id
+        request = context.request
+        token = context.token
+        timings = context.timings
+        status = "failed"
         try:
-            with self._lock:
-                self.generations[generation_id].status = "processing"
-            
-            # Simulate generation time
-            time.sleep(2)
-            
             # Generate content based on model type
             if request.model_type == ModelType.TEXT_TO_IMAGE.value:
-                result = self._generate_image(request)
+                generate = self._generate_image
             elif request.model_type == ModelType.TEXT_TO_AUDIO.value:
-                result = self._generate_audio(request)
+                generate = self._generate_audio
             elif request.model_type == ModelType.TEXT_TO_VIDEO.value:
-                result = self._generate_video(request)
+                generate = self._generate_video
             elif request.model_type == ModelType.TEXT_GENERATION.value:
-                result = self._generate_text(request)
+                generate = self._generate_text
             else:
                 raise ValueError(f"Unsupported model type: {request.model_type}")
             
+            profile_mode = self._profile_mode(request)
+            with context.resources:
+                if profile_mode:
+                    # Pruned once this generation's artifact is written
+                    context.resources.callback(
+                        profiling.prune,
+                        settings.profile_dir,
+                        settings.profile_max_files
+                    )
+                    # Entered first, so the profile also covers releasing the model
+                    artifact = profiling.artifact_path(
+                        settings.profile_dir, generation_id, profile_mode
+                    )
+                    profile_path = context.resources.enter_context(
+                        profiling.profile(profile_mode, artifact)
+                    )
+                model_name = _model_name(request)
+                with timings.span(metrics.MODEL_LOAD):
+                    context.model = context.resources.enter_context(
+                        self.models.acquire(model_name)
+                    )
+                if request.lora_name:
+                    with timings.span(metrics.LORA_APPLY):
+                        context.lora = context.resources.enter_context(
+                            self.loras.acquire(
+                                model_name,
+                                request.lora_name,
+                                self._lora_strength(request)
+                            )
+                        )
+                context.check()
+                result = generate(context)
+            
+            data = result
+            if request.parameters.get("timings", settings.generation_timings):
+                timings.finish()
+                data = dict(data, timings=timings.to_dict())
+            if profile_mode:
+                profile = {"mode": profile_mode, "path": str(profile_path)}
+                data = dict(data, profile=profile)
+            
             with self._lock:
-                self.generations[generation_id].success = True
-                self.generations[generation_id].data = result
-                self.generations[generation_id].status = "completed"
+                context.check()
+                response = self._response(generation_id)
+                response.success = True
+                response.data = data
+                response.status = "completed"
+                self.generations.save(generation_id)
+                self.events.publish(
+                    ProgressEvent(generation_id, events.COMPLETED, data=data)
+                )
+                fingerprint = self._release_fingerprint(generation_id)
+            status = "completed"
+            
+            # Raw buffers are freed independently, so only file results are cached
+            if fingerprint is not None and "buffer" not in result:
+                self.results.put(fingerprint, result)
                 
+        except GenerationCancelled:
+            logger.info(f"Generation {generation_id} cancelled")
+            self.outputs.release(generation_id)
+            status = "cancelled"
         except Exception as e:
             logger.error(f"Generation failed for {generation_id}: {e}")
+            self.outputs.release(generation_id)
             with self._lock:
-                self.generations[generation_id].success = False
-                self.generations[generation_id].error = str(e)
-                self.generations[generation_id].status = "failed"
+                if token.cancelled:
+                    status = "cancelled"
+                    return
+                response = self._response(generation_id)
+                response.success = False
+                response.error = str(e)
+                response.status = "failed"
+                self.generations.save(generation_id)
+                self.events.publish(
+                    ProgressEvent(generation_id, events.FAILED, data={"error": str(e)})
+                )
+        finally:
+            with self._lock:
+                self._tokens.pop(generation_id, None)
+                self._release_fingerprint(generation_id)
+            self._observe(request, status, timings)
+    
+    def _load_model(self, name: str) -> Tuple[Any, int]:
+        """
+        Load a model pipeline.
+        
+        Args:
+            name: Model name
+        
+        Returns:
+            Pipeline object and its resident size in bytes
+        """
+        # This would load the checkpoint with the matching inference library
+        # For now, return a placeholder pipeline
+        pipeline = {"name": name}
+        return pipeline, MODEL_SIZE_ESTIMATES.get(name, DEFAULT_MODEL_SIZE)
+    
+    def _load_lora(self, name: str) -> Tuple[Any, int]:
+        """
+        Load LoRA adapter weights.
+        
+        Args:
+            name: LoRA name
+        
+        Returns:
+            Adapter weights and their resident size in bytes
+        """
+        if name not in _lora_catalog():
+            raise ValueError(f"Unknown LoRA: {name}")
+        # This would read the adapter's low-rank matrices from disk
+        return {"lora": name}, DEFAULT_LORA_SIZE
+    
+    def _fuse_lora(self, pipeline: Any, adapter: Any, strength: float) -> Any:
+        """Merge adapter weights into a copy of a base pipeline."""
+        # This would add strength * (B @ A) to each adapted layer
+        return {"base": pipeline, "adapter": adapter, "strength": strength}
+    
+    def _lora_strength(self, request: GenerationRequest) -> float:
+        """Get the requested LoRA strength, falling back to the LoRA's default."""
+        if "lora_strength" in request.parameters:
+            return float(request.parameters["lora_strength"])
+        if request.lora_name is None:
+            return 1.0
+        lora = _lora_catalog().get(request.lora_name)
+        return lora.strength if lora is not None else 1.0
+    
+    def _run_inference(
+        self,
+        context: GenerationContext,
+        preview_every: Optional[int] = None
+    ) -> int:
+        """
+        Run the (simulated) inference loop, reporting progress and checking
+        for cancellation between steps.
+        
+        In a batch, the first call runs one forward pass per step for every
+        member that has not run yet; later members return straight away.
+        Members that are cancelled drop out of the loop without stopping it,
+        even the one running it.
+        
+        Args:
+            context: Generation context
+            preview_every: Announce a partial preview every N steps
+        
+        Returns:
+            Number of steps run
+        """
+        context.check()
+        if context.steps_run is not None:
+            return context.steps_run
+        
+        batch = context.batch or [context]
+        live = batch[batch.index(context):] if context in batch else [context]
+        totals = {id(member): self._inference_steps(member.request) for member in live}
+        steps = max(totals.values())
+        started = time.perf_counter()
+        duration = self.simulated_duration
+        if self.inference_cost is not None:
+            duration = max(self.inference_cost(member.request) for member in live)
+        step_time = duration / steps
+        
+        for step in range(1, steps + 1):
+            live = [
+                member for member in live
+                if not member.token.cancelled and step <= totals[id(member)]
+            ]
+            if not live:
+                break
+            self._wait_step(live, step_time)
+            for member in live:
+                total = totals[id(member)]
+                try:
+                    member.step(step, total)
+                except GenerationCancelled:
+                    continue
+                if preview_every and step % preview_every == 0 and step < total:
+                    member.preview({"step": step}, step, total)
+        
+        elapsed = time.perf_counter() - started
+        for member in batch:
+            if id(member) in totals:
+                member.steps_run = totals[id(member)]
+                member.timings.add(metrics.INFERENCE, elapsed)
+        
+        context.check()
+        return totals[id(context)]
+    
+    def _wait_step(self, batch: List[GenerationContext], seconds: float) -> None:
+        """
+        Wait out one forward pass of a batch.
+        
+        The wait belongs to the whole batch rather than to one member: it
+        only ends early once every member is cancelled.
+        """
+        deadline = time.perf_counter() + seconds
+        while not all(member.token.cancelled for member in batch):
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, STEP_POLL_INTERVAL))
+    
+    def _inference_steps(self, request: GenerationRequest) -> int:
+        """Get the number of inference steps a request needs."""
+        parameter, default = INFERENCE_STEPS.get(request.model_type, ("steps", 1))
+        return max(1, int(request.parameters.get(parameter, default)))
     
-    def _generate_image(self, request: GenerationRequest) -> Dict[str, Any]:
+    def _generate_image(self, context: GenerationContext) -> Dict[str, Any]:
         """Generate image from text prompt."""
+        request = context.request
         # This would integrate with actual image generation models
         # For now, return mock data
-        return {
-            "type": "image",
-            "url": f"generated_image_{uuid.uuid4()}.png",
-            "prompt": request.prompt,
-            "parameters": request.parameters,
-            "model_used": request.model_name or "default_image_model"
-        }
+        self._run_inference(context, preview_every=10)
+        with context.timings.span(metrics.ENCODE):
+            result = {
+                "type": "image",
+                "url": f"generated_image_{uuid.uuid4()}.png",
+                "prompt": request.prompt,
+                "parameters": request.parameters,
+                "model_used": context.model_name
+            }
+        height = request.parameters.get("height", 1024)
+        width = request.parameters.get("width", 1024)
+        shape = (height, width, 3)
+        return self._raw_output(context, result, shape, "uint8")
     
-    def _generate_audio(self, request: GenerationRequest) -> Dict[str, Any]:
+    def _generate_audio(self, context: GenerationContext) -> Dict[str, Any]:
         """Generate audio from text prompt."""
+        request = context.request
+        if _streams_to_file(request):
+            return self._stream_audio(context)
+        chunks = self._run_inference(context)
+        with context.timings.span(metrics.ENCODE):
+            result = {
+                "type": "audio",
+                "url": f"generated_audio_{uuid.uuid4()}.wav",
+                "prompt": request.prompt,
+                "parameters": request.parameters,
+                "model_used": context.model_name
+            }
+        shape = (chunks * AUDIO_CHUNK_SAMPLES,)
+        return self._raw_output(context, result, shape, "float32")
+    
+    def _stream_audio(self, context: GenerationContext) -> Dict[str, Any]:
+        """
+        Synthesize the prompt chunk by chunk into a growing WAV file.
+        
+        The prompt is split into sentence or phrase chunks. Synthesis of the
+        next chunk overlaps encoding and writing of the previous one, and a
+        preview with the playable duration so far is announced after each
+        chunk is written. Only a few chunks of samples are held at a time,
+        however long the prompt is. The partial file is removed if the
+        generation fails or is cancelled.
+        """
+        # Imported here to keep them off the startup path of light commands
+        from . import audio, processing
+        from .process_pool import SharedBuffer
+        
+        request = context.request
+        chunks = list(audio.split_text(request.prompt))
+        total = len(chunks)
+        characters = sum(len(chunk) for chunk in chunks) or 1
+        duration = self.simulated_duration
+        if self.inference_cost is not None:
+            duration = self.inference_cost(request)
+        path = Path(settings.audio_output_dir) / f"{context.generation_id}.wav"
+        timings = context.timings
+        written = 0
+        
+        def synthesize(text: str) -> SharedBuffer:
+            with timings.span(metrics.INFERENCE):
+                context.token.sleep(duration * len(text) / characters)
+                # This would run the acoustic model and vocoder on the chunk
+                return SharedBuffer(audio.chunk_samples(text) * 4, format="f")
+        
+        def write(samples: SharedBuffer) -> None:
+            nonlocal written
+            with samples:
+                with timings.span(metrics.ENCODE), \
+                        SharedBuffer(samples.nbytes // 2, format="h") as pcm:
+                    context.run_stage(processing.to_pcm16, samples, pcm)
+                    data = pcm.tobytes()
+                with timings.span(metrics.WRITE):
+                    writer.append(data)
+            written += 1
+            context.step(written, total)
+            if written < total:
+                context.preview(
+                    {
+                        "url": str(path),
+                        "duration_s": round(writer.duration, 3),
+                        "chunks": written,
+                    },
+                    written,
+                    total
+                )
+        
+        context.check()
+        try:
+            with audio.WavWriter(path, audio.SAMPLE_RATE) as writer:
+                audio.pipeline(chunks, synthesize, write, discard=SharedBuffer.close)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        
         return {
             "type": "audio",
-            "url": f"generated_audio_{uuid.uuid4()}.wav",
+            "url": str(path),
+            "duration_s": round(writer.duration, 3),
+            "sample_rate": audio.SAMPLE_RATE,
+            "chunks": total,
             "prompt": request.prompt,
             "parameters": request.parameters,
-            "model_used": request.model_name or "default_audio_model"
+            "model_used": context.model_name
         }
     
-    def _generate_video(self, request: GenerationRequest) -> Dict[str, Any]:
+    def _generate_video(self, context: GenerationContext) -> Dict[str, Any]:
         """Generate video from text prompt."""
-        return {
-            "type": "video",
-            "url": f"generated_video_{uuid.uuid4()}.mp4",
-            "prompt": request.prompt,
-            "parameters": request.parameters,
-            "model_used": request.model_name or "default_video_model"
-        }
+        request = context.request
+        frames = self._run_inference(context, preview_every=5)
+        with context.timings.span(metrics.ENCODE):
+            result = {
+                "type": "video",
+                "url": f"generated_video_{uuid.uuid4()}.mp4",
+                "prompt": request.prompt,
+                "parameters": request.parameters,
+                "model_used": context.model_name
+            }
+        shape = (
+            frames,
+            request.parameters.get("height", 320),
+            request.parameters.get("width", 576),
+            3
+        )
+        return self._raw_output(context, result, shape, "uint8")
     
-    def _generate_text(self, request: GenerationRequest) -> Dict[str, Any]:
+    def _raw_output(
+        self,
+        context: GenerationContext,
+        result: Dict[str, Any],
+        shape: Tuple[int, ...],
+        dtype: str
+    ) -> Dict[str, Any]:
+        """
+        Hand the decoded output over in a raw buffer if the request asks for one.
+        
+        The ``output`` parameter (or the OUTPUT_MODE setting) selects "file",
+        "mmap" or "shm"; raw modes replace the file URL with a buffer handle.
+        """
+        mode = _output_mode(context.request)
+        with context.timings.span(metrics.WRITE):
+            # This would write the encoded file for the URL
+            if _streams_to_file(context.request):
+                return result
+            handle = self.outputs.allocate(context.generation_id, mode, shape, dtype)
+            # This would copy the decoder output into the buffer via open_output
+            result.pop("url", None)
+            result["buffer"] = handle.to_dict()
+            return result
+    
+    def _generate_text(self, context: GenerationContext) -> Dict[str, Any]:
         """Generate text from prompt."""
-        return {
-            "type": "text",
-            "content": f"Generated text based on: {request.prompt}",
-            "prompt": request.prompt,
-            "parameters": request.parameters,
-            "model_used": request.model_name or "default_text_model"
-        }
+        request = context.request
+        self._run_inference(context)
+        with context.timings.span(metrics.ENCODE):
+            return {
+                "type": "text",
+                "content": f"Generated text based on: {request.prompt}",
+                "prompt": request.prompt,
+                "parameters": request.parameters,
+                "model_used": context.model_name
+            }
     
-    def get_generation_status(self, generation_id: str) -> Optional[GenerationResponse]:
-        """Get status of a generation."""
-        with self._lock:
-            return self.generations.get(generation_id)
+    def get_generation_status(self, generation_id: str) -> Optional[StatusSnapshot]:
+        """Get an immutable snapshot of a generation's status without locking."""
+        return self.generations.snapshot(generation_id)
     
     def cancel_generation(self, generation_id: str) -> bool:
-        """Cancel a generation."""
+        """
+        Cancel a generation.
+        
+        Queued generations are dropped without ever starting. Running ones
+        stop at their next inference step and release their worker.
+        Generations owned by another process sharing the registry are marked
+        cancelled and are skipped when that process gets to them.
+        
+        Returns:
+            True if the generation was pending or running
+        """
         with self._lock:
-            if generation_id in self.generations:
-                self.generations[generation_id].status = "cancelled"
-                return True
-            return False
+            response = self.generations.get(generation_id)
+            if response is None or response.status in TERMINAL_STATUSES:
+                return False
+            
+            token = self._tokens.pop(generation_id, None)
+            if token is not None:
+                token.cancel()
+            response.status = "cancelled"
+            self.generations.save(generation_id)
+            self.events.publish(ProgressEvent(generation_id, events.CANCELLED))
+            self._release_fingerprint(generation_id)
+            if generation_id in self._queued:
+                # Never reached a worker; running generations are counted when they stop
+                request = self._queued[generation_id][1]
+                self._observe(request, "cancelled", self._dequeue(generation_id))
+        
+        self.batcher.cancel(generation_id)
+        return True
     
-    def cleanup_completed(self):
-        """Clean up completed generations."""
+    def queue_depth(self) -> Dict[str, int]:
+        """Get the number of requests waiting for a worker per model type."""
+        depth: Dict[str, int] = {}
         with self._lock:
-            to_remove = [
-                gen_id for gen_id, response in self.generations.items()
-                if response.status in ["completed", "failed", "cancelled"]
-            ]
-            for gen_id in to_remove:
-                del self.generations[gen_id]
+            for _, request in self._queued.values():
+                depth[request.model_type] = depth.get(request.model_type, 0) + 1
+        return depth
+    
+    def subscribe(self, generation_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to progress events.
+        
+        Subscribing to a generation that has already finished yields its
+        terminal event straight away.
+        
+        Args:
+            generation_id: Generation to follow (None follows every generation)
+        
+        Returns:
+            Subscription usable as an iterator or async iterator
+        
+        Raises:
+            ValueError: If the generation does not exist
+        """
+        if generation_id is None:
+            return self.events.subscribe()
+        
+        with self._lock:
+            response = self.generations.get(generation_id)
+            if response is None:
+                raise ValueError(f"Generation {generation_id} not found")
+            
+            subscription = self.events.subscribe(generation_id)
+            if response.status in TERMINAL_STATUSES:
+                data = response.data
+                if response.status == "failed":
+                    data = {"error": response.error}
+                subscription.push(
+                    ProgressEvent(generation_id, response.status, data=data)
+                )
+        return subscription
+    
+    def cleanup_completed(self):
+        """Clean up completed generations; their raw outputs are freed as they go."""
+        self.generations.purge(TERMINAL_STATUSES)
+
 
+# Global generation manager, created on first use
+_generation_manager: Optional[GenerationManager] = None
+# Registry opened for status and cancel lookups before any manager exists
+_generation_registry: Optional[GenerationRegistry] = None
+_manager_lock = threading.Lock()
 
-# Global generation manager
-_generation_manager = GenerationManager()
+
+def get_generation_manager() -> GenerationManager:
+    """Get the process-wide generation manager, creating it if needed."""
+    global _generation_manager
+    if _generation_manager is None:
+        with _manager_lock:
+            if _generation_manager is None:
+                _generation_manager = GenerationManager(registry=_generation_registry)
+    return _generation_manager
+
+
+def get_generation_registry() -> GenerationRegistry:
+    """
+    Get the process-wide generation registry.
+    
+    This is the manager's registry if one exists. Otherwise the registry is
+    opened on its own, so looking a generation up does not start the
+    scheduler or load the caches.
+    """
+    global _generation_registry
+    with _manager_lock:
+        if _generation_manager is not None:
+            return _generation_manager.generations
+        if _generation_registry is None:
+            _generation_registry = open_registry()
+        return _generation_registry
+
+
+def drain_generations() -> None:
+    """
+    Wait for the process-wide manager's queued and running generations to
+    finish, then stop its workers.
+    
+    Workers are daemon threads, so a short-lived process that started
+    generations must call this before exiting; otherwise they are lost
+    while still pending.
+    """
+    manager = _generation_manager
+    if manager is not None:
+        manager.scheduler.shutdown(wait=True)
+
+
+def parse_request(request_data: Dict[str, Any]) -> GenerationRequest:
+    """
+    Build a generation request from its dictionary form.
+    
+    Raises:
+        KeyError: If model_type or prompt is missing
+        ValueError: If the priority is not an integer
+    """
+    return GenerationRequest(
+        model_type=request_data["model_type"],
+        prompt=request_data["prompt"],
+        parameters=request_data.get("parameters", {}),
+        model_name=request_data.get("model_name"),
+        lora_name=request_data.get("lora_name"),
+        priority=int(request_data.get("priority", 0))
+    )
 
 
 def generate_content(request_data: Dict[str, Any]) -> Dict[str, Any]:
     """Generate content using AI models."""
     try:
-        request = GenerationRequest(
-            model_type=request_data["model_type"],
-            prompt=request_data["prompt"],
-            parameters=request_data.get("parameters", {}),
-            model_name=request_data.get("model_name"),
-            lora_name=request_data.get("lora_name")
-        )
+        request = parse_request(request_data)
         
-        generation_id = _generation_manager.start_generation(request)
+        generation_id = get_generation_manager().start_generation(request)
         
         return {
             "generation_id": generation_id,
@@ -218,95 +1079,255 @@ def generate_content(request_data: Dict[str, Any]) -> Dict[str, Any]:
         raise
 
 
-def get_generation_status(generation_id: str) -> Dict[str, Any]:
-    """Get the status of a generation."""
-    response = _generation_manager.get_generation_status(generation_id)
+def get_generation_status(
+    generation_id: str,
+    since_version: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get the status of a generation.
+    
+    Args:
+        generation_id: Generation to look up
+        since_version: Version the caller already has; if nothing changed
+            since, only the id, version and ``"changed": False`` are returned
+    
+    Returns:
+        Status dictionary including its version
+    """
+    snapshot = get_generation_registry().snapshot(generation_id)
     
-    if response is None:
+    if snapshot is None:
         raise ValueError(f"Generation {generation_id} not found")
     
-    return asdict(response)
+    if since_version is not None:
+        if snapshot.version <= since_version:
+            return {
+                "generation_id": generation_id,
+                "version": snapshot.version,
+                "changed": False
+            }
+        return dict(snapshot.to_dict(), changed=True)
+    
+    return snapshot.to_dict()
 
 
 def cancel_generation(generation_id: str) -> bool:
-    """Cancel a generation."""
-    return _generation_manager.cancel_generation(generation_id)
+    """
+    Cancel a generation.
+    
+    Without a manager in this process the generation belongs to another
+    process sharing the registry. It is marked cancelled there and skipped
+    when that process gets to it.
+    
+    Returns:
+        True if the generation was pending or running
+    """
+    if _generation_manager is not None:
+        return _generation_manager.cancel_generation(generation_id)
+    
+    registry = get_generation_registry()
+    response = registry.get(generation_id)
+    if response is None or response.status in TERMINAL_STATUSES:
+        return False
+    response.status = "cancelled"
+    registry.save(generation_id)
+    return True
+
+
+def subscribe_generation(generation_id: Optional[str] = None) -> Subscription:
+    """Subscribe to progress events for one generation, or for all of them."""
+    return get_generation_manager().subscribe(generation_id)
+
+
+def get_queue_stats() -> Dict[str, Any]:
+    """Get the waiting requests, queued and running jobs and the queue limits."""
+    manager = get_generation_manager()
+    scheduler = manager.scheduler
+    return {
+        "pending": manager.queue_depth(),
+        "queued": scheduler.queue_depth(),
+        "running": scheduler.running(),
+        "max_workers": scheduler.max_workers,
+        "max_queue_size": scheduler.max_queue_size
+    }
+
+
+def get_generation_metrics() -> Dict[str, Any]:
+    """Get generation counters, stage latency summaries and queue depths."""
+    manager = get_generation_manager()
+    return dict(manager.metrics.snapshot(), queue=get_queue_stats())
+
+
+def get_prometheus_metrics() -> str:
+    """Render the generation metrics in the Prometheus text exposition format."""
+    manager = get_generation_manager()
+    lines = manager.metrics.to_prometheus()
+    lines.extend(metrics.prometheus_gauge(
+        "playai_queue_depth",
+        "Generation jobs waiting per model type.",
+        "model_type",
+        manager.scheduler.queue_depth()
+    ))
+    lines.extend(metrics.prometheus_gauge(
+        "playai_running",
+        "Generation jobs running per model type.",
+        "model_type",
+        manager.scheduler.running()
+    ))
+    return "\n".join(lines) + "\n"
+
+
+def get_model_cache_stats() -> Dict[str, Any]:
+    """Get model and LoRA cache counters and the currently resident models."""
+    manager = get_generation_manager()
+    stats = manager.models.stats()
+    stats["resident"] = manager.models.resident()
+    stats["lora"] = manager.loras.stats()
+    return stats
+
+
+# Models and LoRAs listed even when no checkpoint files are present
+BUILTIN_MODELS = [
+    ModelInfo(
+        name="stable-diffusion-xl",
+        model_type=ModelType.TEXT_TO_IMAGE.value,
+        description="High-quality image generation model",
+        parameters={
+            "width": 1024,
+            "height": 1024,
+            "steps": 50,
+            "guidance_scale": 7.5
+        }
+    ),
+    ModelInfo(
+        name="whisper-large",
+        model_type=ModelType.TEXT_TO_AUDIO.value,
+        description="Text-to-speech model",
+        parameters={
+            "voice": "default",
+            "speed": 1.0,
+            "quality": "high"
+        }
+    ),
+    ModelInfo(
+        name="llama-2-7b",
+        model_type=ModelType.TEXT_GENERATION.value,
+        description="Large language model for text generation",
+        parameters={
+            "max_tokens": 2048,
+            "temperature": 0.7,
+            "top_p": 0.9
+        }
+    ),
+    ModelInfo(
+        name="stable-video-diffusion",
+        model_type=ModelType.TEXT_TO_VIDEO.value,
+        description="Text-to-video generation model",
+        parameters={
+            "width": 576,
+            "height": 320,
+            "frames": 25,
+            "fps": 8
+        }
+    )
+]
+
+BUILTIN_LORAS = [
+    LoraInfo(
+        name="anime-style",
+        model_type=ModelType.TEXT_TO_IMAGE.value,
+        description="Anime art style LoRA",
+        strength=0.8
+    ),
+    LoraInfo(
+        name="realistic-portrait",
+        model_type=ModelType.TEXT_TO_IMAGE.value,
+        description="Realistic portrait style LoRA",
+        strength=0.7
+    ),
+    LoraInfo(
+        name="cyberpunk",
+        model_type=ModelType.TEXT_TO_IMAGE.value,
+        description="Cyberpunk aesthetic LoRA",
+        strength=0.9
+    )
+]
+
+# Seconds a directory scan is reused before checking for changed files
+CATALOG_RESCAN_SECONDS = 1.0
+
+# Catalogs of the models and LoRA directories, created on first use
+_catalogs: Dict[str, CheckpointCatalog] = {}
+_catalog_lock = threading.Lock()
+
+
+def _catalog(kind: str) -> CheckpointCatalog:
+    """Get the model or LoRA catalog."""
+    with _catalog_lock:
+        catalog = _catalogs.get(kind)
+        if catalog is None:
+            if kind == "models":
+                catalog = CheckpointCatalog(
+                    settings.models_dir,
+                    describe_model,
+                    [asdict(model) for model in BUILTIN_MODELS],
+                    rescan_interval=CATALOG_RESCAN_SECONDS
+                )
+            else:
+                catalog = CheckpointCatalog(
+                    settings.loras_dir,
+                    describe_lora,
+                    [asdict(lora) for lora in BUILTIN_LORAS],
+                    rescan_interval=CATALOG_RESCAN_SECONDS
+                )
+            _catalogs[kind] = catalog
+        return catalog
 
 
 def get_available_models() -> List[Dict[str, Any]]:
-    """Get list of available models."""
-    models = [
-        ModelInfo(
-            name="stable-diffusion-xl",
-            model_type=ModelType.TEXT_TO_IMAGE.value,
-            description="High-quality image generation model",
-            parameters={
-                "width": 1024,
-                "height": 1024,
-                "steps": 50,
-                "guidance_scale": 7.5
-            }
-        ),
-        ModelInfo(
-            name="whisper-large",
-            model_type=ModelType.TEXT_TO_AUDIO.value,
-            description="Text-to-speech model",
-            parameters={
-                "voice": "default",
-                "speed": 1.0,
-                "quality": "high"
-            }
-        ),
-        ModelInfo(
-            name="llama-2-7b",
-            model_type=ModelType.TEXT_GENERATION.value,
-            description="Large language model for text generation",
-            parameters={
-                "max_tokens": 2048,
-                "temperature": 0.7,
-                "top_p": 0.9
-            }
-        ),
-        ModelInfo(
-            name="stable-video-diffusion",
-            model_type=ModelType.TEXT_TO_VIDEO.value,
-            description="Text-to-video generation model",
-            parameters={
-                "width": 576,
-                "height": 320,
-                "frames": 25,
-                "fps": 8
-            }
-        )
-    ]
+    """Get list of available models, including checkpoints in the models directory."""
+    return _catalog("models").entries()
+
+
+def query_models(
+    model_type: Optional[str] = None,
+    q: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Search the model catalog one page at a time.
+    
+    Args:
+        model_type: Only models of this type
+        q: Words matched against name, description and model type
+        limit: Page size (0 only counts matches)
+        cursor: next_cursor of the previous page
     
-    return [asdict(model) for model in models]
+    Returns:
+        Dictionary with the page's items, the total match count and next_cursor
+    """
+    return _catalog("models").query(model_type, q, limit, cursor).to_dict()
+
+
+def _lora_catalog() -> Dict[str, LoraInfo]:
+    """Get the available LoRAs keyed by name."""
+    return {entry["name"]: LoraInfo(**entry) for entry in _catalog("loras").entries()}
 
 
 def get_available_loras() -> List[Dict[str, Any]]:
-    """Get list of available LoRAs."""
-    loras = [
-        LoraInfo(
-            name="anime-style",
-            model_type=ModelType.TEXT_TO_IMAGE.value,
-            description="Anime art style LoRA",
-            strength=0.8
-        ),
-        LoraInfo(
-            name="realistic-portrait",
-            model_type=ModelType.TEXT_TO_IMAGE.value,
-            description="Realistic portrait style LoRA",
-            strength=0.7
-        ),
-        LoraInfo(
-            name="cyberpunk",
-            model_type=ModelType.TEXT_TO_IMAGE.value,
-            description="Cyberpunk aesthetic LoRA",
-            strength=0.9
-        )
-    ]
-    
-    return [asdict(lora) for lora in loras]
+    """Get list of available LoRAs, including adapters in the LoRA directory."""
+    return _catalog("loras").entries()
+
+
+def query_loras(
+    model_type: Optional[str] = None,
+    q: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Search the LoRA catalog one page at a time; see query_models."""
+    return _catalog("loras").query(model_type, q, limit, cursor).to_dict()
 
 
 def initialize_backend() -> None:
@@ -314,8 +1335,8 @@ def initialize_backend() -> None:
     logger.info("Initializing AI backend...")
     
     # Create necessary directories
-    Path("models").mkdir(exist_ok=True)
-    Path("loras").mkdir(exist_ok=True)
+    Path(settings.models_dir).mkdir(exist_ok=True)
+    Path(settings.loras_dir).mkdir(exist_ok=True)
     Path("outputs").mkdir(exist_ok=True)
     
     # Load model configurations
@@ -326,4 +1347,4 @@ def initialize_backend() -> None:
 
 def cleanup_old_generations():
     """Clean up old completed generations."""
-    _generation_manager.cleanup_completed() 
\ No newline at end of file
+    get_generation_manager().cleanup_completed() 
\ No newline at end of file
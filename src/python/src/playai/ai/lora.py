@@ -0,0 +1,97 @@
+"""Cached application of LoRA adapters to base models.
+
+Merging an adapter into a base model touches every adapted layer, so the
+fused result is cached per (base model, LoRA, strength). Adapter weights are
+cached separately: they are small, so swapping LoRAs on a warm base model
+only costs a merge, never a checkpoint reload. Fused copies are evicted
+least-recently-used under their own byte budget and recomputed on demand.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from .model_cache import LoadedModel, ModelCache, ModelLoader
+
+logger = logging.getLogger(__name__)
+
+# Fuse signature: (base pipeline, adapter weights, strength) -> fused pipeline
+LoraFuser = Callable[[Any, Any, float], Any]
+
+# Default byte budget for cached adapter weights
+DEFAULT_ADAPTER_BUDGET_BYTES = 1024 ** 3
+
+
+def fused_key(model_name: str, lora_name: str, strength: float) -> str:
+    """
+    Build the cache key of a fused model.
+
+    Strengths are rounded to two decimals so that float noise from clients
+    does not fragment the cache.
+    """
+    return f"{model_name}+{lora_name}@{strength:.2f}"
+
+
+class LoraCache:
+    """Cache of base models with LoRA adapters merged in."""
+
+    def __init__(
+        self,
+        models: ModelCache,
+        adapter_loader: ModelLoader,
+        fuse: LoraFuser,
+        budget_bytes: int,
+        adapter_budget_bytes: int = DEFAULT_ADAPTER_BUDGET_BYTES
+    ):
+        self.models = models
+        self.fuse = fuse
+        self.adapters = ModelCache(adapter_budget_bytes, adapter_loader)
+        self.fused = ModelCache(budget_bytes, self._load_fused)
+        self._specs: Dict[str, Tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(
+        self,
+        model_name: str,
+        lora_name: str,
+        strength: float
+    ) -> Iterator[LoadedModel]:
+        """
+        Get a base model with a LoRA merged in, fusing it on a miss, and pin
+        it for the duration.
+
+        Args:
+            model_name: Base model name
+            lora_name: LoRA adapter name
+            strength: Adapter strength
+
+        Yields:
+            The resident fused model
+        """
+        strength = round(float(strength), 2)
+        key = fused_key(model_name, lora_name, strength)
+        with self._lock:
+            self._specs[key] = (model_name, lora_name, strength)
+
+        with self.fused.acquire(key) as fused:
+            yield fused
+
+    def stats(self) -> Dict[str, Any]:
+        """Get counters for the fused and adapter caches."""
+        return {
+            "fused": self.fused.stats(),
+            "adapters": self.adapters.stats(),
+        }
+
+    def _load_fused(self, key: str) -> Tuple[Any, int]:
+        with self._lock:
+            model_name, lora_name, strength = self._specs[key]
+
+        with self.models.acquire(model_name) as base:
+            with self.adapters.acquire(lora_name) as adapter:
+                logger.info(f"Fusing LoRA {lora_name} into {model_name} at {strength}")
+                pipeline = self.fuse(base.pipeline, adapter.pipeline, strength)
+                # A fused copy holds a full set of base weights
+                return pipeline, base.size_bytes
@@ -0,0 +1,306 @@
+"""Per-generation timing spans and aggregate generation metrics.
+
+Every generation carries a :class:`Timings` that records how long it spent
+in each stage: waiting in the queue, loading its model, applying its LoRA,
+running inference, encoding the result and writing the output. When the
+generation finishes, the manager folds its timings into
+:class:`GenerationMetrics`. This holds counters and latency histograms per
+model type and model name, readable as a dictionary or in the Prometheus
+text exposition format.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+QUEUED = "queued"
+MODEL_LOAD = "model_load"
+LORA_APPLY = "lora_apply"
+INFERENCE = "inference"
+ENCODE = "encode"
+WRITE = "write"
+STAGES = (QUEUED, MODEL_LOAD, LORA_APPLY, INFERENCE, ENCODE, WRITE)
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+# Quantiles estimated from the histograms in metric snapshots
+SNAPSHOT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Model type, model name and stage or status
+LabelKey = Tuple[str, str, str]
+
+
+class Timings:
+    """Stage durations of one generation."""
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start: perf_counter() time the generation was submitted (default: now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.stages: Dict[str, float] = {}
+        self.total: Optional[float] = None
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage."""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the body of a ``with`` block as part of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def finish(self) -> None:
+        """Record the time from submission until now as the total."""
+        self.total = time.perf_counter() - self.start
+
+    def to_dict(self) -> Dict[str, float]:
+        """Get the stage durations and total in milliseconds."""
+        data = {
+            f"{stage}_ms": round(self.stages[stage] * 1000, 3)
+            for stage in STAGES if stage in self.stages
+        }
+        if self.total is not None:
+            data["total_ms"] = round(self.total * 1000, 3)
+        return data
+
+
+class Histogram:
+    """Counts of observations in fixed cumulative buckets."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # The last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Get (upper bound, observations at or below it) pairs, ending with +Inf."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by interpolating within its bucket.
+
+        Observations above the last bound are reported as the last bound.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        lower, below = 0.0, 0
+        for bound, running in self.cumulative():
+            if running >= rank:
+                if bound == float("inf"):
+                    return self.buckets[-1] if self.buckets else 0.0
+                inside = running - below
+                fraction = (rank - below) / inside if inside else 0.0
+                return lower + (bound - lower) * fraction
+            lower, below = bound, running
+        return lower
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the count, sum, mean and estimated quantiles in milliseconds."""
+        data: Dict[str, Any] = {
+            "count": self.count,
+            "sum_ms": round(self.sum * 1000, 3),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+        }
+        for q in SNAPSHOT_QUANTILES:
+            data[f"p{int(q * 100)}_ms"] = round(self.quantile(q) * 1000, 3)
+        return data
+
+
+def _labels(**labels: Any) -> str:
+    escaped = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def prometheus_gauge(
+    name: str,
+    help_text: str,
+    label: str,
+    values: Mapping[str, float]
+) -> List[str]:
+    """
+    Render a gauge with one label in the Prometheus text format.
+
+    Returns:
+        Exposition lines, without trailing newlines
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for key, value in sorted(values.items()):
+        lines.append(f"{name}{_labels(**{label: key})} {value}")
+    return lines
+
+
+class GenerationMetrics:
+    """Thread-safe counters and stage histograms per model type and model name."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._generations: Dict[LabelKey, int] = {}
+        self._stages: Dict[LabelKey, Histogram] = {}
+        self._durations: Dict[LabelKey, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        model_type: str,
+        model_name: str,
+        status: str,
+        timings: Optional[Timings] = None
+    ) -> None:
+        """
+        Count a finished generation and record its timings.
+
+        Args:
+            model_type: Model type label
+            model_name: Model name label
+            status: Terminal status, or e.g. "cached" for results served
+                without running
+            timings: Stage durations; None only counts the generation
+        """
+        with self._lock:
+            key = (model_type, model_name, status)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            if timings is None:
+                return
+            for stage, seconds in timings.stages.items():
+                stage_key = (model_type, model_name, stage)
+                self._histogram(self._stages, stage_key).observe(seconds)
+            if timings.total is not None:
+                self._histogram(self._durations, key).observe(timings.total)
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get every counter and histogram summary.
+
+        Returns:
+            ``generations`` counts per model type, model name and status;
+            ``stages`` summaries per model type, model name and stage; and
+            ``durations`` (submission to finish) per model type, model name
+            and status
+        """
+        with self._lock:
+            return {
+                "generations": [
+                    {"model_type": t, "model_name": n, "status": s, "count": count}
+                    for (t, n, s), count in sorted(self._generations.items())
+                ],
+                "stages": [
+                    dict(
+                        {"model_type": t, "model_name": n, "stage": s},
+                        **histogram.summary()
+                    )
+                    for (t, n, s), histogram in sorted(self._stages.items())
+                ],
+                "durations": [
+                    dict(
+                        {"model_type": t, "model_name": n, "status": s},
+                        **histogram.summary()
+                    )
+                    for (t, n, s), histogram in sorted(self._durations.items())
+                ],
+            }
+
+    def to_prometheus(self) -> List[str]:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition lines, without trailing newlines
+        """
+        with self._lock:
+            lines = [
+                "# HELP playai_generations_total Generations by final status.",
+                "# TYPE playai_generations_total counter",
+            ]
+            for (t, n, s), count in sorted(self._generations.items()):
+                labels = _labels(model_type=t, model_name=n, status=s)
+                lines.append(f"playai_generations_total{labels} {count}")
+
+            lines.extend(self._render_histograms(
+                "playai_generation_stage_seconds",
+                "Time generations spent in each stage.",
+                "stage",
+                self._stages.items()
+            ))
+            lines.extend(self._render_histograms(
+                "playai_generation_duration_seconds",
+                "Time from submission until a generation finished.",
+                "status",
+                self._durations.items()
+            ))
+        return lines
+
+    def reset(self) -> None:
+        """Drop every recorded value."""
+        with self._lock:
+            self._generations.clear()
+            self._stages.clear()
+            self._durations.clear()
+
+    def _histogram(self, table: Dict[LabelKey, Histogram], key: LabelKey) -> Histogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram(self.buckets)
+        return histogram
+
+    def _render_histograms(
+        self,
+        name: str,
+        help_text: str,
+        label: str,
+        items: Iterable[Tuple[LabelKey, Histogram]]
+    ) -> List[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (t, n, value), histogram in sorted(items):
+            labels = {"model_type": t, "model_name": n, label: value}
+            for bound, running in histogram.cumulative():
+                bucket = _labels(**labels, le=_bound(bound))
+                lines.append(f"{name}_bucket{bucket} {running}")
+            lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum}")
+            lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+        return lines
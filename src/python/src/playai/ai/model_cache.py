@@ -0,0 +1,158 @@
+"""Memory-budgeted LRU cache of loaded model pipelines.
+
+Loading a checkpoint takes seconds, so pipelines stay resident between
+requests until the configured RAM budget forces them out. Models are
+evicted least-recently-used first, and a model is pinned (never evicted)
+while any generation holds it through :meth:`ModelCache.acquire`.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Loader signature: model name -> (pipeline, resident size in bytes)
+ModelLoader = Callable[[str], Tuple[Any, int]]
+
+
+@dataclass
+class LoadedModel:
+    """A resident model pipeline."""
+    name: str
+    pipeline: Any
+    size_bytes: int
+    pins: int = 0
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+    hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    evictions: int = 0
+    resident_bytes: int = 0
+    budget_bytes: int = 0
+    resident_models: int = 0
+    pinned_models: int = 0
+
+
+class ModelCache:
+    """LRU cache of model pipelines bounded by a byte budget."""
+
+    def __init__(self, budget_bytes: int, loader: ModelLoader):
+        self.budget_bytes = budget_bytes
+        self.loader = loader
+        self._models: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self._loading: Dict[str, threading.Event] = {}
+        self._stats = CacheStats(budget_bytes=budget_bytes)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, name: str) -> Iterator[LoadedModel]:
+        """
+        Get a model, loading it on a miss, and pin it for the duration.
+
+        Args:
+            name: Model name
+
+        Yields:
+            The resident model
+        """
+        model = self._pin(name)
+        try:
+            yield model
+        finally:
+            self._unpin(model)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and residency as a dictionary."""
+        with self._lock:
+            self._stats.resident_models = len(self._models)
+            self._stats.pinned_models = sum(1 for m in self._models.values() if m.pins)
+            return asdict(self._stats)
+
+    def resident(self) -> Dict[str, int]:
+        """Get resident model names (least recently used first) and sizes."""
+        with self._lock:
+            return {name: model.size_bytes for name, model in self._models.items()}
+
+    def evict(self, name: str) -> bool:
+        """
+        Drop a model if it is resident and not in use.
+
+        Returns:
+            True if the model was evicted
+        """
+        with self._lock:
+            model = self._models.get(name)
+            if model is None or model.pins:
+                return False
+            self._remove(model)
+            return True
+
+    def _pin(self, name: str) -> LoadedModel:
+        while True:
+            with self._lock:
+                model = self._models.get(name)
+                if model is not None:
+                    self._stats.hits += 1
+                    self._models.move_to_end(name)
+                    model.pins += 1
+                    return model
+
+                loading = self._loading.get(name)
+                if loading is None:
+                    self._stats.misses += 1
+                    loading = threading.Event()
+                    self._loading[name] = loading
+                    break
+
+            # Another thread is loading the same model; wait and retry
+            loading.wait()
+
+        try:
+            logger.info(f"Loading model {name}")
+            pipeline, size_bytes = self.loader(name)
+        except Exception:
+            with self._lock:
+                del self._loading[name]
+            loading.set()
+            raise
+
+        with self._lock:
+            model = LoadedModel(
+                name=name, pipeline=pipeline, size_bytes=size_bytes, pins=1
+            )
+            self._models[name] = model
+            self._stats.loads += 1
+            self._stats.resident_bytes += size_bytes
+            self._evict_to_budget()
+            del self._loading[name]
+        loading.set()
+        return model
+
+    def _unpin(self, model: LoadedModel) -> None:
+        with self._lock:
+            model.pins -= 1
+            self._evict_to_budget()
+
+    def _evict_to_budget(self) -> None:
+        if self._stats.resident_bytes <= self.budget_bytes:
+            return
+
+        for model in list(self._models.values()):
+            if self._stats.resident_bytes <= self.budget_bytes:
+                return
+            if not model.pins:
+                logger.info(f"Evicting model {model.name} ({model.size_bytes} bytes)")
+                self._remove(model)
+
+    def _remove(self, model: LoadedModel) -> None:
+        del self._models[model.name]
+        self._stats.evictions += 1
+        self._stats.resident_bytes -= model.size_bytes
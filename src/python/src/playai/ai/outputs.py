@@ -0,0 +1,251 @@
+"""Raw generation outputs handed over without copying.
+
+By default a generation's output is encoded to a file and only its name is
+returned. In the raw output modes the decoded result (pixels, PCM samples or
+video frames) is left in a buffer that local consumers map directly:
+
+- ``mmap``: a file under the raw output directory, mapped by path
+- ``shm``: a named shared-memory segment owned by the generating process
+
+The response carries an ``OutputHandle`` describing where the array lives
+and its shape and dtype, so e.g. ``numpy.frombuffer(view, dtype)`` or
+``PIL.Image.frombuffer`` can wrap it without a decode round trip.
+
+Outputs are freed when their generation is evicted from the registry.
+Shared-memory segments are also freed when the process exits, so they are
+only useful from a long-running backend such as ``playai serve``.
+"""
+
+import atexit
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+from .process_pool import SharedBuffer
+
+logger = logging.getLogger(__name__)
+
+FILE = "file"
+MMAP = "mmap"
+SHM = "shm"
+OUTPUT_MODES = (FILE, MMAP, SHM)
+
+# numpy dtype names mapped to struct format characters
+DTYPE_FORMATS = {
+    "uint8": "B",
+    "int16": "h",
+    "float32": "f",
+}
+
+
+@dataclass(frozen=True)
+class OutputHandle:
+    """Location and layout of a raw output array."""
+    kind: str
+    location: str
+    shape: Tuple[int, ...]
+    dtype: str
+    offset: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the array in bytes."""
+        return math.prod(self.shape) * struct.calcsize(DTYPE_FORMATS[self.dtype])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        data = asdict(self)
+        data["shape"] = list(self.shape)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OutputHandle":
+        """Rebuild a handle from its dictionary form."""
+        return cls(
+            kind=data["kind"],
+            location=data["location"],
+            shape=tuple(data["shape"]),
+            dtype=data["dtype"],
+            offset=data.get("offset", 0)
+        )
+
+
+@contextmanager
+def open_output(
+    handle: Union[OutputHandle, Dict[str, Any]],
+    writable: bool = False
+) -> Iterator[memoryview]:
+    """
+    Map a raw output without copying it.
+
+    The view is only valid inside the ``with`` block.
+
+    Args:
+        handle: Output handle, or its dictionary form from a response
+        writable: Map the output for writing
+
+    Yields:
+        memoryview with the output's shape and item format
+
+    Raises:
+        ValueError: If the handle's kind or dtype is unknown
+        OSError: If the output no longer exists
+    """
+    if isinstance(handle, dict):
+        handle = OutputHandle.from_dict(handle)
+    if handle.dtype not in DTYPE_FORMATS:
+        raise ValueError(f"Unsupported dtype: {handle.dtype}")
+    item_format = DTYPE_FORMATS[handle.dtype]
+
+    if handle.kind == SHM:
+        buffer = SharedBuffer(
+            handle.nbytes, handle.shape, item_format, name=handle.location
+        )
+        try:
+            with buffer.view() as view:
+                yield view
+        finally:
+            buffer.close()
+    elif handle.kind == MMAP:
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        with open(handle.location, "r+b" if writable else "rb") as f:
+            mapped = mmap.mmap(f.fileno(), handle.offset + handle.nbytes, access=access)
+        raw = memoryview(mapped)[handle.offset:handle.offset + handle.nbytes]
+        # typeshed only accepts literal format characters here
+        typed = raw.cast(item_format, handle.shape)  # type: ignore[call-overload]
+        try:
+            yield typed
+        finally:
+            typed.release()
+            raw.release()
+            mapped.close()
+    else:
+        raise ValueError(f"Unsupported output kind: {handle.kind}")
+
+
+class OutputStore:
+    """Allocates raw outputs and frees them when they are no longer needed."""
+
+    def __init__(self, directory: Union[str, Path], shared_memory: bool = True):
+        self.directory = Path(directory)
+        # Turned off by processes that exit as soon as their generations
+        # finish, whose segments would be gone before anyone could read them
+        self.shared_memory = shared_memory
+        self._outputs: Dict[str, Tuple[OutputHandle, Any]] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def allocate(
+        self,
+        generation_id: str,
+        kind: str,
+        shape: Sequence[int],
+        dtype: str
+    ) -> OutputHandle:
+        """
+        Create a zero-filled output buffer for a generation.
+
+        Args:
+            generation_id: Generation that owns the output
+            kind: MMAP or SHM
+            shape: Array shape
+            dtype: Item type, one of DTYPE_FORMATS
+
+        Returns:
+            Handle to write the output through and return to the caller
+
+        Raises:
+            ValueError: If the kind or dtype is unknown, or the kind is SHM
+                and shared memory is turned off
+        """
+        self.check_kind(kind)
+        if dtype not in DTYPE_FORMATS:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        shape = tuple(int(n) for n in shape)
+        nbytes = math.prod(shape) * struct.calcsize(DTYPE_FORMATS[dtype])
+
+        owner: Union[SharedBuffer, Path]
+        if kind == SHM:
+            buffer = SharedBuffer(nbytes, shape, DTYPE_FORMATS[dtype])
+            owner = buffer
+            handle = OutputHandle(SHM, buffer.name, shape, dtype)
+        elif kind == MMAP:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{generation_id}.raw"
+            with open(path, "wb") as f:
+                f.truncate(nbytes)
+            owner = path
+            handle = OutputHandle(MMAP, str(path), shape, dtype)
+
+        with self._lock:
+            previous = self._outputs.pop(generation_id, None)
+            self._outputs[generation_id] = (handle, owner)
+        if previous is not None:
+            self._free(*previous)
+        return handle
+
+    def check_kind(self, kind: str) -> None:
+        """
+        Check that outputs of a kind can be allocated.
+
+        Raises:
+            ValueError: If the kind is unknown, or SHM while shared memory is off
+        """
+        if kind not in (MMAP, SHM):
+            raise ValueError(f"Unsupported output kind: {kind}")
+        if kind == SHM and not self.shared_memory:
+            raise ValueError(
+                "Shared-memory outputs are freed when this process exits; "
+                "use mmap, or submit through playai serve"
+            )
+
+    def get(self, generation_id: str) -> Optional[OutputHandle]:
+        """Get the handle of a generation's output, if it has one."""
+        with self._lock:
+            entry = self._outputs.get(generation_id)
+        return entry[0] if entry else None
+
+    def generation_ids(self) -> Tuple[str, ...]:
+        """Get the generations that currently own an output."""
+        with self._lock:
+            return tuple(self._outputs)
+
+    def release(self, generation_id: str) -> bool:
+        """
+        Free a generation's output.
+
+        Returns:
+            True if the generation had an output
+        """
+        with self._lock:
+            entry = self._outputs.pop(generation_id, None)
+        if entry is None:
+            return False
+        self._free(*entry)
+        return True
+
+    def close(self) -> None:
+        """Free every shared-memory output; mmap files stay on disk."""
+        with self._lock:
+            segments = [
+                generation_id for generation_id, (handle, _) in self._outputs.items()
+                if handle.kind == SHM
+            ]
+        for generation_id in segments:
+            self.release(generation_id)
+
+    def _free(self, handle: OutputHandle, owner: Any) -> None:
+        try:
+            if handle.kind == SHM:
+                owner.close()
+            else:
+                os.unlink(owner)
+        except OSError as e:
+            logger.warning(f"Failed to free output {handle.location}: {e}")
@@ -0,0 +1,286 @@
+"""Process pool for GIL-bound pre- and post-processing stages.
+
+Inference itself releases the GIL, but the pure-Python work around it
+(resampling, encoding, muxing) does not, so running it on the generation
+worker threads serializes it. A ``ProcessStage`` runs such functions in a
+pool of worker processes instead. Large arrays travel between processes in
+``SharedBuffer`` blocks of shared memory: only the block's name is pickled,
+and both sides read and write the same pages.
+
+Stage functions must be importable module-level functions so the workers
+can unpickle them. With ``max_workers=0`` they run inline on the calling
+thread, which is the default and keeps single-process deployments cheap.
+"""
+
+import logging
+import os
+import struct
+import sys
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Sequence, Set, Tuple
+)
+
+from .cancellation import CancellationToken
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+logger = logging.getLogger(__name__)
+
+# Blocks created by this process that it has not freed yet
+_created: Set[str] = set()
+
+
+class SharedBuffer:
+    """Typed block of shared memory that pickles by name, not by contents."""
+
+    def __init__(
+        self,
+        nbytes: int,
+        shape: Optional[Sequence[int]] = None,
+        format: str = "B",
+        name: Optional[str] = None
+    ):
+        """
+        Create a new block, or attach to an existing one by name.
+
+        Args:
+            nbytes: Size in bytes
+            shape: Item shape (defaults to one dimension spanning the block)
+            format: struct format character of one item, e.g. "f" or "h"
+            name: Name of an existing block to attach to
+        """
+        itemsize = struct.calcsize(format)
+        if nbytes % itemsize:
+            raise ValueError(
+                f"{nbytes} bytes is not a whole number of {format!r} items"
+            )
+
+        self._owner = name is None
+        if name is None:
+            from multiprocessing import shared_memory
+
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+            _created.add(self._shm.name)
+        else:
+            self._shm = _attach(name)
+        self.name = self._shm.name
+        self.nbytes = nbytes
+        self.format = format
+        self.shape = tuple(shape) if shape is not None else (nbytes // itemsize,)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: Any,
+        shape: Optional[Sequence[int]] = None,
+        format: str = "B"
+    ) -> "SharedBuffer":
+        """Create a block holding a copy of a bytes-like object."""
+        source = memoryview(data).cast("B")
+        buffer = cls(source.nbytes, shape, format)
+        buffer._buf[:source.nbytes] = source
+        return buffer
+
+    @property
+    def _buf(self) -> memoryview:
+        buf = self._shm.buf
+        if buf is None:
+            raise ValueError(f"Shared memory block {self.name} is closed")
+        return buf
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        return (SharedBuffer, (self.nbytes, self.shape, self.format, self.name))
+
+    def __repr__(self) -> str:
+        return (
+            f"SharedBuffer({self.name!r}, shape={self.shape}, format={self.format!r})"
+        )
+
+    def __enter__(self) -> "SharedBuffer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @contextmanager
+    def view(self) -> Iterator["memoryview[Any]"]:
+        """Yield a typed, shaped memoryview of the block."""
+        raw = self._buf[:self.nbytes]
+        typed: "memoryview[Any]" = raw
+        if self.nbytes:
+            # typeshed only accepts literal format characters here
+            typed = raw.cast(self.format, self.shape)  # type: ignore[call-overload]
+        try:
+            yield typed
+        finally:
+            typed.release()
+            raw.release()
+
+    def tobytes(self) -> bytes:
+        """Copy the block's contents out of shared memory."""
+        return bytes(self._buf[:self.nbytes])
+
+    def close(self) -> None:
+        """Detach from the block; the creating side also frees it."""
+        self._shm.close()
+        if self._owner:
+            _created.discard(self.name)
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _attach(name: str) -> "SharedMemory":
+    """
+    Attach to an existing block without taking over its cleanup.
+
+    Before Python 3.13, attaching registers the block with this process's
+    resource tracker, which unlinks it when the process exits, even though
+    another process created it and still serves it. The registration is
+    dropped again unless the tracker is the creator's as well: the block was
+    created here, or this is a multiprocessing child sharing its parent's
+    tracker.
+    """
+    from multiprocessing import shared_memory
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix" and shm.name not in _created:
+        import multiprocessing
+        from multiprocessing import resource_tracker
+
+        if multiprocessing.parent_process() is None:
+            # The tracker knows POSIX blocks by their leading-slash name
+            resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+    return shm
+
+
+def _completed(fn: Callable[..., Any], args: tuple) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
+
+class ProcessStage:
+    """Runs CPU-bound stage functions in a lazily started process pool."""
+
+    def __init__(
+        self,
+        max_workers: int = 0,
+        start_method: str = "spawn",
+        poll_interval: float = 0.05
+    ):
+        """
+        Args:
+            max_workers: Worker processes (0 runs stages inline)
+            start_method: multiprocessing start method; "spawn" is safe to
+                use from a process that already runs threads
+            poll_interval: Seconds between cancellation checks while waiting
+        """
+        self.max_workers = max(0, max_workers)
+        self.start_method = start_method
+        self.poll_interval = poll_interval
+        self.submitted = 0
+        self._pool: Optional["ProcessPoolExecutor"] = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        Schedule a stage function.
+
+        Args:
+            fn: Module-level function
+            *args: Picklable arguments; pass arrays as SharedBuffer
+
+        Returns:
+            Future with the function's return value
+        """
+        with self._lock:
+            self.submitted += 1
+        if not self.max_workers:
+            return _completed(fn, args)
+
+        from concurrent.futures.process import BrokenProcessPool
+
+        pool = self._get_pool()
+        try:
+            return pool.submit(fn, *args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool rather than failing every later stage
+            logger.warning("Process pool broken, restarting it")
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False)
+            return self._get_pool().submit(fn, *args)
+
+    def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        token: Optional[CancellationToken] = None
+    ) -> Any:
+        """
+        Run a stage function and wait for its result.
+
+        Args:
+            fn: Module-level function
+            *args: Picklable arguments; pass arrays as SharedBuffer
+            token: Stop waiting once this token is cancelled
+
+        Returns:
+            The function's return value
+
+        Raises:
+            GenerationCancelled: If the token is cancelled while waiting
+        """
+        future = self.submit(fn, *args)
+        if token is None:
+            return future.result()
+
+        while True:
+            try:
+                return future.result(timeout=self.poll_interval)
+            except FutureTimeout:
+                if token.cancelled:
+                    future.cancel()
+                    token.raise_if_cancelled()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool size and usage counters."""
+        return {
+            "workers": self.max_workers,
+            "started": self._pool is not None,
+            "submitted": self.submitted,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes; a later submit starts a new pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def _get_pool(self) -> "ProcessPoolExecutor":
+        with self._lock:
+            if self._pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+                logger.info(f"Started process pool with {self.max_workers} workers")
+            return self._pool
@@ -0,0 +1,67 @@
+"""CPU-bound post-processing stages.
+
+These run in ProcessStage workers, so they are module-level functions that
+take their arrays as SharedBuffer blocks and write results in place rather
+than returning large values.
+"""
+
+from .process_pool import SharedBuffer
+
+PCM16_MAX = 32767
+
+
+def resample_linear(source: SharedBuffer, target: SharedBuffer) -> int:
+    """
+    Resample a mono signal to the target's length by linear interpolation.
+
+    Args:
+        source: Input samples
+        target: Output samples; its length sets the new rate
+
+    Returns:
+        Number of samples written
+    """
+    with source.view() as src, target.view() as dst:
+        n_in, n_out = len(src), len(dst)
+        if n_in == 0:
+            for i in range(n_out):
+                dst[i] = 0
+            return n_out
+
+        scale = (n_in - 1) / (n_out - 1) if n_out > 1 else 0.0
+        last = n_in - 1
+        for i in range(n_out):
+            position = i * scale
+            j = int(position)
+            k = j + 1 if j < last else last
+            dst[i] = src[j] + (src[k] - src[j]) * (position - j)
+        return n_out
+
+
+def to_pcm16(source: SharedBuffer, target: SharedBuffer, gain: float = 1.0) -> int:
+    """
+    Convert float samples in [-1, 1] to clipped 16-bit PCM.
+
+    Args:
+        source: Float samples
+        target: 16-bit output ("h" format) of the same length
+        gain: Linear gain applied before clipping
+
+    Returns:
+        Number of samples clipped
+    """
+    clipped = 0
+    scale = gain * PCM16_MAX
+    with source.view() as src, target.view() as dst:
+        if len(src) != len(dst):
+            raise ValueError(f"Length mismatch: {len(src)} samples into {len(dst)}")
+        for i in range(len(src)):
+            value = int(src[i] * scale)
+            if value > PCM16_MAX:
+                value = PCM16_MAX
+                clipped += 1
+            elif value < -PCM16_MAX:
+                value = -PCM16_MAX
+                clipped += 1
+            dst[i] = value
+    return clipped
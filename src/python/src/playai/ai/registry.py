@@ -0,0 +1,588 @@
+"""Durable registry of generations backed by SQLite.
+
+Generation state outlives the process that created it, so ``status`` and
+``cancel`` work across CLI invocations and between backend processes that
+share a database. Generations that are still pending or running live in
+memory and are mutated in place; every status transition is queued and
+written in batches by a background thread, in WAL mode so readers in other
+processes never block the writer. Finished generations are kept in a small
+LRU front cache and otherwise read back from disk, so memory use does not
+grow with the number of recorded generations.
+
+Every change publishes a new immutable :class:`StatusSnapshot` with a
+per-generation version number. Readers fetch snapshots without taking any
+lock and can cheaply tell whether anything changed since a version they
+already have. Generations that another process is still running are
+re-read from the database on every lookup until they finish.
+
+Finished generations expire after a time-to-live and once more than a
+maximum number have finished. The background thread pops expired entries
+off a heap ordered by completion time and sweeps rows left by other
+processes through the ``updated_at`` index, so eviction costs scale with
+the number of expired generations rather than the size of the table. An
+``on_evict`` callback is told about every generation of this process that
+is evicted or purged, so resources held for it can be freed.
+
+Each row records the process that created it. Generations left pending or
+running by a process that has since exited (a one-shot CLI that was
+killed, a crashed backend) are marked failed when a registry is opened on
+the same database, so they are not reported as pending forever.
+"""
+
+import atexit
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Database file used when settings.database_url is not a SQLite URL
+DEFAULT_DATABASE_PATH = "outputs/playai.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS generations (
+    generation_id TEXT PRIMARY KEY,
+    model_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    success INTEGER NOT NULL DEFAULT 0,
+    data TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    owner INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_generations_status ON generations (status);
+CREATE INDEX IF NOT EXISTS idx_generations_model_type ON generations (model_type);
+CREATE INDEX IF NOT EXISTS idx_generations_created_at ON generations (created_at);
+CREATE INDEX IF NOT EXISTS idx_generations_updated_at ON generations (updated_at);
+"""
+
+# Columns added to the table since it was first released
+_ADDED_COLUMNS = (
+    ("version", "INTEGER NOT NULL DEFAULT 1"),
+    ("owner", "INTEGER"),
+)
+
+# A cancellation recorded by any process is final; the owner never changes
+_UPSERT = """
+INSERT INTO generations (
+    generation_id, model_type, status, success, data, error,
+    created_at, updated_at, version, owner
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (generation_id) DO UPDATE SET
+    status = excluded.status,
+    success = excluded.success,
+    data = excluded.data,
+    error = excluded.error,
+    updated_at = excluded.updated_at,
+    version = excluded.version
+WHERE generations.status != 'cancelled'
+"""
+
+# Column order matches the queued rows written by _UPSERT
+_SELECT = """
+SELECT
+    generation_id, model_type, status, success, data, error,
+    created_at, updated_at, version
+FROM generations WHERE generation_id = ?
+"""
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+ACTIVE_STATUSES = ("pending", "processing")
+
+ORPHANED_ERROR = "Interrupted: the process running this generation exited"
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Immutable view of a generation at one version; ``data`` must not be mutated."""
+    generation_id: str
+    status: str
+    success: bool
+    data: Optional[Dict[str, Any]]
+    error: Optional[str]
+    version: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the snapshot as a dictionary sharing (not copying) ``data``."""
+        return dict(self.__dict__)
+
+
+# Cached entry: (response, model_type, created_at)
+_Entry = Tuple[Any, str, float]
+
+
+def sqlite_path(database_url: Optional[str]) -> str:
+    """
+    Get the SQLite database path for a database URL.
+
+    Args:
+        database_url: ``sqlite:///relative.db``, ``sqlite:////absolute.db``,
+            ``sqlite://`` (in memory) or None
+
+    Returns:
+        File path, or ``:memory:``
+    """
+    if not database_url:
+        return DEFAULT_DATABASE_PATH
+    if database_url in ("sqlite://", "sqlite:///:memory:"):
+        return ":memory:"
+    if database_url.startswith("sqlite:///"):
+        return database_url[len("sqlite:///"):]
+
+    logger.warning(
+        f"Generation registry only supports SQLite URLs; using {DEFAULT_DATABASE_PATH}"
+    )
+    return DEFAULT_DATABASE_PATH
+
+
+class GenerationRegistry:
+    """Generation responses persisted to SQLite with an in-memory front cache."""
+
+    def __init__(
+        self,
+        database_url: Optional[str],
+        response_type: Callable[..., Any],
+        cache_size: int = 1024,
+        flush_interval: float = 0.05,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        reap_interval: float = 5.0,
+        on_evict: Optional[Callable[[str], Any]] = None
+    ):
+        self.path = sqlite_path(database_url)
+        self.response_type = response_type
+        self.cache_size = cache_size
+        self.flush_interval = flush_interval
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.reap_interval = reap_interval
+        # Called with the id of each evicted or purged generation of this process
+        self.on_evict = on_evict
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+
+        self._active: Dict[str, _Entry] = {}
+        self._recent: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._dirty: Dict[str, tuple] = {}
+        self._expiry: List[Tuple[float, str, str]] = []
+        # Replaced wholesale on every change; read without locking
+        self._snapshots: Dict[str, StatusSnapshot] = {}
+        self._last_sweep = 0.0
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self._db_closed = False
+        atexit.register(self.close)
+
+        if self.path != ":memory:":
+            self._fail_orphans()
+
+    def add(self, response: Any, model_type: str) -> None:
+        """Register a new generation."""
+        with self._lock:
+            self._active[response.generation_id] = (response, model_type, time.time())
+            self._mark_dirty(response.generation_id)
+
+    def get(self, generation_id: str) -> Optional[Any]:
+        """
+        Look up a generation, reading it from the database on a cache miss.
+
+        A generation owned by another process is refreshed from the database
+        until it finishes; the cached response is updated in place.
+
+        Args:
+            generation_id: Generation to look up
+
+        Returns:
+            Response object, or None if the generation is unknown
+        """
+        with self._lock:
+            entry = self._active.get(generation_id)
+            if entry is not None:
+                return entry[0]
+            entry = self._recent.get(generation_id)
+            if entry is not None:
+                self._recent.move_to_end(generation_id)
+                if entry[0].status in TERMINAL_STATUSES:
+                    return entry[0]
+            # Evicted from the front cache before its last change was written
+            row = self._dirty.get(generation_id)
+
+        if row is None:
+            row = self._select(generation_id)
+        if row is None:
+            return None
+
+        data = json.loads(row[4]) if row[4] is not None else None
+        with self._lock:
+            entry = self._active.get(generation_id) or self._recent.get(generation_id)
+            if entry is None:
+                response = self.response_type(
+                    success=bool(row[3]),
+                    data=data,
+                    error=row[5],
+                    generation_id=row[0],
+                    status=row[2]
+                )
+                self._remember(generation_id, (response, row[1], row[6]))
+            elif generation_id in self._active or entry[0].status in TERMINAL_STATUSES:
+                return entry[0]
+            else:
+                # Still running in another process; bring the cached copy up to date
+                response = entry[0]
+                response.status = row[2]
+                response.success = bool(row[3])
+                response.data = data
+                response.error = row[5]
+            self._snapshots[generation_id] = StatusSnapshot(
+                generation_id=response.generation_id,
+                status=response.status,
+                success=response.success,
+                data=response.data,
+                error=response.error,
+                version=row[8]
+            )
+        return response
+
+    def snapshot(self, generation_id: str) -> Optional[StatusSnapshot]:
+        """
+        Get the latest immutable snapshot of a generation.
+
+        Generations that are running here or have finished are read without
+        taking a lock. Others, including those still running in another
+        process, are loaded from the database first.
+
+        Args:
+            generation_id: Generation to look up
+
+        Returns:
+            Snapshot, or None if the generation is unknown
+        """
+        snapshot = self._snapshots.get(generation_id)
+        if snapshot is not None and (
+            snapshot.status in TERMINAL_STATUSES or generation_id in self._active
+        ):
+            return snapshot
+        if self.get(generation_id) is None:
+            return None
+        return self._snapshots.get(generation_id)
+
+    def persisted_status(self, generation_id: str) -> Optional[str]:
+        """Get the status stored on disk, which other processes may have changed."""
+        row = self._select(generation_id)
+        return row[2] if row is not None else None
+
+    def save(self, generation_id: str) -> None:
+        """Queue a write of a generation's current state."""
+        with self._lock:
+            entry = self._active.get(generation_id)
+            if entry is not None and entry[0].status in TERMINAL_STATUSES:
+                del self._active[generation_id]
+                self._remember(generation_id, entry)
+                heapq.heappush(
+                    self._expiry, (time.time(), generation_id, entry[0].status)
+                )
+            self._mark_dirty(generation_id)
+
+    def discard(self, generation_id: str) -> None:
+        """Forget a generation entirely."""
+        with self._lock:
+            self._active.pop(generation_id, None)
+            self._recent.pop(generation_id, None)
+            self._dirty.pop(generation_id, None)
+            self._snapshots.pop(generation_id, None)
+        with self._db_lock:
+            if self._db_closed:
+                return
+            self._conn.execute(
+                "DELETE FROM generations WHERE generation_id = ?",
+                (generation_id,)
+            )
+
+    def purge(self, statuses: Iterable[str] = TERMINAL_STATUSES) -> int:
+        """
+        Delete every generation in one of the given statuses.
+
+        Returns:
+            Number of generations deleted from the database
+        """
+        statuses = tuple(statuses)
+        self.flush()
+        purged = set()
+        with self._lock:
+            for generation_id, entry in list(self._recent.items()):
+                if entry[0].status in statuses:
+                    del self._recent[generation_id]
+                    self._snapshots.pop(generation_id, None)
+                    purged.add(generation_id)
+            purged.update(item[1] for item in self._expiry if item[2] in statuses)
+            self._expiry = [item for item in self._expiry if item[2] not in statuses]
+            heapq.heapify(self._expiry)
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._db_lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM generations WHERE status IN ({placeholders})",
+                statuses
+            )
+        self._evicted(purged)
+        return cursor.rowcount
+
+    def flush(self) -> None:
+        """Write all queued changes in one transaction."""
+        with self._lock:
+            rows: List[tuple] = list(self._dirty.values())
+            self._dirty.clear()
+        if not rows:
+            return
+
+        try:
+            with self._db_lock:
+                if self._db_closed:
+                    return
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.executemany(_UPSERT, rows)
+        except sqlite3.Error:
+            # Keep the changes for the next flush unless newer ones replaced them
+            with self._lock:
+                for row in rows:
+                    self._dirty.setdefault(row[0], row)
+            raise
+
+    def reap(self, now: Optional[float] = None) -> int:
+        """
+        Delete finished generations past their TTL or over the entry limit.
+
+        Args:
+            now: Current time (default: time.time())
+
+        Returns:
+            Number of generations finished by this process that were evicted
+        """
+        now = time.time() if now is None else now
+        expired: List[str] = []
+        with self._lock:
+            while self._expiry and (
+                (self.ttl is not None and self._expiry[0][0] <= now - self.ttl)
+                or (
+                    self.max_entries is not None
+                    and len(self._expiry) > self.max_entries
+                )
+            ):
+                _, generation_id, _ = heapq.heappop(self._expiry)
+                self._recent.pop(generation_id, None)
+                self._dirty.pop(generation_id, None)
+                self._snapshots.pop(generation_id, None)
+                expired.append(generation_id)
+
+        # Rows finished by other processes are only reachable through the index
+        sweep = self.ttl is not None and now - self._last_sweep >= self.reap_interval
+        if not expired and not sweep:
+            return 0
+
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        with self._db_lock:
+            if self._db_closed:
+                return 0
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "DELETE FROM generations WHERE generation_id = ?",
+                    [(generation_id,) for generation_id in expired]
+                )
+                if sweep and self.ttl is not None:
+                    self._conn.execute(
+                        f"DELETE FROM generations WHERE updated_at < ? "
+                        f"AND status IN ({placeholders})",
+                        (now - self.ttl, *TERMINAL_STATUSES)
+                    )
+                    self._last_sweep = now
+
+        if expired:
+            logger.debug(f"Evicted {len(expired)} finished generations")
+            self._evicted(expired)
+        return len(expired)
+
+    def close(self) -> None:
+        """Flush queued changes and close the database."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                self._db_closed = True
+                self._conn.close()
+
+    def _migrate(self) -> None:
+        table = self._conn.execute("PRAGMA table_info(generations)").fetchall()
+        columns = {row[1] for row in table}
+        for name, definition in _ADDED_COLUMNS:
+            if name in columns:
+                continue
+            try:
+                self._conn.execute(
+                    f"ALTER TABLE generations ADD COLUMN {name} {definition}"
+                )
+            except sqlite3.OperationalError:
+                # Another process added it first
+                pass
+
+    def _evicted(self, generation_ids: Iterable[str]) -> None:
+        if self.on_evict is None:
+            return
+        for generation_id in generation_ids:
+            try:
+                self.on_evict(generation_id)
+            except Exception as e:
+                logger.error(f"Failed to free evicted generation {generation_id}: {e}")
+
+    def _fail_orphans(self) -> None:
+        placeholders = ", ".join("?" for _ in ACTIVE_STATUSES)
+        owners = self._conn.execute(
+            f"SELECT DISTINCT owner FROM generations WHERE status IN ({placeholders})",
+            ACTIVE_STATUSES
+        ).fetchall()
+        # Rows written before owners were recorded have none
+        orphaned = [
+            owner for (owner,) in owners
+            if owner is None
+            or (owner != os.getpid() and not _process_alive(owner))
+        ]
+        if not orphaned:
+            return
+
+        with self._conn:
+            self._conn.execute("BEGIN")
+            cursor = self._conn.executemany(
+                f"UPDATE generations SET status = 'failed', success = 0, error = ?, "
+                f"updated_at = ?, version = version + 1 "
+                f"WHERE owner IS ? AND status IN ({placeholders})",
+                [
+                    (ORPHANED_ERROR, time.time(), owner, *ACTIVE_STATUSES)
+                    for owner in orphaned
+                ]
+            )
+        logger.warning(f"Marked {cursor.rowcount} interrupted generations as failed")
+
+    def _select(self, generation_id: str) -> Optional[tuple]:
+        with self._db_lock:
+            if self._db_closed:
+                return None
+            cursor = self._conn.execute(_SELECT, (generation_id,))
+            row: Optional[tuple] = cursor.fetchone()
+            return row
+
+    def _remember(self, generation_id: str, entry: _Entry) -> None:
+        self._recent[generation_id] = entry
+        self._recent.move_to_end(generation_id)
+        while len(self._recent) > self.cache_size:
+            evicted, _ = self._recent.popitem(last=False)
+            self._snapshots.pop(evicted, None)
+
+    def _mark_dirty(self, generation_id: str) -> None:
+        entry = self._active.get(generation_id) or self._recent.get(generation_id)
+        if entry is None:
+            return
+
+        response, model_type, created_at = entry
+        previous = self._snapshots.get(generation_id)
+        snapshot = StatusSnapshot(
+            generation_id=generation_id,
+            status=response.status,
+            success=response.success,
+            data=response.data,
+            error=response.error,
+            version=previous.version + 1 if previous is not None else 1
+        )
+        self._snapshots[generation_id] = snapshot
+        data = snapshot.data
+        self._dirty[generation_id] = (
+            generation_id,
+            model_type,
+            snapshot.status,
+            int(snapshot.success),
+            json.dumps(data, default=str) if data is not None else None,
+            snapshot.error,
+            created_at,
+            time.time(),
+            snapshot.version,
+            os.getpid(),
+        )
+        if self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._maintenance_loop,
+                name="playai-registry",
+                daemon=True
+            )
+            self._flusher.start()
+        self._wake.set()
+
+    def _maintenance_loop(self) -> None:
+        while True:
+            if self._wake.wait(self.reap_interval):
+                # Let transitions from concurrent generations accumulate into one batch
+                time.sleep(self.flush_interval)
+                self._wake.clear()
+            if self._closed:
+                return
+            try:
+                self.flush()
+                self.reap()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to maintain generation registry: {e}")
+
+
+def _process_alive(pid: int) -> bool:
+    """Check whether a process with the given id is running."""
+    if sys.platform == "win32":
+        # os.kill() cannot probe a process on Windows without signalling it
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        synchronize = 0x00100000
+        handle = kernel32.OpenProcess(synchronize, False, pid)
+        if not handle:
+            # Access denied means the process exists
+            return bool(kernel32.GetLastError() == 5)
+        try:
+            # WAIT_TIMEOUT: the process has not exited
+            return bool(kernel32.WaitForSingleObject(handle, 0) == 0x102)
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
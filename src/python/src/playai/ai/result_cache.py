@@ -0,0 +1,169 @@
+"""Content-addressed on-disk cache of generation results.
+
+Only deterministic requests are cacheable: a request must carry an explicit
+``seed`` so the same inputs are guaranteed to produce the same output. The
+cache key is a SHA-256 over a canonical JSON encoding of everything that
+affects the output, and results are stored as one JSON file per key. When
+the directory grows past its byte budget, the least recently used results
+are deleted.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def request_fingerprint(
+    model_type: str,
+    prompt: str,
+    parameters: Dict[str, Any],
+    model_name: Optional[str] = None,
+    lora_name: Optional[str] = None
+) -> Optional[str]:
+    """
+    Get the cache key of a generation request.
+
+    Args:
+        model_type: Model type
+        prompt: Prompt text
+        parameters: Generation parameters
+        model_name: Model name, if any
+        lora_name: LoRA name, if any
+
+    Returns:
+        Hex digest, or None if the request is not seeded and thus not cacheable
+    """
+    if parameters.get("seed") is None:
+        return None
+
+    canonical = json.dumps(
+        {
+            "model_type": model_type,
+            "prompt": prompt,
+            "parameters": parameters,
+            "model_name": model_name,
+            "lora_name": lora_name,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded directory of cached results keyed by fingerprint."""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Request fingerprint
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            if key not in index:
+                self.misses += 1
+                return None
+
+            try:
+                result: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+                os.utime(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cached result {key}: {e}")
+                self._forget(key)
+                self.misses += 1
+                return None
+
+            index.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a result, evicting least recently used results over budget.
+
+        Args:
+            key: Request fingerprint
+            result: JSON-serializable result
+        """
+        data = json.dumps(result, default=str).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        with self._lock:
+            index = self._load_index()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Failed to cache result {key}: {e}")
+                return
+
+            self._bytes += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            while self._bytes > self.max_bytes and index:
+                oldest = next(iter(index))
+                self._forget(oldest)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and disk usage."""
+        with self._lock:
+            index = self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            if self.directory.exists():
+                for path in self.directory.glob("*/*.json"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._bytes = sum(self._index.values())
+        return self._index
+
+    def _forget(self, key: str) -> None:
+        self._bytes -= self._load_index().pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
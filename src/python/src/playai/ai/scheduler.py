@@ -0,0 +1,248 @@
+"""Priority- and model-type-aware scheduling of generation jobs.
+
+Jobs are queued per model type. Within a type, higher ``priority`` runs
+first and equal priorities run in submission order. Across types, workers
+pick the eligible queue with the smallest virtual time (jobs served divided
+by the type's weight), so a backlog of long video jobs cannot starve quick
+text or image requests. Per-type concurrency limits cap how many workers a
+single type may occupy at once, and the total number of queued jobs is
+bounded so callers get immediate push-back instead of unbounded latency.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Relative share of worker time per model type when several types are queued
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "text-generation": 4.0,
+    "text-to-image": 3.0,
+    "text-to-audio": 2.0,
+    "text-to-video": 1.0,
+}
+
+# Maximum workers a single model type may occupy at once
+DEFAULT_CONCURRENCY_LIMITS: Dict[str, int] = {
+    "text-to-video": 1,
+    "text-to-audio": 2,
+}
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the generation queue is at capacity."""
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """A queued unit of work."""
+    sort_key: tuple = field(init=False, repr=False)
+    generation_id: str = field(compare=False)
+    model_type: str = field(compare=False)
+    run: Callable[[], None] = field(compare=False, repr=False)
+    priority: int = field(default=0, compare=False)
+    seq: int = field(default=0, compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.sort_key = (-self.priority, self.seq)
+
+
+class _TypeQueue:
+    """Pending jobs and accounting for one model type."""
+
+    def __init__(self, weight: float, limit: Optional[int]):
+        self.weight = weight
+        self.limit = limit
+        self.heap: List[ScheduledJob] = []
+        self.pending = 0
+        self.running = 0
+        self.vtime = 0.0
+
+    def eligible(self) -> bool:
+        return self.pending > 0 and (self.limit is None or self.running < self.limit)
+
+    def pop(self) -> ScheduledJob:
+        while True:
+            job = heapq.heappop(self.heap)
+            if not job.cancelled:
+                self.pending -= 1
+                return job
+
+
+class GenerationScheduler:
+    """Fair scheduler feeding a fixed pool of worker threads."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue_size: int = 256,
+        weights: Optional[Dict[str, float]] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None
+    ):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        if concurrency_limits is None:
+            concurrency_limits = DEFAULT_CONCURRENCY_LIMITS
+        self.concurrency_limits = dict(concurrency_limits)
+
+        self._queues: Dict[str, _TypeQueue] = {}
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._pending = 0
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+    def submit(
+        self,
+        generation_id: str,
+        model_type: str,
+        run: Callable[[], None],
+        priority: int = 0
+    ) -> ScheduledJob:
+        """
+        Queue a job.
+
+        Args:
+            generation_id: Generation the job belongs to
+            model_type: Model type used to pick the queue
+            run: Callable executed on a worker thread
+            priority: Higher values run earlier within the model type
+
+        Returns:
+            The queued job
+
+        Raises:
+            QueueFullError: If max_queue_size jobs are already waiting
+        """
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("Scheduler has been shut down")
+            if self._pending >= self.max_queue_size:
+                raise QueueFullError(
+                    f"Generation queue is full ({self._pending} jobs waiting)"
+                )
+
+            queue = self._queue_for(model_type)
+            if queue.pending == 0:
+                # A newly backlogged type starts at the current virtual time, so
+                # credit saved while it was idle cannot let it monopolise workers.
+                active = [
+                    q.vtime for q in self._queues.values() if q.pending or q.running
+                ]
+                if active:
+                    queue.vtime = max(queue.vtime, min(active))
+
+            job = ScheduledJob(
+                generation_id=generation_id,
+                model_type=model_type,
+                run=run,
+                priority=priority,
+                seq=next(self._seq)
+            )
+            heapq.heappush(queue.heap, job)
+            queue.pending += 1
+            self._pending += 1
+            self._jobs[generation_id] = job
+
+            self._ensure_workers()
+            self._condition.notify()
+            return job
+
+    def cancel(self, generation_id: str) -> bool:
+        """
+        Drop a job that has not started yet.
+
+        Args:
+            generation_id: Generation to drop
+
+        Returns:
+            True if the job was still queued and will never run
+        """
+        with self._condition:
+            job = self._jobs.pop(generation_id, None)
+            if job is None or job.cancelled:
+                return False
+
+            job.cancelled = True
+            self._queues[job.model_type].pending -= 1
+            self._pending -= 1
+            return True
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Get the number of waiting jobs per model type."""
+        with self._condition:
+            return {name: queue.pending for name, queue in self._queues.items()}
+
+    def running(self) -> Dict[str, int]:
+        """Get the number of running jobs per model type."""
+        with self._condition:
+            return {name: queue.running for name, queue in self._queues.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers once the queues have drained."""
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _queue_for(self, model_type: str) -> _TypeQueue:
+        queue = self._queues.get(model_type)
+        if queue is None:
+            queue = _TypeQueue(
+                weight=self.weights.get(model_type, 1.0),
+                limit=self.concurrency_limits.get(model_type)
+            )
+            self._queues[model_type] = queue
+        return queue
+
+    def _ensure_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker,
+                name=f"playai-worker-{len(self._workers)}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> Optional[ScheduledJob]:
+        with self._condition:
+            while True:
+                eligible = [q for q in self._queues.values() if q.eligible()]
+                if eligible:
+                    queue = min(eligible, key=lambda q: q.vtime)
+                    job = queue.pop()
+                    queue.running += 1
+                    queue.vtime += 1.0 / queue.weight
+                    self._pending -= 1
+                    self._jobs.pop(job.generation_id, None)
+                    return job
+                if self._shutdown and self._pending == 0:
+                    return None
+                self._condition.wait()
+
+    def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+
+            try:
+                job.run()
+            except Exception as e:
+                logger.error(f"Scheduled job {job.generation_id} raised: {e}")
+            finally:
+                with self._condition:
+                    self._queues[job.model_type].running -= 1
+                    self._condition.notify_all()
@@ -0,0 +1,42 @@
+"""Micro-benchmarks for PlayAI, run with ``playai bench``.
+
+Each module covers one area and exposes a ``BENCHMARKS`` list; the runner
+turns their latency samples into p50/p95/p99 summaries and compares a run
+against a saved baseline report.
+"""
+
+from typing import List
+
+from .runner import (
+    Benchmark,
+    compare_reports,
+    load_report,
+    run_benchmarks,
+    select,
+    summarize
+)
+
+# Benchmark modules in the order they run
+SUITES = ("helpers", "output", "catalog", "generation", "startup")
+
+
+def all_benchmarks() -> List[Benchmark]:
+    """Import every suite and collect its benchmarks."""
+    from importlib import import_module
+
+    benchmarks: List[Benchmark] = []
+    for suite in SUITES:
+        benchmarks.extend(import_module(f"{__name__}.{suite}").BENCHMARKS)
+    return benchmarks
+
+
+__all__ = [
+    "Benchmark",
+    "SUITES",
+    "all_benchmarks",
+    "compare_reports",
+    "load_report",
+    "run_benchmarks",
+    "select",
+    "summarize",
+]
@@ -0,0 +1,51 @@
+"""Benchmarks for model catalog listing and search."""
+
+import json
+import struct
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from ..ai.catalog import CheckpointCatalog, describe_model
+from ..ai.generator import get_available_models
+from .runner import Benchmark, operation
+
+CHECKPOINTS = 200
+
+
+@contextmanager
+def _checkpoint_directory() -> Iterator[str]:
+    with tempfile.TemporaryDirectory() as directory:
+        header = {"__metadata__": {"modelspec.architecture": "stable-diffusion-xl"}}
+        encoded = json.dumps(header).encode("utf-8")
+        for i in range(CHECKPOINTS):
+            (Path(directory) / f"model-{i:04}.safetensors").write_bytes(
+                struct.pack("<Q", len(encoded)) + encoded
+            )
+        CheckpointCatalog(directory, describe_model).entries()  # Write the index
+        yield directory
+
+
+@contextmanager
+def indexed_listing() -> Iterator[Callable[[], Any]]:
+    """List a directory from its index with a fresh catalog, as a new process would."""
+    with _checkpoint_directory() as directory:
+        yield lambda: CheckpointCatalog(directory, describe_model).entries()
+
+
+@contextmanager
+def search_page() -> Iterator[Callable[[], Any]]:
+    """Query one page from a warm catalog."""
+    with _checkpoint_directory() as directory:
+        catalog = CheckpointCatalog(directory, describe_model, rescan_interval=60)
+        yield lambda: catalog.query(q="model 01", limit=50)
+
+
+BENCHMARKS = [
+    Benchmark("catalog.list_models", operation(get_available_models), iterations=2000),
+    Benchmark(
+        f"catalog.indexed_listing[{CHECKPOINTS}]", indexed_listing, iterations=200
+    ),
+    Benchmark("catalog.search_page", search_page, iterations=2000),
+]
@@ -0,0 +1,59 @@
+"""Benchmarks for the generation manager's request round trip."""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from ..ai.generator import GenerationManager, GenerationRequest, GenerationResponse
+from ..ai.registry import GenerationRegistry
+from .runner import Benchmark
+
+
+def _manager() -> GenerationManager:
+    # In-memory registry and generations that outlast the benchmark, so the
+    # round trip measures submission bookkeeping rather than inference
+    registry = GenerationRegistry("sqlite://", GenerationResponse)
+    return GenerationManager(max_workers=2, registry=registry, simulated_duration=60.0)
+
+
+@contextmanager
+def round_trip() -> Iterator[Callable[[], None]]:
+    """Submit a generation, read its status and cancel it."""
+    manager = _manager()
+    request = GenerationRequest(
+        model_type="text-generation",
+        prompt="benchmark",
+        parameters={"max_tokens": 1}
+    )
+
+    def op() -> None:
+        generation_id = manager.start_generation(request)
+        manager.get_generation_status(generation_id)
+        manager.cancel_generation(generation_id)
+
+    try:
+        yield op
+    finally:
+        manager.scheduler.shutdown(wait=False)
+        manager.generations.close()
+
+
+@contextmanager
+def status_read() -> Iterator[Callable[[], Any]]:
+    """Read the status snapshot of a queued generation."""
+    manager = _manager()
+    request = GenerationRequest(
+        model_type="text-to-image", prompt="benchmark", parameters={}
+    )
+    generation_id = manager.start_generation(request)
+    try:
+        yield lambda: manager.get_generation_status(generation_id)
+    finally:
+        manager.cancel_generation(generation_id)
+        manager.scheduler.shutdown(wait=False)
+        manager.generations.close()
+
+
+BENCHMARKS = [
+    Benchmark("generation.submit_status_cancel", round_trip, iterations=1000),
+    Benchmark("generation.status", status_read, iterations=20000),
+]
@@ -0,0 +1,41 @@
+"""Benchmarks for playai.utils.helpers."""
+
+from ..utils import helpers
+from .runner import Benchmark, operation
+
+NESTED = {
+    "model": {
+        "name": "stable-diffusion-xl",
+        "parameters": {"width": 1024, "height": 1024},
+    },
+    "request": {"prompt": "A beautiful sunset", "seed": 42, "tags": ["a", "b"]},
+}
+PAYLOAD = '{"type": "text", "content": "Hello World", "parameters": {"seed": 1}}'
+TEXT = "<b>Generated</b> text with 'quotes' & \"markup\"; " * 10
+
+BENCHMARKS = [
+    Benchmark("helpers.validate_input", operation(
+        lambda: helpers.validate_input({"type": "text", "content": "Hello"})
+    ), iterations=20000),
+    Benchmark(
+        "helpers.utc_timestamp", operation(helpers.utc_timestamp), iterations=20000
+    ),
+    Benchmark("helpers.format_response", operation(
+        lambda: helpers.format_response({"generation_id": "gen", "status": "started"})
+    ), iterations=20000),
+    Benchmark("helpers.safe_json_loads", operation(
+        lambda: helpers.safe_json_loads(PAYLOAD)
+    ), iterations=20000),
+    Benchmark("helpers.flatten_dict", operation(
+        lambda: helpers.flatten_dict(NESTED)
+    ), iterations=20000),
+    Benchmark("helpers.get_nested_value", operation(
+        lambda: helpers.get_nested_value(NESTED, "model.parameters.width")
+    ), iterations=20000),
+    Benchmark("helpers.sanitize_string", operation(
+        lambda: helpers.sanitize_string(TEXT)
+    ), iterations=20000),
+    Benchmark("helpers.truncate_string", operation(
+        lambda: helpers.truncate_string(TEXT, 50)
+    ), iterations=20000),
+]
@@ -0,0 +1,648 @@
+"""Trace-driven load testing of the generation backend.
+
+A trace is a list of :class:`Arrival` entries. Each entry gives the time a
+request is submitted, the request itself and, optionally, how long after
+submission it is cancelled. Traces are synthesized from Poisson or bursty
+arrivals over a mix of model types, or replayed from a JSON-lines file.
+
+A trace runs against one of two targets. ``ManagerTarget`` drives a
+``GenerationManager`` in this process, whose simulated inference time comes
+from a pluggable cost function such as :class:`CostModel`. ``DaemonTarget``
+drives a running ``playai serve --socket/--port`` daemon. Both satisfy the
+:class:`LoadTarget` protocol.
+
+The report gives throughput, queue depth over time, latency percentiles per
+model type and cancellation latency. These are the numbers needed to size
+the worker count and queue limits.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import math
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..ai.scheduler import QueueFullError
+from ..utils.helpers import utc_timestamp
+from .runner import summarize
+
+if TYPE_CHECKING:
+    from ..ai.events import Subscription
+    from ..ai.generator import GenerationManager
+
+logger = logging.getLogger(__name__)
+
+POISSON = "poisson"
+BURSTY = "bursty"
+PATTERNS = (POISSON, BURSTY)
+
+# Share of requests per model type in synthesized traces
+DEFAULT_MIX: Dict[str, float] = {
+    "text-generation": 0.4,
+    "text-to-image": 0.3,
+    "text-to-audio": 0.2,
+    "text-to-video": 0.1,
+}
+
+# Mean seconds of simulated inference per model type
+DEFAULT_COSTS: Dict[str, float] = {
+    "text-generation": 0.05,
+    "text-to-image": 0.4,
+    "text-to-audio": 0.3,
+    "text-to-video": 1.5,
+}
+
+# Fraction of each burst period that a bursty trace spends bursting
+BURST_DUTY = 0.2
+
+TERMINAL_KINDS = ("completed", "failed", "cancelled")
+
+EventCallback = Callable[[str, str], None]
+
+
+@dataclass
+class Arrival:
+    """One request of a load trace."""
+    at: float  # Seconds after the start of the run
+    request: Dict[str, Any]
+    cancel_after: Optional[float] = None  # Seconds after submission
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the trace file form: the request, ``at`` and ``cancel_after``."""
+        data = dict(self.request, at=self.at)
+        if self.cancel_after is not None:
+            data["cancel_after"] = self.cancel_after
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Arrival":
+        """Build an arrival from its trace file form."""
+        request = dict(data)
+        at = float(request.pop("at"))
+        cancel_after = request.pop("cancel_after", None)
+        if cancel_after is not None:
+            cancel_after = float(cancel_after)
+        return cls(at, request, cancel_after)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse a request mix such as ``text-to-image=3,text-generation=1``.
+
+    Raises:
+        ValueError: If an entry is malformed or no weight is positive
+    """
+    mix: Dict[str, float] = {}
+    for entry in text.split(","):
+        name, sep, weight = entry.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(
+                f"Invalid mix entry: {entry!r} (expected model_type=weight)"
+            )
+        mix[name.strip()] = float(weight)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("The request mix needs at least one positive weight")
+    return mix
+
+
+def synthesize(
+    rate: float,
+    duration: float,
+    mix: Optional[Dict[str, float]] = None,
+    pattern: str = POISSON,
+    cancel_fraction: float = 0.0,
+    cancel_after: float = 1.0,
+    burst_factor: float = 4.0,
+    burst_period: float = 10.0,
+    seed: Optional[int] = None
+) -> List[Arrival]:
+    """
+    Generate a synthetic arrival trace.
+
+    Bursty traces send ``rate * burst_factor`` requests per second during
+    the first ``BURST_DUTY`` of every burst period. Between bursts the rate
+    drops so that the mean stays at ``rate`` (or to zero if the bursts alone
+    exceed it).
+
+    Args:
+        rate: Mean requests per second
+        duration: Length of the trace in seconds
+        mix: Relative weight per model type (default: DEFAULT_MIX)
+        pattern: POISSON or BURSTY
+        cancel_fraction: Share of requests cancelled after submission
+        cancel_after: Cancelled requests are cancelled a uniformly random
+            time up to this many seconds after submission
+        burst_factor: Burst rate as a multiple of the mean rate
+        burst_period: Seconds from the start of one burst to the next
+        seed: Random seed, for reproducible traces
+
+    Returns:
+        Arrivals in time order
+
+    Raises:
+        ValueError: If the pattern is unknown or the mix is empty
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown arrival pattern: {pattern}")
+    mix = DEFAULT_MIX if mix is None else mix
+    model_types = [name for name, weight in mix.items() if weight > 0]
+    if not model_types:
+        raise ValueError("The request mix needs at least one positive weight")
+    weights = [mix[name] for name in model_types]
+    rng = random.Random(seed)
+
+    if pattern == BURSTY:
+        peak = rate * burst_factor
+        quiet = max(0.0, rate * (1 - BURST_DUTY * burst_factor) / (1 - BURST_DUTY))
+    else:
+        peak = quiet = rate
+
+    def current_rate(t: float) -> float:
+        return peak if (t % burst_period) < BURST_DUTY * burst_period else quiet
+
+    # Non-homogeneous Poisson process by thinning a process at the peak rate
+    arrivals: List[Arrival] = []
+    t = 0.0
+    while peak > 0:
+        t += rng.expovariate(peak)
+        if t >= duration:
+            break
+        if rng.random() * peak > current_rate(t):
+            continue
+        model_type = rng.choices(model_types, weights)[0]
+        request = {
+            "model_type": model_type,
+            "prompt": f"load test {len(arrivals)}",
+            "parameters": {}
+        }
+        cancel = None
+        if rng.random() < cancel_fraction:
+            cancel = rng.uniform(0, cancel_after)
+        arrivals.append(Arrival(round(t, 6), request, cancel))
+    return arrivals
+
+
+def load_trace(path: Union[str, Path]) -> List[Arrival]:
+    """
+    Read a trace file holding one arrival object per line.
+
+    Each line is a generate request with an extra ``at`` field (seconds
+    after the start) and an optional ``cancel_after`` field.
+
+    Raises:
+        ValueError: If a line is not a valid arrival
+    """
+    arrivals = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                arrivals.append(Arrival.from_dict(json.loads(line)))
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{number}: invalid arrival: {e}") from None
+    arrivals.sort(key=lambda arrival: arrival.at)
+    return arrivals
+
+
+def save_trace(arrivals: Iterable[Arrival], path: Union[str, Path]) -> None:
+    """Write a trace in the format read by load_trace."""
+    with open(path, "w", encoding="utf-8") as f:
+        for arrival in arrivals:
+            f.write(json.dumps(arrival.to_dict(), separators=(",", ":")) + "\n")
+
+
+class CostModel:
+    """
+    Simulated inference time per request.
+
+    Pass an instance as ``GenerationManager(inference_cost=...)``. Durations
+    are lognormal around each model type's mean, so the spread is
+    ``jitter`` times the mean.
+    """
+
+    def __init__(
+        self,
+        means: Optional[Dict[str, float]] = None,
+        jitter: float = 0.25,
+        scale: float = 1.0,
+        default: float = 0.1,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            means: Mean seconds per model type (default: DEFAULT_COSTS)
+            jitter: Coefficient of variation (0 makes every duration the mean)
+            scale: Multiplier applied to every mean
+            default: Mean seconds for model types missing from ``means``
+            seed: Random seed
+        """
+        self.means = dict(DEFAULT_COSTS if means is None else means)
+        self.jitter = jitter
+        self.scale = scale
+        self.default = default
+        self._rng = random.Random(seed)
+
+    def __call__(self, request: Any) -> float:
+        mean = self.means.get(request.model_type, self.default) * self.scale
+        if mean <= 0 or self.jitter <= 0:
+            return max(0.0, mean)
+        sigma2 = math.log1p(self.jitter ** 2)
+        return self._rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+
+
+class LoadTarget(Protocol):
+    """Backend that run_load submits a trace to."""
+
+    def open(self, on_event: EventCallback) -> None:
+        """Start passing lifecycle events to ``on_event``."""
+
+    def submit(self, request_data: Dict[str, Any]) -> str:
+        """Start a generation and get its ID."""
+
+    def cancel(self, generation_id: str) -> None:
+        """Cancel a generation."""
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Get the number of requests waiting for a worker per model type."""
+
+    def close(self) -> None:
+        """Stop passing events and release the backend."""
+
+
+class ManagerTarget:
+    """Load-test target driving a GenerationManager in this process."""
+
+    def __init__(self, manager: "GenerationManager"):
+        self.manager = manager
+        self._subscription: Optional["Subscription"] = None
+        self._reader: Optional[threading.Thread] = None
+
+    def open(self, on_event: EventCallback) -> None:
+        """Start passing every generation's lifecycle events to ``on_event``."""
+        subscription = self._subscription = self.manager.subscribe()
+
+        def read() -> None:
+            for event in subscription:
+                on_event(event.generation_id, event.kind)
+
+        self._reader = threading.Thread(
+            target=read, name="playai-load-events", daemon=True
+        )
+        self._reader.start()
+
+    def submit(self, request_data: Dict[str, Any]) -> str:
+        """
+        Start a generation.
+
+        Raises:
+            QueueFullError: If the generation queue is full
+        """
+        from ..ai.generator import parse_request
+
+        return self.manager.start_generation(parse_request(request_data))
+
+    def cancel(self, generation_id: str) -> None:
+        """Cancel a generation."""
+        self.manager.cancel_generation(generation_id)
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Get the number of requests waiting for a worker per model type."""
+        return self.manager.queue_depth()
+
+    def close(self) -> None:
+        """Stop reading events."""
+        if self._subscription is not None:
+            self._subscription.close()
+        if self._reader is not None:
+            self._reader.join()
+
+
+class DaemonTarget:
+    """
+    Load-test target driving a running ``playai serve`` socket daemon.
+
+    Each submitted generation is followed with a ``subscribe`` request.
+    Events published before the subscription starts are missed, so queue
+    waits are only known for generations the daemon had not started yet.
+    """
+
+    def __init__(self, address: str, timeout: float = 30.0):
+        """
+        Args:
+            address: ``host:port`` or ``port`` of a TCP daemon, or the path
+                of a Unix socket
+            timeout: Seconds to wait for a response
+        """
+        self.address = address
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader: Optional[threading.Thread] = None
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # Request id -> [threading.Event, response]
+        self._waiting: Dict[int, List[Any]] = {}
+        # Subscribe request id -> generation id
+        self._subscriptions: Dict[int, str] = {}
+
+    def open(self, on_event: EventCallback) -> None:
+        """Connect and start passing lifecycle events to ``on_event``."""
+        from ..server.client import connect
+
+        sock = self._sock = connect(self.address)
+        self._reader = threading.Thread(
+            target=self._read,
+            args=(sock, on_event),
+            name="playai-load-daemon",
+            daemon=True
+        )
+        self._reader.start()
+
+    def submit(self, request_data: Dict[str, Any]) -> str:
+        """
+        Start a generation on the daemon and subscribe to its events.
+
+        Raises:
+            QueueFullError: If the daemon's generation queue is full
+            RuntimeError: If the daemon reports any other error
+        """
+        generation_id: str = self._call("generate", request_data)["generation_id"]
+        request_id = next(self._ids)
+        with self._lock:
+            self._subscriptions[request_id] = generation_id
+        self._send(request_id, "subscribe", {"generation_id": generation_id})
+        return generation_id
+
+    def cancel(self, generation_id: str) -> None:
+        """Cancel a generation."""
+        self._call("cancel", {"generation_id": generation_id})
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Get the number of requests waiting for a worker per model type."""
+        pending: Dict[str, int] = self._call("queue", {})["pending"]
+        return pending
+
+    def close(self) -> None:
+        """Disconnect from the daemon."""
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+        if self._reader is not None:
+            self._reader.join()
+
+    def _send(self, request_id: int, method: str, params: Dict[str, Any]) -> None:
+        if self._sock is None:
+            raise RuntimeError("Not connected to the daemon")
+        line = json.dumps({"id": request_id, "method": method, "params": params})
+        with self._send_lock:
+            self._sock.sendall(line.encode("utf-8") + b"\n")
+
+    def _call(self, method: str, params: Dict[str, Any]) -> Any:
+        request_id = next(self._ids)
+        slot: List[Any] = [threading.Event(), None]
+        with self._lock:
+            self._waiting[request_id] = slot
+        self._send(request_id, method, params)
+        if not slot[0].wait(self.timeout):
+            with self._lock:
+                self._waiting.pop(request_id, None)
+            raise TimeoutError(f"No response to {method} within {self.timeout}s")
+
+        response = slot[1]
+        if response.get("status") != "success":
+            message = response.get("message") or "Request failed"
+            if "queue is full" in message:
+                raise QueueFullError(message)
+            raise RuntimeError(message)
+        return response.get("data")
+
+    def _read(self, sock: socket.socket, on_event: EventCallback) -> None:
+        with sock.makefile("rb") as stream:
+            while True:
+                try:
+                    line = stream.readline()
+                except OSError:
+                    return
+                if not line:
+                    return
+                response = json.loads(line)
+                request_id = response.get("id")
+                with self._lock:
+                    slot = self._waiting.pop(request_id, None)
+                    generation_id = self._subscriptions.get(request_id)
+                    if response.get("done") or "event" not in response:
+                        self._subscriptions.pop(request_id, None)
+                if slot is not None:
+                    slot[1] = response
+                    slot[0].set()
+                elif generation_id is not None and "event" in response:
+                    on_event(generation_id, response["event"])
+
+
+def run_load(
+    arrivals: Sequence[Arrival],
+    target: LoadTarget,
+    sample_interval: float = 0.1,
+    drain_timeout: float = 60.0
+) -> Dict[str, Any]:
+    """
+    Replay a trace against a target and measure how the backend copes.
+
+    Requests are submitted at their arrival times, whether or not earlier
+    ones have finished. Once the trace is exhausted the run waits up to
+    ``drain_timeout`` seconds for outstanding generations to finish.
+
+    Args:
+        arrivals: Trace to replay
+        target: ManagerTarget, DaemonTarget or another LoadTarget
+        sample_interval: Seconds between queue depth samples
+        drain_timeout: Seconds to wait for generations after the last arrival
+
+    Returns:
+        Report with request counts, throughput, pending request samples and
+        latency summaries in milliseconds. ``latency`` runs from submission
+        to completion, ``queue_wait`` from submission to start, and
+        ``cancellation`` from a cancel request to the cancelled event.
+    """
+    arrivals = sorted(arrivals, key=lambda arrival: arrival.at)
+    clock = time.perf_counter
+    # Generation id -> event kind -> first seen
+    seen: Dict[str, Dict[str, float]] = {}
+    seen_lock = threading.Lock()
+
+    def on_event(generation_id: str, kind: str) -> None:
+        now = clock()
+        with seen_lock:
+            seen.setdefault(generation_id, {}).setdefault(kind, now)
+
+    def outcome(record: Dict[str, Any]) -> Optional[str]:
+        times = seen.get(record.get("generation_id", ""), {})
+        for kind in TERMINAL_KINDS:
+            if kind in times:
+                return kind
+        return record.get("status")
+
+    records: List[Dict[str, Any]] = []
+    cancels: List[Tuple[float, int, Dict[str, Any]]] = []  # heap of (due, seq, record)
+    samples: List[Dict[str, Any]] = []
+    seq = itertools.count()
+    position = 0
+    deadline: Optional[float] = None
+
+    target.open(on_event)
+    start = next_sample = clock()
+    try:
+        while True:
+            now = clock()
+            if now >= next_sample:
+                depth = target.queue_depth()
+                samples.append({
+                    "t": round(now - start, 3),
+                    "queued": sum(depth.values()),
+                    "by_type": depth
+                })
+                missed = math.ceil((now - next_sample) / sample_interval)
+                next_sample += sample_interval * max(1, missed)
+
+            while cancels and cancels[0][0] <= now:
+                record = heapq.heappop(cancels)[2]
+                with seen_lock:
+                    if outcome(record) is not None:
+                        continue
+                record["cancel_requested"] = clock()
+                try:
+                    target.cancel(record["generation_id"])
+                except Exception as e:
+                    logger.warning(f"Failed to cancel {record['generation_id']}: {e}")
+
+            while position < len(arrivals) and start + arrivals[position].at <= now:
+                arrival = arrivals[position]
+                position += 1
+                record = {
+                    "model_type": arrival.request.get("model_type"),
+                    "submitted": clock()
+                }
+                records.append(record)
+                try:
+                    record["generation_id"] = target.submit(arrival.request)
+                except QueueFullError:
+                    record["status"] = "rejected"
+                    continue
+                except Exception as e:
+                    logger.debug(f"Load test request failed: {e}")
+                    record["status"] = "error"
+                    continue
+                if arrival.cancel_after is not None:
+                    due = record["submitted"] + arrival.cancel_after
+                    heapq.heappush(cancels, (due, next(seq), record))
+
+            wake = next_sample
+            if position < len(arrivals):
+                wake = min(wake, start + arrivals[position].at)
+            else:
+                if deadline is None:
+                    deadline = now + drain_timeout
+                with seen_lock:
+                    drained = all(outcome(record) is not None for record in records)
+                if (drained and not cancels) or now >= deadline:
+                    break
+                wake = min(wake, deadline)
+            if cancels:
+                wake = min(wake, cancels[0][0])
+            time.sleep(max(0.0, wake - clock()))
+    finally:
+        target.close()
+
+    return _report(arrivals, records, seen, samples, start, clock())
+
+
+def _report(
+    arrivals: Sequence[Arrival],
+    records: List[Dict[str, Any]],
+    seen: Dict[str, Dict[str, float]],
+    samples: List[Dict[str, Any]],
+    start: float,
+    end: float
+) -> Dict[str, Any]:
+    counts: Dict[str, int] = {}
+    by_type: Dict[str, Dict[str, int]] = {}
+    latency: Dict[str, List[float]] = {}
+    queue_wait: Dict[str, List[float]] = {}
+    cancellation: List[float] = []
+    finished_at = start
+
+    for record in records:
+        model_type = record["model_type"]
+        times = seen.get(record.get("generation_id", ""), {})
+        status = next((kind for kind in TERMINAL_KINDS if kind in times), None)
+        status = status or record.get("status", "unfinished")
+        counts[status] = counts.get(status, 0) + 1
+        type_counts = by_type.setdefault(model_type, {"submitted": 0})
+        type_counts["submitted"] += 1
+        type_counts[status] = type_counts.get(status, 0) + 1
+
+        if status in TERMINAL_KINDS:
+            finished_at = max(finished_at, times[status])
+        submitted = record["submitted"]
+        if "started" in times:
+            waited = (times["started"] - submitted) * 1000
+            queue_wait.setdefault(model_type, []).append(waited)
+        if status == "completed":
+            took = (times["completed"] - submitted) * 1000
+            latency.setdefault(model_type, []).append(took)
+        if status == "cancelled" and "cancel_requested" in record:
+            stopped = times["cancelled"] - record["cancel_requested"]
+            cancellation.append(stopped * 1000)
+
+    # Throughput counts up to the last terminal event unless generations were
+    # left running
+    if counts.get("unfinished") or finished_at == start:
+        finished_at = end
+    elapsed = finished_at - start
+    completed = counts.get("completed", 0)
+    span = arrivals[-1].at if arrivals else 0.0
+    depths = [sample["queued"] for sample in samples]
+    return {
+        "timestamp": utc_timestamp(),
+        "requests": len(records),
+        "counts": counts,
+        "by_type": by_type,
+        "elapsed_s": round(elapsed, 3),
+        "offered_rps": round(len(arrivals) / span, 3) if span > 0 else None,
+        "throughput_rps": round(completed / elapsed, 3) if elapsed > 0 else None,
+        "latency": {
+            name: summarize(values) for name, values in sorted(latency.items())
+        },
+        "queue_wait": {
+            name: summarize(values) for name, values in sorted(queue_wait.items())
+        },
+        "cancellation": summarize(cancellation),
+        "queue_depth": {
+            "max": max(depths, default=0),
+            "mean": sum(depths) / len(depths) if depths else 0.0,
+            "samples": samples,
+        },
+    }
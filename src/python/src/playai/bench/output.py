@@ -0,0 +1,34 @@
+"""Benchmarks for building and encoding CLI responses."""
+
+import io
+from typing import Callable
+
+from ..utils.helpers import format_response
+from ..utils.wire import JSON, NDJSON, PRETTY, write_response
+from .runner import Benchmark, operation
+
+ITERATIONS = 2000
+
+# A catalog listing of typical size
+ENTRIES = [
+    {
+        "name": f"checkpoint-{i}",
+        "model_type": "text-to-image",
+        "description": f"Fine-tuned checkpoint number {i}",
+        "parameters": {"width": 1024, "height": 1024, "steps": 30},
+        "file_path": f"models/checkpoint-{i}.safetensors",
+    }
+    for i in range(100)
+]
+
+
+def _encode(fmt: str) -> Callable[[], None]:
+    def encode() -> None:
+        write_response(format_response(ENTRIES), io.BytesIO(), fmt)
+    return encode
+
+
+BENCHMARKS = [
+    Benchmark(f"output.format_response+{fmt}", operation(_encode(fmt)), ITERATIONS)
+    for fmt in (PRETTY, JSON, NDJSON)
+]
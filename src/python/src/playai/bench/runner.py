@@ -0,0 +1,226 @@
+"""Benchmark runner: timing, percentile summaries and baseline comparison."""
+
+import fnmatch
+import json
+import math
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from ..utils.helpers import utc_timestamp
+
+REPORT_VERSION = 1
+
+# Latency metrics compared against a baseline by default
+DEFAULT_METRICS = ("p50_ms", "p95_ms")
+DEFAULT_THRESHOLD = 0.10
+
+Setup = Callable[[], ContextManager[Callable[[], Any]]]
+
+
+@dataclass
+class Benchmark:
+    """One timed operation."""
+    name: str
+    setup: Setup
+    iterations: int = 1000
+    warmup: int = 10
+    self_timed: bool = False  # The operation returns its own sample in milliseconds
+
+
+def operation(fn: Callable[[], Any]) -> Setup:
+    """Make a setup for an operation that needs no preparation."""
+    @contextmanager
+    def setup() -> Iterator[Callable[[], Any]]:
+        yield fn
+    return setup
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    """Get a nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, Any]:
+    """
+    Summarize latency samples.
+
+    Args:
+        samples: Durations in milliseconds
+
+    Returns:
+        Iteration count and min/mean/p50/p95/p99/max in milliseconds
+    """
+    ordered = sorted(samples)
+    return {
+        "iterations": len(ordered),
+        "min_ms": ordered[0] if ordered else 0.0,
+        "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 50),
+        "p95_ms": percentile(ordered, 95),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else 0.0,
+    }
+
+
+def measure(
+    benchmark: Benchmark, max_iterations: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run one benchmark and summarize its latencies.
+
+    Args:
+        benchmark: Benchmark to run
+        max_iterations: Cap on the benchmark's iteration count
+
+    Returns:
+        Summary as returned by summarize
+    """
+    iterations = benchmark.iterations
+    if max_iterations is not None:
+        iterations = max(1, min(iterations, max_iterations))
+
+    samples: List[float] = []
+    clock = time.perf_counter_ns
+    with benchmark.setup() as op:
+        for _ in range(min(benchmark.warmup, iterations)):
+            op()
+        for _ in range(iterations):
+            if benchmark.self_timed:
+                samples.append(float(op()))
+                continue
+            start = clock()
+            op()
+            samples.append((clock() - start) / 1e6)
+    return summarize(samples)
+
+
+def select(
+    benchmarks: Sequence[Benchmark], patterns: Sequence[str] = ()
+) -> List[Benchmark]:
+    """
+    Pick benchmarks by name.
+
+    Args:
+        benchmarks: Candidates
+        patterns: Glob patterns or name prefixes (empty selects everything)
+
+    Returns:
+        Matching benchmarks in their original order
+    """
+    if not patterns:
+        return list(benchmarks)
+    return [
+        benchmark for benchmark in benchmarks
+        if any(
+            fnmatch.fnmatchcase(benchmark.name, pattern)
+            or benchmark.name.startswith(pattern)
+            for pattern in patterns
+        )
+    ]
+
+
+def run_benchmarks(
+    benchmarks: Sequence[Benchmark],
+    max_iterations: Optional[int] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run benchmarks and build a report.
+
+    Args:
+        benchmarks: Benchmarks to run
+        max_iterations: Cap on every benchmark's iteration count
+        progress: Called with each benchmark's name and summary
+
+    Returns:
+        JSON-serializable report
+    """
+    results: Dict[str, Any] = {}
+    for benchmark in benchmarks:
+        results[benchmark.name] = measure(benchmark, max_iterations)
+        if progress is not None:
+            progress(benchmark.name, results[benchmark.name])
+
+    return {
+        "version": REPORT_VERSION,
+        "timestamp": utc_timestamp(),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "benchmarks": results,
+    }
+
+
+def load_report(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Load a report written by ``playai bench``.
+
+    Accepts both a bare report and one wrapped in the CLI response envelope.
+
+    Raises:
+        ValueError: If the file holds no benchmark results
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, dict) and "benchmarks" not in data:
+        data = data.get("data")
+    if not isinstance(data, dict) or "benchmarks" not in data:
+        raise ValueError(f"{path} is not a benchmark report")
+    return data
+
+
+def compare_reports(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    metrics: Sequence[str] = DEFAULT_METRICS
+) -> List[Dict[str, Any]]:
+    """
+    Find benchmarks that got slower than the baseline.
+
+    Benchmarks missing from either report are ignored.
+
+    Args:
+        current: Report of this run
+        baseline: Report to compare against
+        threshold: Allowed slowdown as a fraction (0.1 allows 10%)
+        metrics: Summary fields to compare
+
+    Returns:
+        One entry per regressed benchmark metric
+    """
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None:
+            continue
+        for metric in metrics:
+            before, after = previous.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            if change > threshold:
+                regressions.append({
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline_ms": before,
+                    "current_ms": after,
+                    "change": round(change, 4),
+                })
+    return regressions
@@ -0,0 +1,32 @@
+"""CLI cold-start benchmarks, one per lightweight subcommand.
+
+Each sample runs the command in a fresh interpreter and records the import
+time of PlayAI modules, the same measure as scripts/check_startup.py.
+"""
+
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from ..utils.startup import STARTUP_COMMANDS, measure_startup
+from .runner import Benchmark, Setup
+
+
+def _cold_start(command: str) -> Setup:
+    @contextmanager
+    def setup() -> Iterator[Callable[[], float]]:
+        with tempfile.TemporaryDirectory() as cwd:
+            yield lambda: measure_startup(command, cwd=cwd).import_ms
+    return setup
+
+
+BENCHMARKS = [
+    Benchmark(
+        f"startup.{command}",
+        _cold_start(command),
+        iterations=10,
+        warmup=1,
+        self_timed=True,
+    )
+    for command in STARTUP_COMMANDS
+]
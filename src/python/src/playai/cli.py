@@ -1,22 +1,20 @@
-"""Command-line interface for PlayAI."""
+"""Command-line interface for PlayAI.
+
+Only lightweight modules are imported at module load. The generation
+backend, the servers and the core processing code are imported inside the
+commands that need them, so `playai config` never pays for model imports.
+"""
 
 import argparse
 import json
 import logging
 import sys
-from typing import Dict, Any
+from contextlib import ExitStack
+from typing import Dict, Any, BinaryIO, Iterable, Iterator, Optional
 
-from .core import main_function
 from .config import settings
 from .utils.helpers import format_response
-from .ai.generator import (
-    generate_content,
-    get_available_models,
-    get_available_loras,
-    get_generation_status,
-    cancel_generation,
-    initialize_backend
-)
+from .utils.wire import check_format, write_response
 
 
 def setup_logging() -> None:
@@ -40,15 +38,32 @@ Examples:
   playai process '{"type": "text", "content": "Hello World"}'
   playai config
   playai generate '{"model_type": "text-to-image", "prompt": "A beautiful sunset"}'
+  playai generate-batch requests.ndjson --max-in-flight 32 --checkpoint requests.done
   playai list-models
+  playai list-models --type text-to-image --q portrait --limit 50
   playai list-loras
+  playai list-models --format ndjson
+  playai bench
+  playai bench 'helpers.*' -o baseline.json
+  playai bench --compare baseline.json --threshold 0.2
+  playai load-test --rate 20 --duration 30 --pattern bursty --workers 8
+  playai load-test trace.ndjson --connect 127.0.0.1:8765
+  playai serve
+  playai serve --socket /tmp/playai.sock
+  playai serve --port 8765 --metrics-port 9464
+  playai metrics --connect 127.0.0.1:8765
+  playai list-models --profile cprofile --profile-output list-models.pstats
   playai --help
         """
     )
     
     parser.add_argument(
         "command",
-        choices=["process", "config", "generate", "list-models", "list-loras", "status", "cancel", "init"],
+        choices=[
+            "process", "config", "generate", "generate-batch", "list-models",
+            "list-loras", "status", "cancel", "init", "serve", "bench",
+            "load-test", "metrics"
+        ],
         help="Command to execute"
     )
     
@@ -70,6 +85,181 @@ Examples:
         help="Output file path (default: stdout)"
     )
     
+    parser.add_argument(
+        "--profile",
+        choices=["cprofile", "sampling", "memory"],
+        help="Profile the command: pstats, collapsed stacks or a tracemalloc snapshot"
+    )
+    
+    parser.add_argument(
+        "--profile-output",
+        help="Profile artifact path (default: a new file under PROFILE_DIR)"
+    )
+    
+    parser.add_argument(
+        "--format",
+        dest="fmt",
+        choices=["pretty", "json", "ndjson", "msgpack"],
+        default="pretty",
+        help="Output format (default: pretty)"
+    )
+    
+    parser.add_argument(
+        "--type",
+        dest="model_type",
+        help="Only list models or LoRAs of this model type"
+    )
+    
+    parser.add_argument(
+        "--q",
+        help="Only list models or LoRAs matching these words"
+    )
+    
+    parser.add_argument(
+        "--limit",
+        type=int,
+        help="Page size for list-models and list-loras (0 only counts matches)"
+    )
+    
+    parser.add_argument(
+        "--cursor",
+        help="next_cursor of the previous list-models or list-loras page"
+    )
+    
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=64,
+        help="Maximum requests in flight for generate-batch (default: 64)"
+    )
+    
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Write generate-batch results in input order instead of completion order"
+    )
+    
+    parser.add_argument(
+        "--checkpoint",
+        help="File recording finished generate-batch lines, used to resume a batch"
+    )
+    
+    parser.add_argument(
+        "--compare",
+        help="Baseline report to compare a bench run against"
+    )
+    
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Slowdown that counts as a bench regression, as a fraction (default: 0.10)"
+    )
+    
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        help="Cap on iterations per benchmark"
+    )
+    
+    parser.add_argument(
+        "--pattern",
+        choices=["poisson", "bursty"],
+        default="poisson",
+        help="Arrival pattern of a synthesized load-test trace (default: poisson)"
+    )
+    
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=10.0,
+        help="Mean requests per second of a synthesized load-test trace (default: 10)"
+    )
+    
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Seconds of synthesized load-test arrivals (default: 10)"
+    )
+    
+    parser.add_argument(
+        "--mix",
+        help="Load-test request mix, e.g. text-to-image=3,text-generation=1"
+    )
+    
+    parser.add_argument(
+        "--cancel-fraction",
+        type=float,
+        default=0.0,
+        help="Share of load-test requests cancelled after submission (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for synthesized load-test traces and inference costs"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Generation workers of the in-process load-test backend"
+    )
+    
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        help="Queue limit of the in-process load-test backend"
+    )
+    
+    parser.add_argument(
+        "--cost-scale",
+        type=float,
+        default=1.0,
+        help="Multiplier for simulated inference times in load tests (default: 1)"
+    )
+    
+    parser.add_argument(
+        "--connect",
+        help="Daemon address (HOST:PORT or Unix socket path) for load-test and metrics"
+    )
+    
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=8,
+        help="Maximum in-flight requests for the serve command (default: 8)"
+    )
+    
+    parser.add_argument(
+        "--socket",
+        help="Serve on this Unix domain socket instead of stdin/stdout"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        help="Serve on this loopback TCP port instead of stdin/stdout"
+    )
+    
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=1024,
+        help="Maximum concurrent socket connections (default: 1024)"
+    )
+    
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=settings.metrics_port,
+        help=(
+            "Serve Prometheus metrics on this port while serving "
+            "(default: METRICS_PORT, 0 disables)"
+        )
+    )
+    
     return parser.parse_args()
 
 
@@ -83,6 +273,8 @@ def process_command(input_data: str) -> Dict[str, Any]:
     Returns:
         Processing results
     """
+    from .core import main_function
+    
     try:
         # Parse input data
         data = json.loads(input_data)
@@ -130,6 +322,18 @@ def config_command() -> Dict[str, Any]:
     )
 
 
+def _disable_shared_memory_outputs() -> None:
+    """
+    Reject shared-memory outputs in commands that exit after generating.
+    
+    Segments are freed when the process exits, so the handle such a command
+    prints would point at nothing.
+    """
+    from .ai.generator import get_generation_manager
+    
+    get_generation_manager().outputs.shared_memory = False
+
+
 def generate_command(input_data: str) -> Dict[str, Any]:
     """
     Generate content using AI models.
@@ -140,6 +344,9 @@ def generate_command(input_data: str) -> Dict[str, Any]:
     Returns:
         Generation response
     """
+    from .ai.generator import generate_content
+    
+    _disable_shared_memory_outputs()
     try:
         request = json.loads(input_data)
         result = generate_content(request)
@@ -158,15 +365,272 @@ def generate_command(input_data: str) -> Dict[str, Any]:
         )
 
 
-def list_models_command() -> Dict[str, Any]:
+def generate_batch_command(
+    input_path: Optional[str],
+    output_file: Optional[str] = None,
+    max_in_flight: int = 64,
+    ordered: bool = False,
+    checkpoint_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run a file of generation requests, one JSON object per line.
+    
+    Results are written as NDJSON while the batch runs. With a checkpoint,
+    lines finished by an earlier run are skipped and results are appended
+    to the output file.
+    
+    Args:
+        input_path: Request file ("-" or None reads stdin)
+        output_file: Result file (default: stdout)
+        max_in_flight: Maximum requests in flight
+        ordered: Write results in input order
+        checkpoint_path: Checkpoint file for resuming
+        
+    Returns:
+        Summary with the number of completed, failed and skipped lines
+    """
+    from .ai.bulk import BulkCheckpoint, run_bulk
+    
+    _disable_shared_memory_outputs()
+    counts = {"completed": 0, "failed": 0, "cancelled": 0}
+    checkpoint = BulkCheckpoint(checkpoint_path) if checkpoint_path else None
+    if input_path in (None, "-"):
+        source = sys.stdin
+    else:
+        source = open(input_path, encoding="utf-8")
+    output: BinaryIO
+    if output_file:
+        output = open(output_file, "ab" if checkpoint else "wb")
+    else:
+        sys.stdout.flush()
+        output = sys.stdout.buffer
+    
+    def tally(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for record in records:
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            yield record
+    
+    try:
+        skipped = len(checkpoint) if checkpoint else 0
+        records = run_bulk(source, max_in_flight, ordered, checkpoint)
+        write_response(format_response(tally(records)), output, "ndjson")
+        counts["skipped"] = skipped
+        return format_response(counts, status="success")
+    except Exception as e:
+        return format_response(counts, status="error", message=f"Batch error: {e}")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output_file:
+            output.close()
+        if checkpoint:
+            checkpoint.close()
+
+
+def bench_command(
+    pattern: Optional[str] = None,
+    baseline_path: Optional[str] = None,
+    threshold: float = 0.10,
+    max_iterations: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Run the micro-benchmark suite.
+    
+    Args:
+        pattern: Only run benchmarks whose name matches this glob or prefix
+        baseline_path: Report to compare against
+        threshold: Slowdown that counts as a regression, as a fraction
+        max_iterations: Cap on iterations per benchmark
+        
+    Returns:
+        Benchmark report; with a baseline, an error listing any regressions
+    """
+    from .bench import (
+        all_benchmarks,
+        compare_reports,
+        load_report,
+        run_benchmarks,
+        select,
+    )
+    
+    def progress(name: str, summary: Dict[str, Any]) -> None:
+        print(
+            f"{name:40} p50 {summary['p50_ms']:10.4f} ms  "
+            f"p95 {summary['p95_ms']:10.4f} ms  p99 {summary['p99_ms']:10.4f} ms",
+            file=sys.stderr
+        )
+    
+    try:
+        baseline = load_report(baseline_path) if baseline_path else None
+        benchmarks = select(all_benchmarks(), [pattern] if pattern else [])
+        if not benchmarks:
+            raise ValueError(f"No benchmarks match {pattern!r}")
+        
+        report = run_benchmarks(benchmarks, max_iterations, progress)
+        if baseline is None:
+            return format_response(report, status="success")
+        
+        report["regressions"] = compare_reports(report, baseline, threshold)
+        if report["regressions"]:
+            count = len(report["regressions"])
+            return format_response(
+                report,
+                status="error",
+                message=f"{count} regressions above {threshold:.0%}"
+            )
+        return format_response(report, status="success")
+    except Exception as e:
+        return format_response(None, status="error", message=f"Benchmark error: {e}")
+
+
+def load_test_command(
+    trace_path: Optional[str] = None,
+    pattern: str = "poisson",
+    rate: float = 10.0,
+    duration: float = 10.0,
+    mix: Optional[str] = None,
+    cancel_fraction: float = 0.0,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    cost_scale: float = 1.0,
+    connect: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Replay or synthesize a request trace against the generation backend.
+    
+    Args:
+        trace_path: Trace file to replay (default: synthesize one)
+        pattern: Arrival pattern of a synthesized trace
+        rate: Mean requests per second of a synthesized trace
+        duration: Seconds of synthesized arrivals
+        mix: Request mix of a synthesized trace, e.g.
+            "text-to-image=3,text-generation=1"
+        cancel_fraction: Share of synthesized requests that get cancelled
+        seed: Random seed for the trace and the inference costs
+        workers: Generation workers of the in-process backend
+        queue_size: Queue limit of the in-process backend
+        cost_scale: Multiplier for simulated inference times
+        connect: Address of a running daemon to test instead
+        
+    Returns:
+        Load-test report
+    """
+    from .bench.load import (
+        CostModel,
+        DaemonTarget,
+        LoadTarget,
+        ManagerTarget,
+        load_trace,
+        parse_mix,
+        run_load,
+        synthesize
+    )
+    
+    manager = None
+    try:
+        if trace_path:
+            arrivals = load_trace(trace_path)
+        else:
+            arrivals = synthesize(
+                rate,
+                duration,
+                parse_mix(mix) if mix else None,
+                pattern,
+                cancel_fraction,
+                seed=seed
+            )
+        
+        target: LoadTarget
+        if connect:
+            target = DaemonTarget(connect)
+        else:
+            from .ai.generator import GenerationManager, GenerationResponse
+            from .ai.registry import GenerationRegistry
+            
+            manager = GenerationManager(
+                max_workers=workers,
+                max_queue_size=queue_size,
+                registry=GenerationRegistry("sqlite://", GenerationResponse),
+                inference_cost=CostModel(scale=cost_scale, seed=seed)
+            )
+            target = ManagerTarget(manager)
+        
+        report = run_load(arrivals, target)
+        print(
+            f"{report['requests']} requests, {report['throughput_rps']} completed/s, "
+            f"max queue depth {report['queue_depth']['max']}, {report['counts']}",
+            file=sys.stderr
+        )
+        return format_response(report, status="success")
+    except Exception as e:
+        return format_response(None, status="error", message=f"Load test error: {e}")
+    finally:
+        if manager is not None:
+            manager.scheduler.shutdown(wait=False)
+            manager.generations.close()
+
+
+def metrics_command(connect: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read generation metrics from a running daemon.
+    
+    Args:
+        connect: Daemon address (HOST:PORT or Unix socket path)
+        
+    Returns:
+        Generation counts, stage latency summaries and queue depths
+    """
+    if not connect:
+        return format_response(
+            None,
+            status="error",
+            message=(
+                "Metrics are kept by the serve daemon; pass its address with --connect"
+            )
+        )
+    
+    from .server.client import call
+    
+    try:
+        return format_response(call(connect, "metrics"), status="success")
+    except Exception as e:
+        return format_response(
+            None, status="error", message=f"Failed to read metrics: {e}"
+        )
+
+
+def catalog_filters(args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """
+    Get the catalog query options given on the command line.
+    
+    Returns:
+        Keyword arguments for query_models/query_loras, or None to list everything
+    """
+    filters = {
+        "model_type": args.model_type,
+        "q": args.q,
+        "limit": args.limit,
+        "cursor": args.cursor,
+    }
+    filters = {key: value for key, value in filters.items() if value is not None}
+    return filters or None
+
+
+def list_models_command(filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Get available models.
     
+    Args:
+        filters: Query options; when given, one page of matches is returned
+        
     Returns:
-        List of available models
+        List of available models, or a page of matching models
     """
+    from .ai.generator import get_available_models, query_models
+    
     try:
-        models = get_available_models()
+        models = query_models(**filters) if filters else get_available_models()
         return format_response(models, status="success")
     except Exception as e:
         return format_response(
@@ -176,15 +640,20 @@ def list_models_command() -> Dict[str, Any]:
         )
 
 
-def list_loras_command() -> Dict[str, Any]:
+def list_loras_command(filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Get available LoRAs.
     
+    Args:
+        filters: Query options; when given, one page of matches is returned
+        
     Returns:
-        List of available LoRAs
+        List of available LoRAs, or a page of matching LoRAs
     """
+    from .ai.generator import get_available_loras, query_loras
+    
     try:
-        loras = get_available_loras()
+        loras = query_loras(**filters) if filters else get_available_loras()
         return format_response(loras, status="success")
     except Exception as e:
         return format_response(
@@ -204,6 +673,8 @@ def status_command(generation_id: str) -> Dict[str, Any]:
     Returns:
         Generation status
     """
+    from .ai.generator import get_generation_status
+    
     try:
         status = get_generation_status(generation_id)
         return format_response(status, status="success")
@@ -225,6 +696,8 @@ def cancel_command(generation_id: str) -> Dict[str, Any]:
     Returns:
         Cancellation result
     """
+    from .ai.generator import cancel_generation
+    
     try:
         cancel_generation(generation_id)
         return format_response(
@@ -247,6 +720,8 @@ def init_command() -> Dict[str, Any]:
     Returns:
         Initialization result
     """
+    from .ai.generator import initialize_backend
+    
     try:
         initialize_backend()
         return format_response(
@@ -262,26 +737,30 @@ def init_command() -> Dict[str, Any]:
         )
 
 
-def output_result(result: Dict[str, Any], output_file: str = None) -> None:
+def output_result(
+    result: Dict[str, Any],
+    output_file: Optional[str] = None,
+    fmt: str = "pretty"
+) -> None:
     """
     Output the result to stdout or file.
     
     Args:
         result: Result to output
         output_file: Optional output file path
+        fmt: Output format (pretty, json, ndjson or msgpack)
     """
-    json_result = json.dumps(result, indent=2)
-    
     if output_file:
         try:
-            with open(output_file, 'w') as f:
-                f.write(json_result)
+            with open(output_file, 'wb') as f:
+                write_response(result, f, fmt)
             print(f"Result written to {output_file}")
         except IOError as e:
             print(f"Error writing to file: {e}", file=sys.stderr)
             sys.exit(1)
     else:
-        print(json_result)
+        sys.stdout.flush()
+        write_response(result, sys.stdout.buffer, fmt)
 
 
 def main() -> None:
@@ -296,7 +775,26 @@ def main() -> None:
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    # Refuse an unusable output format before doing any work
+    try:
+        check_format(args.fmt)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    profiler = ExitStack()
     try:
+        if args.profile:
+            from .utils.profiling import artifact_path, profile
+            
+            path = args.profile_output or artifact_path(
+                settings.profile_dir,
+                f"cli-{args.command}",
+                args.profile
+            )
+            profiler.callback(print, f"Profile written to {path}", file=sys.stderr)
+            profiler.enter_context(profile(args.profile, path))
+        
         # Execute command
         if args.command == "process":
             if not args.input_data:
@@ -312,10 +810,47 @@ def main() -> None:
                 sys.exit(1)
             
             result = generate_command(args.input_data)
+        elif args.command == "generate-batch":
+            result = generate_batch_command(
+                args.input_data,
+                args.output,
+                args.max_in_flight,
+                args.ordered,
+                args.checkpoint
+            )
+            # Results were streamed already; report the summary on stderr
+            print(json.dumps(result["data"]), file=sys.stderr)
+            if result.get("status") == "error":
+                print(result["message"], file=sys.stderr)
+                sys.exit(1)
+            return
+        elif args.command == "bench":
+            result = bench_command(
+                args.input_data,
+                args.compare,
+                args.threshold,
+                args.iterations
+            )
+        elif args.command == "load-test":
+            result = load_test_command(
+                args.input_data,
+                args.pattern,
+                args.rate,
+                args.duration,
+                args.mix,
+                args.cancel_fraction,
+                args.seed,
+                args.workers,
+                args.queue_size,
+                args.cost_scale,
+                args.connect
+            )
+        elif args.command == "metrics":
+            result = metrics_command(args.connect)
         elif args.command == "list-models":
-            result = list_models_command()
+            result = list_models_command(catalog_filters(args))
         elif args.command == "list-loras":
-            result = list_loras_command()
+            result = list_loras_command(catalog_filters(args))
         elif args.command == "status":
             if not args.input_data:
                 print("Error: Generation ID required for status command", file=sys.stderr)
@@ -330,12 +865,32 @@ def main() -> None:
             result = cancel_command(args.input_data)
         elif args.command == "init":
             result = init_command()
+        elif args.command == "serve":
+            from .server import serve_stdio, serve_socket, start_metrics_server
+            
+            if args.metrics_port:
+                start_metrics_server(args.metrics_port)
+            if args.socket or args.port is not None:
+                serve_socket(
+                    path=args.socket,
+                    port=args.port or 0,
+                    max_connections=args.max_connections
+                )
+            else:
+                serve_stdio(max_concurrency=args.max_concurrency)
+            return
         else:
             print(f"Unknown command: {args.command}", file=sys.stderr)
             sys.exit(1)
         
         # Output result
-        output_result(result, args.output)
+        output_result(result, args.output, args.fmt)
+        
+        if args.command == "generate":
+            # Report the generation id right away, then run it to completion
+            from .ai.generator import drain_generations
+            
+            drain_generations()
         
         # Exit with error code if there was an error
         if result.get("status") == "error":
@@ -347,6 +902,8 @@ def main() -> None:
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        profiler.close()
 
 
 if __name__ == "__main__":
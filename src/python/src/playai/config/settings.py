@@ -1,18 +1,28 @@
 """Settings configuration for PlayAI."""
 
 import os
-from typing import Optional
+import threading
+from typing import Any, Optional
 
-from dotenv import load_dotenv
+_env_loaded = False
 
-# Load environment variables from .env file
-load_dotenv()
+
+def _load_env() -> None:
+    """Load environment variables from a .env file once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
 
 
 class Settings:
     """Application settings loaded from environment variables."""
     
     def __init__(self):
+        _load_env()
+        
         # API Configuration
         self.api_key: Optional[str] = os.getenv("API_KEY")
         self.api_base_url: str = os.getenv("API_BASE_URL", "https://api.example.com")
@@ -29,6 +39,44 @@ class Settings:
         self.secret_key: str = os.getenv("SECRET_KEY", "default-secret-key")
         self.environment: str = os.getenv("ENVIRONMENT", "development")
         
+        # Generation Backend
+        self.generation_workers: int = int(os.getenv("GENERATION_WORKERS", "4"))
+        self.generation_queue_size: int = int(os.getenv("GENERATION_QUEUE_SIZE", "256"))
+        self.model_cache_bytes: int = int(
+            os.getenv("MODEL_CACHE_BYTES", str(16 * 1024 ** 3))
+        )
+        self.batch_max_size: int = int(os.getenv("BATCH_MAX_SIZE", "8"))
+        self.batch_max_wait_ms: float = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+        self.lora_cache_bytes: int = int(
+            os.getenv("LORA_CACHE_BYTES", str(8 * 1024 ** 3))
+        )
+        self.result_cache_dir: str = os.getenv("RESULT_CACHE_DIR", "outputs/cache")
+        self.result_cache_bytes: int = int(
+            os.getenv("RESULT_CACHE_BYTES", str(1024 ** 3))
+        )
+        self.generation_ttl_seconds: float = float(
+            os.getenv("GENERATION_TTL_SECONDS", "86400")
+        )
+        self.generation_max_entries: int = int(
+            os.getenv("GENERATION_MAX_ENTRIES", "100000")
+        )
+        self.process_workers: int = int(os.getenv("PROCESS_WORKERS", "0"))
+        self.output_mode: str = os.getenv("OUTPUT_MODE", "file")
+        self.raw_output_dir: str = os.getenv("RAW_OUTPUT_DIR", "outputs/raw")
+        self.audio_output_dir: str = os.getenv("AUDIO_OUTPUT_DIR", "outputs/audio")
+        self.models_dir: str = os.getenv("MODELS_DIR", "models")
+        self.loras_dir: str = os.getenv("LORAS_DIR", "loras")
+        self.generation_timings: bool = (
+            os.getenv("GENERATION_TIMINGS", "False").lower() == "true"
+        )
+        self.metrics_port: int = int(os.getenv("METRICS_PORT", "0"))
+        self.profile_dir: str = os.getenv("PROFILE_DIR", "outputs/profiles")
+        self.profile_sample_rate: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.profile_max_files: int = int(os.getenv("PROFILE_MAX_FILES", "1000"))
+        self.rpc_max_line_bytes: int = int(
+            os.getenv("RPC_MAX_LINE_BYTES", str(16 * 1024 ** 2))
+        )
+        
         # External Services
         self.redis_url: Optional[str] = os.getenv("REDIS_URL")
         self.celery_broker_url: Optional[str] = os.getenv("CELERY_BROKER_URL")
@@ -80,5 +128,32 @@ class Settings:
         return config
 
 
-# Global settings instance
-settings = Settings() 
\ No newline at end of file
+class LazySettings:
+    """Proxy that builds the global Settings on first attribute access."""
+    
+    _settings: Optional[Settings]
+    _lock: threading.Lock
+    
+    def __init__(self) -> None:
+        object.__setattr__(self, "_settings", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+    
+    def _load(self) -> Settings:
+        settings = self._settings
+        if settings is None:
+            with self._lock:
+                settings = self._settings
+                if settings is None:
+                    settings = Settings()
+                    object.__setattr__(self, "_settings", settings)
+        return settings
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+
+# Global settings instance, loaded on first use
+settings = LazySettings() 
\ No newline at end of file
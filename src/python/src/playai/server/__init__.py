@@ -0,0 +1,13 @@
+"""Long-running backend servers for PlayAI."""
+
+from .metrics_http import start_metrics_server
+from .rpc import RPCServer, serve_stdio
+from .socket_server import SocketServer, serve_socket
+
+__all__ = [
+    "RPCServer",
+    "serve_stdio",
+    "SocketServer",
+    "serve_socket",
+    "start_metrics_server",
+]
@@ -0,0 +1,56 @@
+"""Minimal synchronous client for the ``playai serve`` socket daemon."""
+
+import json
+import os
+import socket
+from typing import Any, Dict, Optional
+
+
+def connect(address: str, timeout: Optional[float] = None) -> socket.socket:
+    """
+    Open a connection to a socket daemon.
+
+    Args:
+        address: ``host:port`` or ``port`` of a TCP daemon, or the path of
+            a Unix socket
+        timeout: Socket timeout in seconds (None blocks)
+
+    Returns:
+        Connected socket
+    """
+    host, _, port = address.rpartition(":")
+    if os.path.exists(address) or not port.isdigit():
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+        return sock
+    return socket.create_connection((host or "127.0.0.1", int(port)), timeout=timeout)
+
+
+def call(
+    address: str,
+    method: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: float = 10.0
+) -> Any:
+    """
+    Send one request to a socket daemon and wait for its response.
+
+    Returns:
+        The response's data
+
+    Raises:
+        RuntimeError: If the daemon reports an error or closes the connection
+        OSError: If the daemon cannot be reached
+    """
+    with connect(address, timeout) as sock, sock.makefile("rb") as stream:
+        message = {"id": 1, "method": method, "params": params or {}}
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        for line in stream:
+            response = json.loads(line)
+            if response.get("id") != 1:
+                continue
+            if response.get("status") != "success":
+                raise RuntimeError(response.get("message") or f"{method} failed")
+            return response.get("data")
+    raise RuntimeError(f"Connection closed before the {method} response")
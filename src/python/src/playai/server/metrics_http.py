@@ -0,0 +1,54 @@
+"""Prometheus scrape endpoint for the ``playai serve`` daemon.
+
+Serves ``GET /metrics`` in the Prometheus text exposition format from a
+background thread, next to either the stdio or the socket RPC transport.
+"""
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from ..ai.generator import get_prometheus_metrics
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_prometheus_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve the metrics endpoint on a background thread.
+
+    Args:
+        port: TCP port (0 picks a free one; see ``server.server_port``)
+        host: Interface to listen on
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever,
+        name="playai-metrics",
+        daemon=True
+    ).start()
+    logger.info(f"Prometheus metrics on http://{host}:{server.server_port}/metrics")
+    return server
@@ -0,0 +1,279 @@
+"""JSON-lines RPC server for the persistent `playai serve` daemon.
+
+Every request is a single line of JSON::
+
+    {"id": 1, "method": "generate", "params": {"model_type": "text-to-image", ...}}
+
+and every response is a single line carrying the same ``id`` plus the usual
+``format_response`` envelope::
+
+    {"id": 1, "status": "success", "data": {...}, "timestamp": "..."}
+
+Requests are dispatched concurrently, so responses may arrive out of order;
+clients match them up by ``id``. A ``subscribe`` request answers with one
+line per progress event of the generation (``"event": <kind>``), the last
+of which carries ``"done": true``.
+"""
+
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from ..core import main_function
+from ..config import settings
+from ..utils.helpers import format_response
+from ..ai.generator import (
+    generate_content,
+    get_available_models,
+    get_available_loras,
+    query_models,
+    query_loras,
+    get_generation_status,
+    cancel_generation,
+    subscribe_generation,
+    get_model_cache_stats,
+    get_queue_stats,
+    get_generation_metrics,
+    initialize_backend
+)
+from ..ai.events import ProgressEvent
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Any]
+
+
+def _require(params: Dict[str, Any], key: str) -> Any:
+    """Return a required parameter or raise ValueError."""
+    if key not in params:
+        raise ValueError(f"Missing required parameter: {key}")
+    return params[key]
+
+
+def _config(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "debug": settings.debug,
+        "environment": settings.environment,
+        "api_base_url": settings.api_base_url
+    }
+
+
+def _cancel(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {"cancelled": cancel_generation(_require(params, "generation_id"))}
+
+
+# Parameters that turn a list request into a paginated catalog query
+CATALOG_QUERY_PARAMS = ("model_type", "q", "limit", "cursor")
+
+
+def _catalog_query(list_all: Callable[[], Any], query: Callable[..., Any]) -> Handler:
+    def handler(params: Dict[str, Any]) -> Any:
+        filters = {key: params[key] for key in CATALOG_QUERY_PARAMS if key in params}
+        return query(**filters) if filters else list_all()
+    return handler
+
+
+def _init(params: Dict[str, Any]) -> Dict[str, Any]:
+    initialize_backend()
+    return {"initialized": True}
+
+
+METHODS: Dict[str, Handler] = {
+    "ping": lambda params: {"pong": True},
+    "process": main_function,
+    "config": _config,
+    "generate": generate_content,
+    "list-models": _catalog_query(get_available_models, query_models),
+    "list-loras": _catalog_query(get_available_loras, query_loras),
+    "status": lambda params: get_generation_status(
+        _require(params, "generation_id"),
+        params.get("since_version")
+    ),
+    "cancel": _cancel,
+    "model-cache": lambda params: get_model_cache_stats(),
+    "queue": lambda params: get_queue_stats(),
+    "metrics": lambda params: get_generation_metrics(),
+    "init": _init,
+}
+
+
+def dispatch_message(
+    message: Any,
+    methods: Optional[Dict[str, Handler]] = None
+) -> Dict[str, Any]:
+    """
+    Run a single decoded request and build its response.
+
+    Args:
+        message: Decoded request object
+        methods: Method table (default: METHODS)
+
+    Returns:
+        Response dictionary including the request ``id``
+    """
+    methods = METHODS if methods is None else methods
+    request_id = message.get("id") if isinstance(message, dict) else None
+
+    try:
+        if not isinstance(message, dict):
+            raise ValueError("Request must be a JSON object")
+
+        method = message.get("method")
+        if method not in methods:
+            raise ValueError(f"Unknown method: {method}")
+
+        params = message.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("Request params must be a JSON object")
+
+        response = format_response(methods[method](params), status="success")
+    except Exception as e:
+        logger.debug(f"RPC request {request_id!r} failed: {e}")
+        response = format_response(None, status="error", message=str(e))
+
+    response["id"] = request_id
+    return response
+
+
+def event_response(request_id: Any, event: ProgressEvent) -> Dict[str, Any]:
+    """
+    Build the response line for one event of a ``subscribe`` stream.
+
+    Args:
+        request_id: Id of the subscribe request
+        event: Progress event to send
+
+    Returns:
+        Response dictionary; the last one of a stream has ``"done": true``
+    """
+    response = format_response(asdict(event), status="success")
+    response["id"] = request_id
+    response["event"] = event.kind
+    if event.terminal:
+        response["done"] = True
+    return response
+
+
+class RPCServer:
+    """Serve JSON-lines RPC requests from a reader to a writer."""
+
+    def __init__(
+        self,
+        reader: TextIO,
+        writer: TextIO,
+        max_concurrency: int = 8,
+        methods: Optional[Dict[str, Handler]] = None
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.methods = dict(METHODS if methods is None else methods)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="playai-rpc"
+        )
+        self._write_lock = threading.Lock()
+        self._shutdown = threading.Event()
+
+    def dispatch(self, message: Any) -> Dict[str, Any]:
+        """Run a single decoded request against this server's methods."""
+        return dispatch_message(message, self.methods)
+
+    def handle_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        Decode and run one request line synchronously.
+
+        Args:
+            line: Raw request line
+
+        Returns:
+            Response dictionary, or None for blank lines
+        """
+        line = line.strip()
+        if not line:
+            return None
+
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = format_response(
+                None,
+                status="error",
+                message=f"Invalid JSON input: {e}"
+            )
+            response["id"] = None
+            return response
+
+        return self.dispatch(message)
+
+    def serve_forever(self) -> None:
+        """Read requests until EOF or a ``shutdown`` request, then drain."""
+        for line in self.reader:
+            if self._shutdown.is_set():
+                break
+
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            try:
+                message = json.loads(stripped)
+            except json.JSONDecodeError:
+                response = self.handle_line(stripped)
+                if response is not None:
+                    self._write(response)
+                continue
+
+            if isinstance(message, dict) and message.get("method") == "shutdown":
+                self._shutdown.set()
+                self.executor.shutdown(wait=True)
+                response = format_response({"shutdown": True}, status="success")
+                response["id"] = message.get("id")
+                self._write(response)
+                return
+
+            if isinstance(message, dict) and message.get("method") == "subscribe":
+                threading.Thread(
+                    target=self._stream_events,
+                    args=(message,),
+                    name="playai-rpc-subscribe",
+                    daemon=True
+                ).start()
+                continue
+
+            self.executor.submit(self._handle_async, message)
+
+        self.executor.shutdown(wait=True)
+
+    def _handle_async(self, message: Any) -> None:
+        self._write(self.dispatch(message))
+
+    def _stream_events(self, message: Dict[str, Any]) -> None:
+        request_id = message.get("id")
+        try:
+            params = message.get("params") or {}
+            subscription = subscribe_generation(_require(params, "generation_id"))
+        except Exception as e:
+            response = format_response(None, status="error", message=str(e))
+            response["id"] = request_id
+            self._write(response)
+            return
+
+        with subscription:
+            for event in subscription:
+                self._write(event_response(request_id, event))
+
+    def _write(self, response: Dict[str, Any]) -> None:
+        line = json.dumps(response, separators=(",", ":"), default=str)
+        with self._write_lock:
+            self.writer.write(line + "\n")
+            self.writer.flush()
+
+
+def serve_stdio(max_concurrency: int = 8) -> None:
+    """Run the RPC server over stdin/stdout until EOF."""
+    logger.info("PlayAI backend serving JSON-lines RPC on stdio")
+    RPCServer(sys.stdin, sys.stdout, max_concurrency=max_concurrency).serve_forever()
@@ -0,0 +1,280 @@
+"""Asyncio socket server sharing one warm generation backend.
+
+The server speaks the same JSON-lines protocol as :mod:`playai.server.rpc`
+over a Unix domain socket or a loopback TCP port. Every connection is
+served by its own reader task and writer queue, and blocking handlers run
+on a shared thread pool, so one slow client cannot stall the others.
+
+In addition to the stdio methods (including ``subscribe``), connections may
+use ``submit`` and ``poll`` as aliases for ``generate`` and ``status``.
+
+Request lines longer than the RPC_MAX_LINE_BYTES setting get an error
+response, after which the connection is closed once its in-flight
+requests have been answered.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Set
+
+from ..config import settings
+from ..utils.helpers import format_response
+from ..ai.generator import subscribe_generation
+from .rpc import METHODS, Handler, _require, dispatch_message, event_response
+
+logger = logging.getLogger(__name__)
+
+SOCKET_METHODS: Dict[str, Handler] = dict(
+    METHODS,
+    submit=METHODS["generate"],
+    poll=METHODS["status"],
+)
+
+
+class _Connection:
+    """State for one client connection."""
+
+    def __init__(
+        self,
+        server: "SocketServer",
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=server.max_queued_responses)
+        self.in_flight = asyncio.Semaphore(server.max_in_flight)
+        self.tasks: Set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        sender = asyncio.ensure_future(self._send_loop())
+        try:
+            while True:
+                try:
+                    line = await self.reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # The rest of the line cannot be told apart from the next
+                    # request, so nothing more is read from this connection
+                    await self._reply(None, format_response(
+                        None,
+                        status="error",
+                        message=(
+                            "Request line exceeds "
+                            f"{self.server.max_line_bytes} bytes"
+                        )
+                    ))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                await self.in_flight.acquire()
+                task = asyncio.ensure_future(self._handle(line))
+                self.tasks.add(task)
+                task.add_done_callback(self._request_done)
+            if self.tasks:
+                await asyncio.gather(*self.tasks, return_exceptions=True)
+            await self.outbox.put(None)
+            await sender
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in (sender, *self.tasks):
+                task.cancel()
+            self.writer.close()
+
+    def _request_done(self, task: asyncio.Task) -> None:
+        self.tasks.discard(task)
+        self.in_flight.release()
+
+    async def _handle(self, line: bytes) -> None:
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            await self._reply(None, format_response(
+                None,
+                status="error",
+                message=f"Invalid JSON input: {e}"
+            ))
+            return
+
+        request_id = message.get("id") if isinstance(message, dict) else None
+        if isinstance(message, dict) and message.get("method") == "subscribe":
+            try:
+                await self._subscribe(request_id, message.get("params") or {})
+            except Exception as e:
+                await self._reply(request_id, format_response(
+                    None,
+                    status="error",
+                    message=str(e)
+                ))
+            return
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.server.executor,
+            dispatch_message,
+            message,
+            SOCKET_METHODS
+        )
+        await self.outbox.put(response)
+
+    async def _subscribe(self, request_id: Any, params: Dict[str, Any]) -> None:
+        subscription = subscribe_generation(_require(params, "generation_id"))
+        try:
+            async for event in subscription:
+                await self.outbox.put(event_response(request_id, event))
+        finally:
+            subscription.close()
+
+    async def _reply(self, request_id: Any, response: Dict[str, Any]) -> None:
+        response["id"] = request_id
+        await self.outbox.put(response)
+
+    async def _send_loop(self) -> None:
+        while True:
+            response = await self.outbox.get()
+            if response is None:
+                return
+
+            line = json.dumps(response, separators=(",", ":"), default=str)
+            try:
+                self.writer.write(line.encode() + b"\n")
+                await self.writer.drain()
+            except ConnectionError:
+                return
+
+
+class SocketServer:
+    """JSON-lines RPC server over a Unix domain socket or loopback TCP."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        max_connections: int = 1024,
+        max_in_flight: int = 64,
+        max_queued_responses: int = 256,
+        max_workers: int = 32,
+        max_line_bytes: Optional[int] = None
+    ):
+        self.path = path
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.max_in_flight = max_in_flight
+        self.max_queued_responses = max_queued_responses
+        self.max_line_bytes = max_line_bytes or settings.rpc_max_line_bytes
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="playai-socket"
+        )
+        self.connections: Set[_Connection] = set()
+        self._handlers: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Start listening for connections."""
+        self._server = await self._listen()
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        server = self._server
+        if server is None:
+            server = self._server = await self._listen()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False)
+            if self.path and os.path.exists(self.path):
+                os.unlink(self.path)
+
+    async def close(self) -> None:
+        """Stop accepting connections and drop the open ones."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        handlers = list(self._handlers)
+        for handler in handlers:
+            handler.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        self.executor.shutdown(wait=False)
+
+    async def _listen(self) -> asyncio.AbstractServer:
+        if self.path:
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            server = await asyncio.start_unix_server(
+                self._accept,
+                path=self.path,
+                backlog=self.max_connections,
+                limit=self.max_line_bytes
+            )
+            logger.info(f"PlayAI backend listening on {self.path}")
+        else:
+            server = await asyncio.start_server(
+                self._accept,
+                self.host,
+                self.port,
+                backlog=self.max_connections,
+                limit=self.max_line_bytes
+            )
+            self.port = server.sockets[0].getsockname()[1]
+            logger.info(f"PlayAI backend listening on {self.host}:{self.port}")
+        return server
+
+    async def _accept(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        if len(self.connections) >= self.max_connections:
+            response = format_response(
+                None,
+                status="error",
+                message="Too many connections"
+            )
+            response["id"] = None
+            writer.write(json.dumps(response).encode() + b"\n")
+            try:
+                await writer.drain()
+            finally:
+                writer.close()
+            return
+
+        connection = _Connection(self, reader, writer)
+        task = asyncio.current_task()
+        if task is not None:
+            self._handlers.add(task)
+        self.connections.add(connection)
+        try:
+            await connection.run()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.connections.discard(connection)
+            if task is not None:
+                self._handlers.discard(task)
+
+
+def serve_socket(
+    path: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    max_connections: int = 1024
+) -> None:
+    """Run the socket server until interrupted."""
+    server = SocketServer(
+        path=path,
+        host=host,
+        port=port,
+        max_connections=max_connections
+    )
+    asyncio.run(server.serve_forever())
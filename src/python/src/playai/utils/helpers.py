@@ -2,7 +2,7 @@
 
 import json
 import logging
-from datetime import datetime
+import time
 from typing import Any, Dict, List, Optional, Union
 
 logger = logging.getLogger(__name__)
@@ -36,6 +36,33 @@ def validate_input(data: Dict[str, Any]) -> bool:
     return True
 
 
+# Second the cached timestamp prefix belongs to, and the prefix itself
+_timestamp_cache = (-1, "")
+
+
+def utc_timestamp() -> str:
+    """
+    Get the current UTC time in ISO 8601 format with a trailing "Z".
+    
+    Matches ``datetime.utcnow().isoformat() + "Z"``, but formats the date
+    only once per second.
+    
+    Returns:
+        Timestamp string
+    """
+    global _timestamp_cache
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _timestamp_cache = (second, prefix)
+    microseconds = int((now - second) * 1_000_000)
+    if microseconds:
+        return f"{prefix}.{microseconds:06d}Z"
+    return f"{prefix}Z"
+
+
 def format_response(
     data: Any,
     status: str = "success",
@@ -55,7 +82,7 @@ def format_response(
         Formatted response dictionary
     """
     if timestamp is None:
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        timestamp = utc_timestamp()
     
     response = {
         "status": status,
@@ -0,0 +1,53 @@
+"""Deferred imports for heavy optional dependencies."""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, List, Optional
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        module: Optional[ModuleType] = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real module has been imported yet."""
+        return self.__dict__["_lazy_module"] is not None
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Return a proxy for a module that is imported on first use.
+
+    Heavy inference dependencies (torch, diffusers, librosa, opencv, ...)
+    must be bound through this helper at module level so that lightweight
+    CLI commands never pay their import time.
+
+    Args:
+        name: Fully qualified module name
+
+    Returns:
+        Lazy module proxy
+    """
+    return LazyModule(name)
@@ -0,0 +1,262 @@
+"""Built-in profilers for CLI commands and individual generations.
+
+Three profilers are available. Each one writes a single artifact file:
+
+- ``cprofile``: deterministic function-level profile of the calling thread,
+  written as a pstats file (``python -m pstats FILE``, snakeviz, ...)
+- ``sampling``: the calling thread's stack sampled at a fixed interval from a
+  helper thread, written as collapsed stacks (``root;caller;callee count``
+  per line) for flamegraph.pl, speedscope or inferno. Its cost depends on
+  the interval, not on how many calls the profiled code makes, so it is the
+  one to leave on for a sample of production traffic.
+- ``memory``: a tracemalloc snapshot of the allocations made while profiling
+  (``tracemalloc.Snapshot.load(FILE)``). Tracing is process-wide, so
+  allocations of concurrently running threads show up too.
+
+The profiler modules are imported only when profiling starts. ``prune``
+keeps a directory of artifacts bounded, e.g. when a sample of all
+generations is profiled.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType
+from typing import Dict, Iterator, Optional, Union
+
+CPROFILE = "cprofile"
+SAMPLING = "sampling"
+MEMORY = "memory"
+PROFILERS = (CPROFILE, SAMPLING, MEMORY)
+
+EXTENSIONS = {
+    CPROFILE: ".pstats",
+    SAMPLING: ".collapsed",
+    MEMORY: ".tracemalloc",
+}
+
+# Seconds between stack samples
+DEFAULT_INTERVAL = 0.005
+
+# Frames kept per tracemalloc traceback
+TRACEMALLOC_FRAMES = 16
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_owned = False
+
+
+def check_profiler(mode: str) -> None:
+    """
+    Make sure a profiler name is known.
+
+    Raises:
+        ValueError: If it is not one of PROFILERS
+    """
+    if mode not in PROFILERS:
+        expected = ", ".join(PROFILERS)
+        raise ValueError(f"Unknown profiler: {mode} (expected one of {expected})")
+
+
+def artifact_path(directory: Union[str, Path], label: str, mode: str) -> Path:
+    """
+    Build a unique artifact file name for a profile.
+
+    Args:
+        directory: Directory the artifact goes into
+        label: What was profiled, e.g. a command name or generation id
+        mode: Profiler, one of PROFILERS
+
+    Returns:
+        Path of the form ``<directory>/<label>-<time>-<pid>.<ext>``
+    """
+    check_profiler(mode)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return Path(directory) / f"{label}-{stamp}-{os.getpid()}{EXTENSIONS[mode]}"
+
+
+def prune(directory: Union[str, Path], keep: int) -> int:
+    """
+    Delete all but the newest artifacts in a directory.
+
+    Only files with a profiler extension are counted or deleted.
+
+    Args:
+        directory: Directory holding the artifacts
+        keep: Number of artifacts to keep; zero or less keeps them all
+
+    Returns:
+        Number of artifacts deleted
+    """
+    if keep <= 0:
+        return 0
+    extensions = tuple(EXTENSIONS.values())
+    artifacts = []
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return 0
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(extensions):
+                continue
+            try:
+                artifacts.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+    artifacts.sort(reverse=True)
+    removed = 0
+    for _, path in artifacts[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Another process pruned it first
+            continue
+        removed += 1
+    return removed
+
+
+def _frame_name(code: CodeType) -> str:
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples one thread's call stack at a fixed interval."""
+
+    def __init__(
+        self, thread_id: Optional[int] = None, interval: float = DEFAULT_INTERVAL
+    ):
+        """
+        Args:
+            thread_id: Thread to sample (default: the calling thread)
+            interval: Seconds between samples
+        """
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling on a helper thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="playai-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> Dict[str, int]:
+        """Get sample counts per stack, root first and frames joined by ``;``."""
+        return dict(self.stacks)
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Write the collapsed stacks, most frequent first."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _run(self) -> None:
+        # Frame name per code object, so names are built once
+        names: Dict[CodeType, str] = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                name = names.get(code)
+                if name is None:
+                    name = names[code] = _frame_name(code)
+                stack.append(name)
+                frame = frame.f_back
+            del frame
+            stack.reverse()
+            self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+
+def _start_tracemalloc() -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    import tracemalloc
+
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            _tracemalloc_owned = True
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc(path: Path) -> None:
+    global _tracemalloc_users, _tracemalloc_owned
+    import tracemalloc
+
+    with _tracemalloc_lock:
+        tracemalloc.take_snapshot().dump(str(path))
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+            _tracemalloc_owned = False
+
+
+@contextmanager
+def profile(
+    mode: str,
+    path: Union[str, Path],
+    interval: float = DEFAULT_INTERVAL
+) -> Iterator[Path]:
+    """
+    Profile the calling thread for the duration of a ``with`` block.
+
+    The artifact is written when the block exits, including on errors.
+
+    Args:
+        mode: Profiler, one of PROFILERS
+        path: Artifact file to write
+        interval: Seconds between samples (sampling profiler only)
+
+    Yields:
+        The artifact path
+
+    Raises:
+        ValueError: If the profiler is unknown
+    """
+    check_profiler(mode)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if mode == CPROFILE:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield path
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(path))
+    elif mode == SAMPLING:
+        sampler = SamplingProfiler(interval=interval)
+        sampler.start()
+        try:
+            yield path
+        finally:
+            sampler.stop()
+            sampler.write(path)
+    else:
+        _start_tracemalloc()
+        try:
+            yield path
+        finally:
+            _stop_tracemalloc(path)
@@ -0,0 +1,160 @@
+"""CLI cold-start measurement based on ``python -X importtime``."""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Import-time budgets (milliseconds) for commands that never run inference
+STARTUP_BUDGETS_MS: Dict[str, float] = {
+    "config": 100.0,
+    "list-models": 100.0,
+    "list-loras": 100.0,
+    "status": 100.0,
+    "cancel": 100.0,
+    "process": 100.0,
+}
+
+# Arguments used when measuring each lightweight command
+STARTUP_COMMANDS: Dict[str, List[str]] = {
+    "config": ["config"],
+    "list-models": ["list-models"],
+    "list-loras": ["list-loras"],
+    "status": ["status", "00000000-0000-0000-0000-000000000000"],
+    "cancel": ["cancel", "00000000-0000-0000-0000-000000000000"],
+    "process": ["process", '{"type": "text", "content": "startup"}'],
+}
+
+# Modules that must only be imported by commands that actually run inference
+HEAVY_MODULES: Tuple[str, ...] = (
+    "torch",
+    "transformers",
+    "diffusers",
+    "accelerate",
+    "safetensors",
+    "numpy",
+    "scipy",
+    "librosa",
+    "soundfile",
+    "cv2",
+    "moviepy",
+    "PIL",
+)
+
+
+@dataclass
+class StartupReport:
+    """Import cost of running one CLI command in a fresh interpreter."""
+    command: str
+    import_ms: float
+    modules: Dict[str, float] = field(default_factory=dict)
+    heavy_modules: List[str] = field(default_factory=list)
+    budget_ms: Optional[float] = None
+
+    @property
+    def within_budget(self) -> bool:
+        """Whether the command stayed within its budget and avoided heavy modules."""
+        if self.heavy_modules:
+            return False
+        return self.budget_ms is None or self.import_ms <= self.budget_ms
+
+
+def parse_importtime(output: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Interpreter startup imports are skipped: only top-level entries from the
+    first ``playai`` import onwards are counted.
+
+    Args:
+        output: stderr of a ``python -X importtime`` run
+
+    Returns:
+        Total import time in milliseconds and cumulative time per module
+    """
+    modules: Dict[str, float] = {}
+    top_level: List[Tuple[str, float]] = []
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+
+        cumulative_ms = int(parts[1]) / 1000
+        name = parts[2].rstrip()
+        stripped = name.strip()
+        modules[stripped] = cumulative_ms
+
+        if name.startswith(" ") and not name.startswith("  "):
+            top_level.append((stripped, cumulative_ms))
+
+    total = 0.0
+    counting = False
+    for name, cumulative_ms in top_level:
+        counting = counting or name.startswith("playai")
+        if counting:
+            total += cumulative_ms
+
+    return total, modules
+
+
+def measure_startup(
+    command: str,
+    args: Optional[Sequence[str]] = None,
+    budget_ms: Optional[float] = None,
+    cwd: Optional[str] = None
+) -> StartupReport:
+    """
+    Run one CLI command in a fresh interpreter and measure its imports.
+
+    Args:
+        command: Command name used for reporting and budget lookup
+        args: CLI arguments (default: STARTUP_COMMANDS[command])
+        budget_ms: Budget override (default: STARTUP_BUDGETS_MS[command])
+        cwd: Working directory for the child process
+
+    Returns:
+        Startup report for the command
+    """
+    if args is None:
+        args = STARTUP_COMMANDS[command]
+    if budget_ms is None:
+        budget_ms = STARTUP_BUDGETS_MS.get(command)
+
+    package_root = str(Path(__file__).resolve().parent.parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (package_root, env.get("PYTHONPATH")) if path
+    )
+
+    code = (
+        "import sys; sys.argv = ['playai'] + sys.argv[1:]; "
+        "from playai.cli import main; main()"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+        cwd=cwd
+    )
+
+    import_ms, modules = parse_importtime(result.stderr)
+    heavy = sorted(
+        name for name in modules
+        if name.split(".")[0] in HEAVY_MODULES
+    )
+
+    return StartupReport(
+        command=command,
+        import_ms=import_ms,
+        modules=modules,
+        heavy_modules=heavy,
+        budget_ms=budget_ms
+    )
@@ -0,0 +1,132 @@
+"""Output encodings for CLI responses.
+
+- ``pretty``: indented JSON, the human-readable default
+- ``json``: compact single-line JSON
+- ``ndjson``: one JSON document per line. List results are written one
+  record per line as they are produced; a catalog page is followed by a
+  ``{"total": ..., "next_cursor": ...}`` line. Errors and results that are
+  not lists are written as one line holding the whole response.
+- ``msgpack``: the response as one MessagePack frame behind a 4-byte
+  big-endian length prefix (requires the optional ``msgpack`` package)
+"""
+
+import json
+import struct
+from collections.abc import Iterator
+from typing import Any, BinaryIO, Dict, Iterable
+
+PRETTY = "pretty"
+JSON = "json"
+NDJSON = "ndjson"
+MSGPACK = "msgpack"
+FORMATS = (PRETTY, JSON, NDJSON, MSGPACK)
+
+FRAME_HEADER = struct.Struct(">I")
+
+
+def check_format(fmt: str) -> None:
+    """
+    Make sure an output format can be used.
+
+    Raises:
+        ValueError: If the format is unknown or its encoder is not installed
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}")
+    if fmt == MSGPACK:
+        _msgpack()
+
+
+def _msgpack() -> Any:
+    try:
+        import msgpack  # type: ignore[import-not-found]
+    except ImportError:
+        raise ValueError(
+            "The msgpack format requires the msgpack package (pip install msgpack)"
+        ) from None
+    return msgpack
+
+
+def _compact(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _materialize(response: Dict[str, Any]) -> Dict[str, Any]:
+    if isinstance(response.get("data"), Iterator):
+        response = dict(response, data=list(response["data"]))
+    return response
+
+
+def _records(response: Dict[str, Any]) -> Iterable[Any]:
+    data = response.get("data")
+    if response.get("status") != "success":
+        yield response
+    elif isinstance(data, (list, tuple, Iterator)):
+        yield from data
+    elif (
+        isinstance(data, dict)
+        and isinstance(data.get("items"), list)
+        and "next_cursor" in data
+    ):
+        yield from data["items"]
+        yield {key: value for key, value in data.items() if key != "items"}
+    else:
+        yield response
+
+
+def write_response(
+    response: Dict[str, Any], stream: BinaryIO, fmt: str = PRETTY
+) -> None:
+    """
+    Encode a response onto a binary stream.
+
+    Args:
+        response: format_response envelope; its data may be an iterator of
+            records, which NDJSON writes as they are produced
+        stream: Binary output stream
+        fmt: One of FORMATS
+
+    Raises:
+        ValueError: If the format is unknown or its encoder is not installed
+    """
+    check_format(fmt)
+    if fmt == NDJSON:
+        for record in _records(response):
+            stream.write(_compact(record) + b"\n")
+            stream.flush()
+        return
+
+    response = _materialize(response)
+    if fmt == PRETTY:
+        pretty = json.dumps(response, indent=2, default=str)
+        stream.write(pretty.encode("utf-8") + b"\n")
+    elif fmt == JSON:
+        stream.write(_compact(response) + b"\n")
+    else:
+        payload = _msgpack().packb(response, default=str)
+        stream.write(FRAME_HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def read_frames(stream: BinaryIO) -> Iterable[Any]:
+    """
+    Decode length-prefixed msgpack frames until the stream ends.
+
+    Yields:
+        Decoded objects
+
+    Raises:
+        ValueError: If the stream ends inside a frame
+    """
+    msgpack = _msgpack()
+    while True:
+        header = stream.read(FRAME_HEADER.size)
+        if not header:
+            return
+        if len(header) < FRAME_HEADER.size:
+            raise ValueError("Truncated frame header")
+        (length,) = FRAME_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated frame")
+        yield msgpack.unpackb(payload)
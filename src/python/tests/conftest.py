@@ -0,0 +1,10 @@
+"""Shared pytest configuration."""
+
+import os
+import tempfile
+
+# Keep the generation registry of the process-wide manager off the disk
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+# Keep streamed audio out of the working tree
+os.environ.setdefault("AUDIO_OUTPUT_DIR", tempfile.mkdtemp(prefix="playai-audio-"))
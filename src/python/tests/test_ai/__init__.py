@@ -0,0 +1 @@
+"""Tests for AI generation functionality."""
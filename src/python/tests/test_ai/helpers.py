@@ -0,0 +1,23 @@
+"""Helpers shared by the generation tests."""
+
+import time
+
+from playai.ai.generator import GenerationRequest
+
+
+def make_request(model_type="text-generation", prompt="test", **parameters):
+    """Build a generation request with the given parameters."""
+    return GenerationRequest(
+        model_type=model_type, prompt=prompt, parameters=parameters
+    )
+
+
+def wait_for_status(manager, generation_id, statuses, timeout=5.0):
+    """Poll until the generation reaches one of the given statuses."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = manager.get_generation_status(generation_id)
+        if response.status in statuses:
+            return response
+        time.sleep(0.005)
+    raise AssertionError(f"{generation_id} never reached {statuses}")
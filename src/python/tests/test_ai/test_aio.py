@@ -0,0 +1,78 @@
+"""Tests for the asyncio generation API."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from playai.ai import aio
+from playai.ai.cancellation import GenerationCancelled
+from playai.ai.generator import get_generation_manager
+
+
+def text_request(**parameters):
+    return {"model_type": "text-generation", "prompt": "hi", "parameters": parameters}
+
+
+class TestAsyncAPI:
+    """Test cases for generate_async, submit_async and stream."""
+
+    def test_generate_async(self):
+        """Test awaiting a generation's result."""
+        with patch.object(get_generation_manager(), "simulated_duration", 0.01):
+            result = asyncio.run(aio.generate_async(text_request()))
+
+        assert result["type"] == "text"
+
+    def test_package_exports(self):
+        """Test that the async API is exported lazily from playai.ai."""
+        import playai.ai
+
+        assert playai.ai.generate_async is aio.generate_async
+        assert playai.ai.GenerationHandle is aio.GenerationHandle
+
+    def test_many_concurrent_waiters(self):
+        """Test that many awaiting callers complete without a thread each."""
+        async def scenario():
+            return await asyncio.gather(*(
+                aio.generate_async(text_request(max_tokens=4)) for _ in range(200)
+            ))
+
+        with patch.object(get_generation_manager(), "simulated_duration", 0.005):
+            results = asyncio.run(scenario())
+
+        assert len(results) == 200
+        assert all(result["type"] == "text" for result in results)
+
+    def test_handle_streams_events(self):
+        """Test that a handle streams events ending in the terminal one."""
+        async def scenario():
+            handle = await aio.submit_async(text_request(max_tokens=4))
+            kinds = [event.kind async for event in handle.events()]
+            return kinds, await handle
+
+        with patch.object(get_generation_manager(), "simulated_duration", 0.01):
+            kinds, result = asyncio.run(scenario())
+
+        assert kinds[-1] == "completed"
+        assert result["type"] == "text"
+
+    def test_timeout_and_cancel(self):
+        """Test that a wait can time out and a cancelled generation raises."""
+        async def scenario():
+            handle = await aio.submit_async(text_request())
+            with pytest.raises(asyncio.TimeoutError):
+                await handle.result(timeout=0.05)
+            handle.cancel()
+            with pytest.raises(GenerationCancelled):
+                await handle.result(timeout=5)
+
+        with patch.object(get_generation_manager(), "simulated_duration", 60.0):
+            asyncio.run(scenario())
+
+    def test_failure_raises(self):
+        """Test that awaiting a failed generation raises GenerationFailed."""
+        request = {"model_type": "text-to-smell", "prompt": "hi"}
+
+        with pytest.raises(aio.GenerationFailed, match="Unsupported model type"):
+            asyncio.run(aio.generate_async(request, timeout=5))
@@ -0,0 +1,186 @@
+"""Tests for chunked, streaming audio output."""
+
+import threading
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+from playai.ai import audio
+from playai.ai.audio import WavWriter, chunk_samples, pipeline, split_text
+from playai.ai.generator import GenerationManager, batch_key
+
+from .helpers import make_request, wait_for_status
+
+
+class TestSplitText:
+    """Test cases for split_text."""
+
+    def test_splits_at_sentences(self):
+        """Test that every sentence becomes a chunk of its own."""
+        text = "First one. Second one!  Third\none?\n\nFourth"
+
+        expected = ["First one.", "Second one!", "Third one?", "Fourth"]
+        assert list(split_text(text)) == expected
+
+    def test_long_sentences_broken_at_phrases_then_words(self):
+        """Test that no chunk is longer than the limit."""
+        text = "alpha beta, gamma delta, " + "x" * 25 + " epsilon zeta eta theta."
+        chunks = list(split_text(text, max_chars=12))
+
+        assert chunks[:2] == ["alpha beta,", "gamma delta,"]
+        assert all(len(chunk) <= 12 for chunk in chunks)
+        assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+    def test_blank_text_has_no_chunks(self):
+        """Test that whitespace produces nothing to synthesize."""
+        assert list(split_text("  \n\n ")) == []
+
+    def test_chunk_samples_follow_text_length(self):
+        """Test that longer chunks synthesize more audio."""
+        assert chunk_samples("x" * 15) == audio.SAMPLE_RATE
+        assert chunk_samples("") == 1
+
+
+class TestWavWriter:
+    """Test cases for WavWriter."""
+
+    def test_partial_file_is_playable(self, tmp_path):
+        """Test that the header matches the audio appended so far."""
+        path = tmp_path / "out" / "speech.wav"
+        with WavWriter(path, sample_rate=8000) as writer:
+            writer.append(b"\x01\x00" * 800)
+            with wave.open(str(path), "rb") as partial:
+                assert partial.getnframes() == 800
+                assert partial.getframerate() == 8000
+                assert partial.getsampwidth() == 2
+
+            writer.append(b"\x02\x00" * 400)
+            assert writer.frames == 1200
+            assert writer.duration == pytest.approx(0.15)
+
+        with wave.open(str(path), "rb") as finished:
+            assert finished.getnframes() == 1200
+            assert finished.readframes(1) == b"\x01\x00"
+
+    def test_partial_file_readable_with_soundfile(self, tmp_path):
+        """Test that files written through soundfile are readable while they grow."""
+        soundfile = pytest.importorskip("soundfile")
+        path = tmp_path / "speech.wav"
+        with WavWriter(path, sample_rate=8000) as writer:
+            writer.append(b"\x01\x00" * 800)
+            assert soundfile.info(str(path)).frames == 800
+            # wave trusts the header's data size instead of the file size
+            with wave.open(str(path), "rb") as partial:
+                assert partial.getnframes() == 800
+
+            writer.append(b"\x02\x00" * 400)
+            data, sample_rate = soundfile.read(str(path), dtype="int16")
+            assert sample_rate == 8000
+            assert len(data) == 1200
+
+
+class TestPipeline:
+    """Test cases for pipeline."""
+
+    def test_stages_overlap_in_order(self):
+        """Test that values are consumed in order while the producer runs ahead."""
+        consumed = []
+        threads = set()
+
+        def consume(value):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            consumed.append(value)
+
+        assert pipeline(range(10), lambda n: n * 2, consume, depth=2) == 10
+        assert consumed == [n * 2 for n in range(10)]
+        assert threading.get_ident() not in threads
+
+    def test_consumer_error_stops_producer(self):
+        """Test that a failing consumer stops production and discards the rest."""
+        produced, discarded = [], []
+
+        def produce(n):
+            produced.append(n)
+            return n
+
+        def consume(n):
+            if n == 2:
+                raise RuntimeError("disk full")
+
+        with pytest.raises(RuntimeError, match="disk full"):
+            pipeline(range(100), produce, consume, depth=1, discard=discarded.append)
+
+        assert len(produced) < 100
+        assert set(discarded) <= set(produced) - {0, 1, 2}
+
+    def test_producer_error_raised(self):
+        """Test that a failing producer's error reaches the caller."""
+        def produce(n):
+            if n == 3:
+                raise ValueError("bad chunk")
+            return n
+
+        with pytest.raises(ValueError, match="bad chunk"):
+            pipeline(range(10), produce, lambda n: None)
+
+
+class TestStreamingGeneration:
+    """Test cases for streamed text-to-audio generations."""
+
+    def test_previews_grow_until_complete(self):
+        """Test that each written chunk is announced with its playable duration."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.3)
+        subscription = manager.subscribe()
+        prompt = "One sentence here. Another sentence there. And a third one."
+        generation_id = manager.start_generation(make_request("text-to-audio", prompt))
+
+        previews = []
+        for event in subscription:
+            if event.generation_id != generation_id:
+                continue
+            if event.kind == "preview":
+                playable = event.data["duration_s"] * audio.SAMPLE_RATE
+                with wave.open(event.data["url"], "rb") as partial:
+                    assert partial.getnframes() >= playable
+                previews.append(event.data["duration_s"])
+            if event.kind in ("completed", "failed"):
+                break
+        subscription.close()
+
+        assert event.kind == "completed"
+        assert previews and previews == sorted(previews)
+        result = event.data
+        assert result["chunks"] == 3
+        assert result["duration_s"] > previews[-1]
+        samples = sum(chunk_samples(chunk) for chunk in split_text(prompt))
+        with wave.open(result["url"], "rb") as finished:
+            assert finished.getnframes() == samples
+        Path(result["url"]).unlink()
+
+    def test_cancelled_stream_removes_partial_file(self):
+        """Test that cancelling mid-stream deletes the partial WAV."""
+        manager = GenerationManager(max_workers=1, simulated_duration=2.0)
+        subscription = manager.subscribe()
+        request = make_request("text-to-audio", "A. B. C. D. E. F. G. H.")
+        generation_id = manager.start_generation(request)
+        for event in subscription:
+            if event.kind == "preview":
+                path = Path(event.data["url"])
+                break
+        subscription.close()
+
+        assert path.exists()
+        assert manager.cancel_generation(generation_id) is True
+        wait_for_status(manager, generation_id, ["cancelled"])
+        deadline = time.monotonic() + 2.0
+        while path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not path.exists()
+
+    def test_streamed_audio_not_batched(self):
+        """Test that only raw-buffer audio requests can share a forward pass."""
+        assert batch_key(make_request("text-to-audio")) is None
+        assert batch_key(make_request("text-to-audio", output="mmap")) is not None
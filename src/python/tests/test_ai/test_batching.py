@@ -0,0 +1,90 @@
+"""Tests for micro-batching of generation requests."""
+
+import threading
+
+from playai.ai.batching import MicroBatcher
+from playai.ai.scheduler import GenerationScheduler
+
+
+def blocker(scheduler):
+    """Occupy the only worker until the returned event is set."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def run():
+        started.set()
+        release.wait(5)
+
+    scheduler.submit("blocker", "other", run)
+    assert started.wait(5)
+    return release
+
+
+class TestMicroBatcher:
+    """Test cases for MicroBatcher."""
+
+    def test_compatible_requests_share_a_batch(self):
+        """Test that requests queued under one key run as a single batch."""
+        scheduler = GenerationScheduler(max_workers=1)
+        batches = []
+        batcher = MicroBatcher(scheduler, batches.append, max_batch_size=8, max_wait=0)
+        release = blocker(scheduler)
+
+        for i in range(5):
+            batcher.submit(f"a{i}", "text-to-image", "a", f"a{i}")
+        batcher.submit("b0", "text-to-image", "b", "b0")
+        batcher.submit("solo", "text-to-image", None, "solo")
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+        assert sorted(batches) == [["a0", "a1", "a2", "a3", "a4"], ["b0"], ["solo"]]
+
+    def test_max_batch_size(self):
+        """Test that a full batch is closed and later requests open a new one."""
+        scheduler = GenerationScheduler(max_workers=1)
+        batches = []
+        batcher = MicroBatcher(scheduler, batches.append, max_batch_size=2, max_wait=0)
+        release = blocker(scheduler)
+
+        for i in range(5):
+            batcher.submit(str(i), "text-to-image", "a", i)
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+        assert batches == [[0, 1], [2, 3], [4]]
+
+    def test_wait_window_collects_late_requests(self):
+        """Test that a running batch waits for requests arriving within the window."""
+        scheduler = GenerationScheduler(max_workers=1)
+        batches = []
+        batcher = MicroBatcher(
+            scheduler, batches.append, max_batch_size=3, max_wait=5.0
+        )
+
+        batcher.submit("0", "text-to-image", "a", 0)
+        batcher.submit("1", "text-to-image", "a", 1)
+        batcher.submit("2", "text-to-image", "a", 2)
+        scheduler.shutdown(wait=True)
+
+        assert batches == [[0, 1, 2]]
+
+    def test_cancel_last_member_drops_job(self):
+        """Test that cancelling every member of a queued batch frees its queue slot."""
+        scheduler = GenerationScheduler(max_workers=1)
+        batches = []
+        batcher = MicroBatcher(scheduler, batches.append, max_wait=0)
+        release = blocker(scheduler)
+
+        batcher.submit("0", "text-to-image", "a", 0)
+        batcher.submit("1", "text-to-image", "a", 1)
+        assert batcher.cancel("0") is True
+        assert scheduler.queue_depth()["text-to-image"] == 1
+        assert batcher.cancel("1") is True
+        assert scheduler.queue_depth()["text-to-image"] == 0
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+        assert batches == []
@@ -0,0 +1,123 @@
+"""Tests for bulk generation of request streams."""
+
+import json
+
+from playai.ai.bulk import BulkCheckpoint, run_bulk
+from playai.ai.generator import GenerationManager
+from playai.ai.result_cache import ResultCache
+
+
+def request_lines(count, **parameters):
+    """Build request lines for quick text generations."""
+    parameters.setdefault("max_tokens", 2)
+    return [
+        json.dumps({
+            "id": f"req-{i}",
+            "model_type": "text-generation",
+            "prompt": f"prompt {i}",
+            "parameters": parameters,
+        })
+        for i in range(count)
+    ]
+
+
+def make_manager(result_cache=None):
+    return GenerationManager(
+        max_workers=2, result_cache=result_cache, simulated_duration=0.01
+    )
+
+
+class TestRunBulk:
+    """Test cases for run_bulk."""
+
+    def test_every_line_gets_a_record(self):
+        """Test that each request yields exactly one completed record."""
+        lines = request_lines(10)
+        records = list(run_bulk(lines, max_in_flight=3, manager=make_manager()))
+
+        assert sorted(record["index"] for record in records) == list(range(10))
+        assert all(record["status"] == "completed" for record in records)
+        assert {record["id"] for record in records} == {f"req-{i}" for i in range(10)}
+
+    def test_ordered_output(self):
+        """Test that ordered mode yields records in input order."""
+        lines = request_lines(12)
+        manager = make_manager()
+        records = list(run_bulk(lines, max_in_flight=4, ordered=True, manager=manager))
+
+        assert [record["index"] for record in records] == list(range(12))
+
+    def test_in_flight_bounded(self):
+        """Test that no more than max_in_flight requests are outstanding."""
+        manager = make_manager()
+        started = []
+        start_generation = manager.start_generation
+
+        def tracking_start(request):
+            started.append(request)
+            return start_generation(request)
+
+        manager.start_generation = tracking_start
+        yielded = 0
+        for _ in run_bulk(request_lines(9), max_in_flight=2, manager=manager):
+            yielded += 1
+            assert len(started) - yielded <= 2
+
+    def test_invalid_lines_fail_alone(self):
+        """Test that malformed requests produce failed records and blank lines none."""
+        missing_prompt = {"id": "x", "model_type": "text-generation"}
+        lines = ["not json", "", json.dumps(missing_prompt)]
+        lines += request_lines(1)
+
+        records = {r["index"]: r for r in run_bulk(lines, manager=make_manager())}
+
+        assert set(records) == {0, 2, 3}
+        assert records[0]["status"] == "failed"
+        assert records[2]["id"] == "x" and "prompt" in records[2]["error"]
+        assert records[3]["status"] == "completed"
+
+    def test_coalesced_duplicates_each_reported(self, tmp_path):
+        """Test that identical seeded requests sharing a generation both get records."""
+        lines = request_lines(1, seed=7) * 2
+        manager = make_manager(ResultCache(tmp_path, 1024 ** 2))
+
+        records = list(run_bulk(lines, manager=manager))
+
+        assert len(records) == 2
+        assert records[0]["generation_id"] == records[1]["generation_id"]
+
+
+class TestBulkCheckpoint:
+    """Test cases for BulkCheckpoint."""
+
+    def test_resume_skips_finished_lines(self, tmp_path):
+        """Test that a rerun only processes lines missing from the checkpoint."""
+        path = tmp_path / "batch.done"
+        lines = request_lines(6)
+        checkpoint = BulkCheckpoint(path)
+        manager = make_manager()
+        first = run_bulk(lines, ordered=True, checkpoint=checkpoint, manager=manager)
+        done = [next(first)["index"] for _ in range(3)]
+        first.close()
+        checkpoint.close()
+
+        resumed = BulkCheckpoint(path)
+        records = list(run_bulk(lines, checkpoint=resumed, manager=make_manager()))
+        resumed.close()
+
+        # Line 2 was handed out but never acknowledged by asking for more
+        assert done == [0, 1, 2]
+        assert sorted(record["index"] for record in records) == [2, 3, 4, 5]
+        assert len(BulkCheckpoint(path)) == 6
+
+    def test_compacts_to_watermark(self, tmp_path):
+        """Test that loading folds contiguous finished lines into a watermark."""
+        path = tmp_path / "batch.done"
+        path.write_text("0\n2\n1\n5\n3x\n")
+
+        checkpoint = BulkCheckpoint(path)
+        checkpoint.close()
+
+        assert checkpoint.watermark == 3
+        assert 5 in checkpoint and 4 not in checkpoint
+        assert path.read_text() == "<=3\n5\n"
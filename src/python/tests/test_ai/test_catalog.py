@@ -0,0 +1,218 @@
+"""Tests for the filesystem-backed model catalog."""
+
+import json
+import os
+import struct
+
+import pytest
+
+from playai.ai.catalog import (
+    CheckpointCatalog,
+    SearchIndex,
+    describe_lora,
+    describe_model,
+    read_safetensors_metadata
+)
+
+
+def write_safetensors(path, metadata=None, payload=b"\0" * 16):
+    """Write a minimal safetensors file with the given metadata."""
+    weight = {"dtype": "F32", "shape": [4], "data_offsets": [0, len(payload)]}
+    header = {"weight": weight}
+    if metadata is not None:
+        header["__metadata__"] = metadata
+    encoded = json.dumps(header).encode("utf-8")
+    path.write_bytes(struct.pack("<Q", len(encoded)) + encoded + payload)
+
+
+class TestReadSafetensorsMetadata:
+    """Test cases for read_safetensors_metadata."""
+
+    def test_reads_metadata(self, tmp_path):
+        """Test that header metadata is returned as strings."""
+        path = tmp_path / "model.safetensors"
+        write_safetensors(path, {"modelspec.title": "Model"})
+
+        assert read_safetensors_metadata(path) == {"modelspec.title": "Model"}
+
+    def test_missing_metadata(self, tmp_path):
+        """Test that a header without metadata yields an empty dict."""
+        path = tmp_path / "model.safetensors"
+        write_safetensors(path)
+
+        assert read_safetensors_metadata(path) == {}
+
+    def test_rejects_non_object_metadata(self, tmp_path):
+        """Test that metadata that is not an object is rejected, not crashed on."""
+        path = tmp_path / "model.safetensors"
+        write_safetensors(path, ["modelspec.title", "Model"])
+
+        with pytest.raises(ValueError, match="__metadata__ is not an object"):
+            read_safetensors_metadata(path)
+
+        entries = CheckpointCatalog(tmp_path, describe_model).entries()
+        assert entries[0]["name"] == "model"
+
+    def test_rejects_truncated_file(self, tmp_path):
+        """Test that a file shorter than the length prefix is rejected."""
+        path = tmp_path / "model.safetensors"
+        path.write_bytes(b"\1\0")
+
+        with pytest.raises(ValueError):
+            read_safetensors_metadata(path)
+
+
+class TestDescribe:
+    """Test cases for describe_model and describe_lora."""
+
+    def test_model_from_metadata(self, tmp_path):
+        """Test that model entries use the header's architecture and parameters."""
+        entry = describe_model(tmp_path / "llama-3-8b.safetensors", {
+            "modelspec.architecture": "llama-3",
+            "modelspec.description": "Chat model",
+            "playai.parameters": '{"max_tokens": 4096}',
+        })
+
+        assert entry["name"] == "llama-3-8b"
+        assert entry["model_type"] == "text-generation"
+        assert entry["description"] == "Chat model"
+        assert entry["parameters"] == {"max_tokens": 4096}
+
+    def test_lora_defaults(self, tmp_path):
+        """Test that LoRAs without metadata get defaults."""
+        entry = describe_lora(tmp_path / "watercolor.safetensors", {})
+
+        assert entry["model_type"] == "text-to-image"
+        assert entry["strength"] == 1.0
+
+
+class TestCheckpointCatalog:
+    """Test cases for CheckpointCatalog."""
+
+    def test_missing_directory_lists_builtin(self, tmp_path):
+        """Test that only built-in entries are listed without a directory."""
+        builtin = [{"name": "base", "model_type": "text-to-image"}]
+        catalog = CheckpointCatalog(tmp_path / "missing", describe_model, builtin)
+
+        assert catalog.entries() == builtin
+
+    def test_discovered_entries_override_builtin(self, tmp_path):
+        """Test that files are listed after built-ins and replace same-named ones."""
+        write_safetensors(tmp_path / "base.safetensors", {"description": "local"})
+        write_safetensors(tmp_path / "extra.safetensors")
+        (tmp_path / "notes.txt").write_text("not a checkpoint")
+        builtin = [{"name": "base", "description": "builtin"}]
+
+        entries = CheckpointCatalog(tmp_path, describe_model, builtin).entries()
+
+        assert [entry["name"] for entry in entries] == ["base", "extra"]
+        assert entries[0]["description"] == "local"
+
+    def test_index_skips_unchanged_files(self, tmp_path):
+        """Test that a new process reuses the index instead of reading headers."""
+        for i in range(3):
+            write_safetensors(tmp_path / f"model-{i}.safetensors")
+        first = CheckpointCatalog(tmp_path, describe_model)
+        first.entries()
+
+        second = CheckpointCatalog(tmp_path, describe_model)
+
+        assert second.entries() == first.entries()
+        assert first.headers_read == 3
+        assert second.headers_read == 0
+        assert (tmp_path / ".playai-index.json").exists()
+
+    def test_changed_and_removed_files_rescanned(self, tmp_path):
+        """Test that only modified files are re-read and deleted ones dropped."""
+        write_safetensors(tmp_path / "a.safetensors", {"description": "old"})
+        write_safetensors(tmp_path / "b.safetensors")
+        catalog = CheckpointCatalog(tmp_path, describe_model)
+        catalog.entries()
+
+        path = tmp_path / "a.safetensors"
+        write_safetensors(path, {"description": "new"}, payload=b"\0" * 32)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (tmp_path / "b.safetensors").unlink()
+
+        entries = catalog.entries()
+
+        assert [entry["description"] for entry in entries] == ["new"]
+        assert catalog.headers_read == 3
+
+    def test_unreadable_header_still_listed(self, tmp_path):
+        """Test that a corrupt checkpoint is listed with default metadata."""
+        (tmp_path / "broken.safetensors").write_bytes(b"\xff" * 8)
+
+        entries = CheckpointCatalog(tmp_path, describe_lora).entries()
+
+        assert entries[0]["name"] == "broken"
+        assert entries[0]["strength"] == 1.0
+
+
+def entry(name, model_type, description):
+    return {"name": name, "model_type": model_type, "description": description}
+
+
+ENTRIES = [
+    entry("sdxl-base", "text-to-image", "Base image model"),
+    entry("portrait-xl", "text-to-image", "Portrait photos"),
+    entry("voice-one", "text-to-audio", "Portrait of a voice"),
+    entry("llama-chat", "text-generation", "Chat model"),
+]
+
+
+class TestSearchIndex:
+    """Test cases for SearchIndex."""
+
+    def test_filters_combine(self):
+        """Test that model type and every query word must match."""
+        index = SearchIndex(ENTRIES)
+
+        assert index.search(q="portrait") == [1, 2]
+        assert index.search(model_type="text-to-image", q="portrait") == [1]
+        assert index.search(q="portrait photos") == [1]
+        assert index.search(q="portrait chat") == []
+        assert index.search(model_type="text-to-video") == []
+
+    def test_prefix_match(self):
+        """Test that query words match the start of entry tokens."""
+        index = SearchIndex(ENTRIES)
+
+        assert index.search(q="por") == [1, 2]
+        assert index.search(q="Generation") == [3]
+
+    def test_cursor_pagination(self):
+        """Test that cursors walk through every match exactly once."""
+        index = SearchIndex(ENTRIES * 3)
+        names, cursor = [], None
+        while True:
+            page = index.query(model_type="text-to-image", limit=4, cursor=cursor)
+            assert page.total == 6
+            names += [item["name"] for item in page.items]
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert names == ["sdxl-base", "portrait-xl"] * 3
+
+    def test_count_only(self):
+        """Test that a zero limit returns just the number of matches."""
+        page = SearchIndex(ENTRIES).query(q="model", limit=0)
+
+        assert page.to_dict() == {"items": [], "total": 2, "next_cursor": None}
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            SearchIndex(ENTRIES).query(cursor="not a cursor")
+
+    def test_catalog_query_sees_new_files(self, tmp_path):
+        """Test that the catalog rebuilds its search index when files change."""
+        catalog = CheckpointCatalog(tmp_path, describe_model, ENTRIES)
+        assert catalog.query(q="anime").total == 0
+
+        write_safetensors(tmp_path / "anime-v2.safetensors")
+
+        page = catalog.query(q="anime")
+        assert [item["name"] for item in page.items] == ["anime-v2"]
@@ -0,0 +1,117 @@
+"""Tests for progress event subscriptions."""
+
+import asyncio
+
+import pytest
+
+from playai.ai.events import EventBus, ProgressEvent
+from playai.ai.generator import GenerationManager
+from playai.ai.scheduler import QueueFullError
+
+from .helpers import make_request
+
+
+class TestSubscription:
+    """Test cases for Subscription."""
+
+    def test_step_events_are_coalesced(self):
+        """Test that a slow consumer only sees the latest pending step."""
+        bus = EventBus()
+        subscription = bus.subscribe("g")
+
+        bus.publish(ProgressEvent("g", "started"))
+        for step in range(1, 11):
+            bus.publish(ProgressEvent("g", "step", step, 10))
+        bus.publish(ProgressEvent("g", "completed"))
+
+        events = list(subscription)
+
+        assert [(event.kind, event.step) for event in events] == [
+            ("started", None), ("step", 10), ("completed", None)
+        ]
+        assert subscription.coalesced == 9
+        assert subscription.closed
+
+    def test_other_generations_are_filtered(self):
+        """Test that a subscription only receives its own generation."""
+        bus = EventBus()
+        subscription = bus.subscribe("a")
+
+        bus.publish(ProgressEvent("b", "completed"))
+        bus.publish(ProgressEvent("a", "completed"))
+
+        assert [event.generation_id for event in subscription] == ["a"]
+
+
+class TestManagerEvents:
+    """Test cases for GenerationManager.subscribe."""
+
+    def test_lifecycle_events(self):
+        """Test that a generation emits queued, started, steps and completed."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        subscription = manager.subscribe()
+
+        request = make_request("text-to-image", steps=20)
+        generation_id = manager.start_generation(request)
+        kinds = []
+        for event in subscription:
+            kinds.append(event.kind)
+            if event.terminal:
+                break
+        subscription.close()
+
+        assert kinds[:2] == ["queued", "started"]
+        assert "step" in kinds
+        assert kinds[-1] == "completed"
+        assert manager.get_generation_status(generation_id).status == "completed"
+
+    def test_rejected_generation_fails_after_queued(self):
+        """Test that a generation refused by a full queue ends with a failed event."""
+        manager = GenerationManager(
+            max_workers=1, max_queue_size=1, simulated_duration=60.0
+        )
+        subscription = manager.subscribe()
+        started = []
+        with pytest.raises(QueueFullError):
+            for frames in range(1, 11):
+                # Different shapes, so every request is a scheduler job of its own
+                request = make_request("text-to-video", frames=frames)
+                started.append(manager.start_generation(request))
+
+        seen = {}
+        for event in subscription:
+            seen.setdefault(event.generation_id, []).append(event.kind)
+            if event.kind == "failed":
+                break
+        subscription.close()
+        for generation_id in started:
+            manager.cancel_generation(generation_id)
+
+        assert event.generation_id not in started
+        assert seen[event.generation_id] == ["queued", "failed"]
+        assert "queue is full" in event.data["error"]
+
+    def test_late_subscriber_gets_terminal_event(self):
+        """Test that subscribing to a finished generation ends immediately."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        generation_id = manager.start_generation(make_request("text-generation"))
+        list(manager.subscribe(generation_id))
+
+        events = list(manager.subscribe(generation_id))
+
+        assert [event.kind for event in events] == ["completed"]
+        assert events[0].data["type"] == "text"
+
+    def test_async_iteration(self):
+        """Test consuming events with async for."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.05)
+
+        async def consume():
+            request = make_request("text-to-video", frames=10)
+            generation_id = manager.start_generation(request)
+            return [event.kind async for event in manager.subscribe(generation_id)]
+
+        kinds = asyncio.run(consume())
+
+        assert kinds[-1] == "completed"
+        assert "preview" in kinds or "step" in kinds
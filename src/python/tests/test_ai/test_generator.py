@@ -0,0 +1,377 @@
+"""Tests for the generation manager."""
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from playai.ai import generator
+from playai.ai.generator import (
+    GenerationManager,
+    GenerationResponse,
+    batch_key
+)
+from playai.ai.outputs import OutputStore, open_output
+from playai.ai.registry import GenerationRegistry
+from playai.ai.result_cache import ResultCache
+
+from .helpers import make_request, wait_for_status
+
+
+class TestGenerationManager:
+    """Test cases for GenerationManager."""
+
+    def test_generation_completes(self):
+        """Test that a generation runs to completion."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        generation_id = manager.start_generation(make_request())
+
+        response = wait_for_status(manager, generation_id, ["completed"])
+
+        assert response.success is True
+        assert response.data["type"] == "text"
+
+    def test_unsupported_model_type_fails(self):
+        """Test that unknown model types end in the failed state."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        generation_id = manager.start_generation(make_request("text-to-smell"))
+
+        response = wait_for_status(manager, generation_id, ["failed"])
+
+        assert "Unsupported model type" in response.error
+
+    def test_model_stays_resident_between_generations(self):
+        """Test that consecutive generations reuse the cached pipeline."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        for _ in range(2):
+            generation_id = manager.start_generation(make_request())
+            response = wait_for_status(manager, generation_id, ["completed"])
+
+        stats = manager.models.stats()
+        assert response.data["model_used"] == "default_text_model"
+        assert stats["loads"] == 1
+        assert stats["hits"] == 1
+        assert stats["pinned_models"] == 0
+
+    def test_lora_generation_uses_fused_model(self):
+        """Test that LoRA requests run fused, at the LoRA's default strength."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        request = make_request("text-to-image", steps=2)
+        request.lora_name = "anime-style"
+        generation_id = manager.start_generation(request)
+
+        wait_for_status(manager, generation_id, ["completed"])
+
+        fused = list(manager.loras.fused.resident())
+        assert fused == ["default_image_model+anime-style@0.80"]
+
+    def test_compatible_requests_batched(self):
+        """Test that a burst of compatible requests shares one forward pass."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.2)
+        blocker = manager.start_generation(make_request("text-to-audio"))
+        wait_for_status(manager, blocker, ["processing"])
+
+        start = time.monotonic()
+        generation_ids = [
+            manager.start_generation(make_request("text-to-image", steps=4))
+            for _ in range(8)
+        ]
+        for generation_id in generation_ids:
+            wait_for_status(manager, generation_id, ["completed"])
+
+        # Serially the burst would take 8 x 0.2s after the blocker
+        assert time.monotonic() - start < 0.8
+
+    def test_batch_member_cancelled_alone(self):
+        """Test that cancelling the member running the batch lets the others go on."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.5)
+        subscription = manager.subscribe()
+        first = manager.start_generation(make_request(max_tokens=8))
+        second = manager.start_generation(make_request(max_tokens=7))
+        steps = []
+        for event in subscription:
+            if event.generation_id != second:
+                continue
+            if event.kind == "step":
+                steps.append(event.step)
+                if len(steps) == 2:
+                    assert manager.cancel_generation(first) is True
+            if event.terminal:
+                break
+        subscription.close()
+
+        assert event.kind == "completed"
+        assert manager.get_generation_status(first).status == "cancelled"
+        # The remaining member carries on instead of restarting at step 1
+        assert steps == sorted(set(steps))
+        assert steps[-1] == 7
+
+    def test_batch_key_groups_compatible_requests(self):
+        """Test which requests are considered compatible for batching."""
+        def image(**parameters):
+            return batch_key(make_request("text-to-image", **parameters))
+
+        def text(max_tokens):
+            return batch_key(make_request(max_tokens=max_tokens))
+
+        assert image(width=512, steps=20, seed=1) == image(width=512, steps=20, seed=2)
+        assert image(width=512, steps=20) != image(width=768, steps=20)
+        assert text(100) == text(128)
+        assert text(100) != text(200)
+        assert batch_key(make_request("text-to-image", width=[512])) is None
+
+    def test_seeded_duplicates_coalesced_and_cached(self, tmp_path):
+        """Test that identical seeded requests share a generation, then the cache."""
+        manager = GenerationManager(
+            max_workers=1,
+            result_cache=ResultCache(tmp_path, 1024 ** 2),
+            simulated_duration=0.05
+        )
+        first = manager.start_generation(make_request(seed=7))
+        second = manager.start_generation(make_request(seed=7))
+        other = manager.start_generation(make_request(seed=8))
+
+        assert second == first
+        assert other != first
+        response = wait_for_status(manager, first, ["completed"])
+
+        cached_id = manager.start_generation(make_request(seed=7))
+        cached = manager.get_generation_status(cached_id)
+
+        assert cached_id != first
+        assert cached.status == "completed"
+        assert cached.data == response.data
+
+    def test_unseeded_requests_not_cached(self, tmp_path):
+        """Test that requests without a seed always run."""
+        manager = GenerationManager(
+            max_workers=1,
+            result_cache=ResultCache(tmp_path, 1024 ** 2),
+            simulated_duration=0.01
+        )
+        first = manager.start_generation(make_request())
+        second = manager.start_generation(make_request())
+
+        assert second != first
+        wait_for_status(manager, second, ["completed"])
+        assert manager.results.stats()["entries"] == 0
+
+    def test_raw_output_handed_over_in_shared_memory(self, tmp_path):
+        """Test that raw outputs are mapped by consumers and freed on cleanup."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        manager.outputs = OutputStore(tmp_path)
+        request = make_request(
+            "text-to-image", width=8, height=4, steps=2, output="shm"
+        )
+        generation_id = manager.start_generation(request)
+
+        response = wait_for_status(manager, generation_id, ["completed"])
+        handle = response.data["buffer"]
+
+        assert "url" not in response.data
+        assert handle["kind"] == "shm"
+        with open_output(handle) as view:
+            assert view.shape == (4, 8, 3)
+            assert view.format == "B"
+
+        manager.cleanup_completed()
+        assert manager.outputs.get(generation_id) is None
+
+    def test_raw_output_memory_mapped(self, tmp_path):
+        """Test that mmap outputs are files sized to the decoded samples."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        manager.outputs = OutputStore(tmp_path)
+        request = make_request("text-to-audio", chunks=2, output="mmap")
+        generation_id = manager.start_generation(request)
+
+        handle = wait_for_status(manager, generation_id, ["completed"]).data["buffer"]
+
+        assert handle["shape"] == [48000]
+        assert handle["dtype"] == "float32"
+        assert (tmp_path / f"{generation_id}.raw").stat().st_size == 48000 * 4
+
+    def test_eviction_frees_raw_outputs(self, tmp_path):
+        """Test that raw outputs are freed when their generations are evicted."""
+        registry = GenerationRegistry(
+            f"sqlite:///{tmp_path / 'playai.db'}", GenerationResponse, max_entries=1
+        )
+        manager = GenerationManager(
+            max_workers=1, registry=registry, simulated_duration=0.01
+        )
+        manager.outputs = OutputStore(tmp_path)
+        handles = {}
+        for mode in ("mmap", "shm"):
+            request = make_request(
+                "text-to-image", width=8, height=4, steps=2, output=mode
+            )
+            generation_id = manager.start_generation(request)
+            response = wait_for_status(manager, generation_id, ["completed"])
+            handles[mode] = (generation_id, response.data["buffer"])
+
+        registry.reap()
+
+        mmap_id, mmap_handle = handles["mmap"]
+        shm_id, shm_handle = handles["shm"]
+        assert manager.outputs.get(mmap_id) is None
+        assert not Path(mmap_handle["location"]).exists()
+        with open_output(shm_handle) as view:
+            assert view.shape == (4, 8, 3)
+
+        registry.max_entries = 0
+        registry.reap()
+
+        assert manager.outputs.get(shm_id) is None
+        with pytest.raises(FileNotFoundError):
+            with open_output(shm_handle):
+                pass
+
+    def test_shared_memory_output_rejected_when_off(self, tmp_path):
+        """Test that a process without shared memory rejects shm requests up front."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        manager.outputs = OutputStore(tmp_path, shared_memory=False)
+
+        with pytest.raises(ValueError, match="Shared-memory outputs"):
+            manager.start_generation(make_request("text-to-image", output="shm"))
+        generation_id = manager.start_generation(
+            make_request("text-generation", output="shm")
+        )
+
+        assert wait_for_status(manager, generation_id, ["completed"])
+
+    def test_unknown_output_mode_fails(self, tmp_path):
+        """Test that an unsupported output mode fails the generation."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        manager.outputs = OutputStore(tmp_path)
+        request = make_request("text-to-image", output="png")
+        generation_id = manager.start_generation(request)
+
+        response = wait_for_status(manager, generation_id, ["failed"])
+
+        assert "Unsupported output kind" in response.error
+
+    def test_unknown_lora_fails(self):
+        """Test that an unknown LoRA ends the generation in the failed state."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        request = make_request()
+        request.lora_name = "missing"
+        generation_id = manager.start_generation(request)
+
+        response = wait_for_status(manager, generation_id, ["failed"])
+
+        assert "Unknown LoRA" in response.error
+
+
+class TestCancellation:
+    """Test cases for cooperative cancellation."""
+
+    def test_cancel_running_frees_worker(self):
+        """Test that a running job stops within a step and frees its worker."""
+        manager = GenerationManager(max_workers=1, simulated_duration=60.0)
+        video_id = manager.start_generation(make_request("text-to-video", frames=25))
+        wait_for_status(manager, video_id, ["processing"])
+
+        start = time.monotonic()
+        assert manager.cancel_generation(video_id) is True
+        manager.simulated_duration = 0.01
+        text_id = manager.start_generation(make_request())
+        wait_for_status(manager, text_id, ["completed"])
+
+        assert time.monotonic() - start < 1.0
+        assert manager.get_generation_status(video_id).status == "cancelled"
+
+    def test_cancel_queued_never_starts(self):
+        """Test that a queued generation is dropped without running."""
+        manager = GenerationManager(max_workers=1, simulated_duration=60.0)
+        blocker = manager.start_generation(make_request())
+        wait_for_status(manager, blocker, ["processing"])
+        queued = manager.start_generation(make_request("text-to-image"))
+
+        with patch.object(manager, "_generate_image") as generate_image:
+            assert manager.cancel_generation(queued) is True
+            manager.cancel_generation(blocker)
+            manager.scheduler.shutdown(wait=True)
+
+        generate_image.assert_not_called()
+        assert manager.get_generation_status(queued).status == "cancelled"
+
+    def test_cancel_releases_partial_resources(self):
+        """Test that resources registered by a generation are released on cancel."""
+        manager = GenerationManager(max_workers=1, simulated_duration=60.0)
+        released = threading.Event()
+        original = manager._generate_video
+
+        def generate_video(context):
+            context.resources.callback(released.set)
+            return original(context)
+
+        manager._generate_video = generate_video
+        generation_id = manager.start_generation(make_request("text-to-video"))
+        wait_for_status(manager, generation_id, ["processing"])
+        manager.cancel_generation(generation_id)
+
+        assert released.wait(1.0)
+
+    def test_cancel_from_other_process(self, tmp_path):
+        """Test that a generation cancelled through a shared registry never runs."""
+        database_url = f"sqlite:///{tmp_path / 'playai.db'}"
+        owner = GenerationManager(
+            max_workers=1,
+            registry=GenerationRegistry(database_url, GenerationResponse),
+            simulated_duration=60.0
+        )
+        blocker = owner.start_generation(make_request())
+        wait_for_status(owner, blocker, ["processing"])
+        queued = owner.start_generation(make_request("text-to-image"))
+        owner.generations.flush()
+
+        other = GenerationManager(
+            max_workers=1,
+            registry=GenerationRegistry(database_url, GenerationResponse)
+        )
+        assert other.get_generation_status(queued).status == "pending"
+        assert other.cancel_generation(queued) is True
+        other.generations.flush()
+
+        owner.cancel_generation(blocker)
+        response = wait_for_status(owner, queued, ["cancelled", "completed"])
+
+        assert response.status == "cancelled"
+
+    def test_status_and_cancel_without_manager(self, tmp_path, monkeypatch):
+        """Test that looking up and cancelling only opens the registry."""
+        database_url = f"sqlite:///{tmp_path / 'playai.db'}"
+        owner = GenerationManager(
+            max_workers=1,
+            registry=GenerationRegistry(database_url, GenerationResponse),
+            simulated_duration=60.0
+        )
+        blocker = owner.start_generation(make_request())
+        wait_for_status(owner, blocker, ["processing"])
+        queued = owner.start_generation(make_request("text-to-image"))
+        owner.generations.flush()
+
+        registry = GenerationRegistry(database_url, GenerationResponse)
+        monkeypatch.setattr(generator, "_generation_manager", None)
+        monkeypatch.setattr(generator, "_generation_registry", registry)
+
+        assert generator.get_generation_status(queued)["status"] == "pending"
+        assert generator.cancel_generation(queued) is True
+        assert generator.cancel_generation("missing") is False
+        assert generator._generation_manager is None
+        registry.flush()
+
+        owner.cancel_generation(blocker)
+        response = wait_for_status(owner, queued, ["cancelled", "completed"])
+
+        assert response.status == "cancelled"
+
+    def test_cancel_finished_generation(self):
+        """Test that finished generations cannot be cancelled."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+        generation_id = manager.start_generation(make_request())
+        wait_for_status(manager, generation_id, ["completed"])
+
+        assert manager.cancel_generation(generation_id) is False
+        assert manager.get_generation_status(generation_id).status == "completed"
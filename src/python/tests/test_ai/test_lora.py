@@ -0,0 +1,73 @@
+"""Tests for the fused LoRA cache."""
+
+from playai.ai.lora import LoraCache, fused_key
+from playai.ai.model_cache import ModelCache
+
+
+def make_cache(budget_bytes=100):
+    """Build a LoRA cache over 10-byte base models that records every load."""
+    calls = {"models": [], "adapters": [], "fused": []}
+
+    def load_model(name):
+        calls["models"].append(name)
+        return {"name": name}, 10
+
+    def load_adapter(name):
+        calls["adapters"].append(name)
+        return {"lora": name}, 1
+
+    def fuse(pipeline, adapter, strength):
+        calls["fused"].append((pipeline["name"], adapter["lora"], strength))
+        return (pipeline, adapter, strength)
+
+    models = ModelCache(100, load_model)
+    return LoraCache(models, load_adapter, fuse, budget_bytes), calls
+
+
+class TestLoraCache:
+    """Test cases for LoraCache."""
+
+    def test_fused_model_reused(self):
+        """Test that the same (model, LoRA, strength) is fused only once."""
+        cache, calls = make_cache()
+
+        for _ in range(3):
+            with cache.acquire("sdxl", "anime-style", 0.8) as fused:
+                assert fused.name == fused_key("sdxl", "anime-style", 0.8)
+
+        assert calls["fused"] == [("sdxl", "anime-style", 0.8)]
+        assert cache.stats()["fused"]["hits"] == 2
+
+    def test_swap_keeps_base_warm(self):
+        """Test that switching LoRAs re-merges without reloading the base model."""
+        cache, calls = make_cache()
+
+        for lora in ("anime-style", "cyberpunk", "anime-style", "cyberpunk"):
+            with cache.acquire("sdxl", lora, 0.8):
+                pass
+
+        assert calls["models"] == ["sdxl"]
+        assert calls["adapters"] == ["anime-style", "cyberpunk"]
+        assert len(calls["fused"]) == 2
+
+    def test_strength_is_part_of_key(self):
+        """Test that different strengths are fused separately, ignoring float noise."""
+        cache, calls = make_cache()
+
+        for strength in (0.8, 0.5, 0.8000001):
+            with cache.acquire("sdxl", "cyberpunk", strength):
+                pass
+
+        assert [fused[2] for fused in calls["fused"]] == [0.8, 0.5]
+
+    def test_evicted_fusion_recomputed(self):
+        """Test that a fused copy evicted under budget is fused again on demand."""
+        cache, calls = make_cache(budget_bytes=15)
+
+        for lora in ("anime-style", "cyberpunk", "anime-style"):
+            with cache.acquire("sdxl", lora, 1.0):
+                pass
+
+        assert len(calls["fused"]) == 3
+        assert calls["adapters"] == ["anime-style", "cyberpunk"]
+        assert cache.stats()["fused"]["evictions"] == 2
@@ -0,0 +1,197 @@
+"""Tests for generation timings and metrics."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from playai.ai import metrics
+from playai.ai.generator import GenerationManager
+from playai.ai.metrics import GenerationMetrics, Histogram, Timings
+from playai.config import settings
+
+from .helpers import make_request, wait_for_status
+
+
+def counts(manager):
+    """Get the generation counters keyed by (model_type, status)."""
+    return {
+        (entry["model_type"], entry["status"]): entry["count"]
+        for entry in manager.metrics.snapshot()["generations"]
+    }
+
+
+class TestTimings:
+    """Test cases for Timings."""
+
+    def test_spans_accumulate(self):
+        """Test that spans of the same stage add up and report in milliseconds."""
+        timings = Timings()
+        timings.add(metrics.INFERENCE, 0.5)
+        with timings.span(metrics.INFERENCE):
+            pass
+        timings.add(metrics.QUEUED, 0.25)
+        timings.finish()
+
+        data = timings.to_dict()
+
+        assert list(data) == ["queued_ms", "inference_ms", "total_ms"]
+        assert 500 <= data["inference_ms"] < 510
+        assert data["queued_ms"] == 250
+
+
+class TestHistogram:
+    """Test cases for Histogram."""
+
+    def test_buckets_and_quantiles(self):
+        """Test cumulative buckets and interpolated quantiles."""
+        histogram = Histogram((1.0, 2.0, 4.0))
+        for value in (0.5, 1.0, 1.5, 3.0, 10.0):
+            histogram.observe(value)
+
+        expected = [(1.0, 2), (2.0, 3), (4.0, 4), (float("inf"), 5)]
+        assert histogram.cumulative() == expected
+        assert histogram.quantile(0.4) == 1.0
+        assert histogram.quantile(0.5) == 1.5
+        assert histogram.quantile(0.99) == 4.0
+        assert Histogram().quantile(0.5) == 0.0
+
+
+class TestGenerationMetrics:
+    """Test cases for GenerationMetrics."""
+
+    def test_snapshot(self):
+        """Test counters, stage summaries and durations per label set."""
+        registry = GenerationMetrics()
+        timings = Timings(start=time.perf_counter() - 1.0)
+        timings.add(metrics.INFERENCE, 0.2)
+        timings.finish()
+        registry.observe("text-to-image", "sdxl", "completed", timings)
+        registry.observe("text-to-image", "sdxl", "cached")
+
+        snapshot = registry.snapshot()
+
+        assert [(e["status"], e["count"]) for e in snapshot["generations"]] == [
+            ("cached", 1), ("completed", 1)
+        ]
+        assert snapshot["stages"][0]["stage"] == "inference"
+        assert snapshot["stages"][0]["sum_ms"] == 200.0
+        assert snapshot["durations"][0]["count"] == 1
+
+    def test_prometheus_text(self):
+        """Test the exposition format, including label escaping."""
+        registry = GenerationMetrics(buckets=(0.1, 1.0))
+        timings = Timings()
+        timings.add(metrics.MODEL_LOAD, 0.5)
+        registry.observe("text-to-image", 'my "model"', "completed", timings)
+
+        lines = registry.to_prometheus()
+
+        labels = 'model_type="text-to-image",model_name="my \\"model\\""'
+        assert "# TYPE playai_generations_total counter" in lines
+        assert f"playai_generations_total{{{labels},status=\"completed\"}} 1" in lines
+        stage = f'{labels},stage="model_load"'
+        assert f'playai_generation_stage_seconds_bucket{{{stage},le="0.1"}} 0' in lines
+        assert f'playai_generation_stage_seconds_bucket{{{stage},le="+Inf"}} 1' in lines
+        assert f"playai_generation_stage_seconds_count{{{stage}}} 1" in lines
+
+
+class TestManagerInstrumentation:
+    """Test cases for the generation manager's timing spans."""
+
+    def test_completed_generation_records_stages(self):
+        """Test that each stage of a run is timed and counted."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.02)
+        generation_id = manager.start_generation(make_request("text-to-image", steps=2))
+
+        response = wait_for_status(manager, generation_id, ["completed"])
+
+        assert "timings" not in response.data
+        stages = {entry["stage"] for entry in manager.metrics.snapshot()["stages"]}
+        assert stages == {"queued", "model_load", "inference", "encode", "write"}
+        assert counts(manager) == {("text-to-image", "completed"): 1}
+
+    def test_timings_block_on_request(self):
+        """Test that the timings parameter attaches a timings block to the result."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.02)
+        request = make_request(max_tokens=2, timings=True)
+        generation_id = manager.start_generation(request)
+
+        response = wait_for_status(manager, generation_id, ["completed"])
+
+        timings = response.data["timings"]
+        assert timings["inference_ms"] >= 15
+        assert timings["total_ms"] >= timings["inference_ms"]
+
+    def test_batch_members_share_inference_time(self):
+        """Test that every member of a batch is charged the batched forward pass."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.05)
+        blocker = manager.start_generation(make_request("text-to-video", frames=1))
+        wait_for_status(manager, blocker, ["processing"])
+        ids = [
+            manager.start_generation(make_request(max_tokens=2, timings=True))
+            for _ in range(3)
+        ]
+
+        results = [
+            wait_for_status(manager, generation_id, ["completed"]).data
+            for generation_id in ids
+        ]
+
+        assert min(result["timings"]["inference_ms"] for result in results) >= 45
+
+    def test_cancellations_counted(self):
+        """Test that queued and running cancellations are both counted."""
+        manager = GenerationManager(max_workers=1, simulated_duration=60.0)
+        running = manager.start_generation(make_request())
+        wait_for_status(manager, running, ["processing"])
+        queued = manager.start_generation(make_request("text-to-image"))
+
+        manager.cancel_generation(queued)
+        manager.cancel_generation(running)
+        manager.scheduler.shutdown(wait=True)
+
+        assert counts(manager) == {
+            ("text-generation", "cancelled"): 1,
+            ("text-to-image", "cancelled"): 1,
+        }
+
+
+class TestGenerationProfiling:
+    """Test cases for per-generation profiling."""
+
+    def test_profile_parameter_references_artifact(self, tmp_path, monkeypatch):
+        """Test that a profiled generation reports its collapsed-stack artifact."""
+        monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+        manager = GenerationManager(max_workers=1, simulated_duration=0.05)
+        request = make_request(max_tokens=2, profile=True)
+        generation_id = manager.start_generation(request)
+
+        response = wait_for_status(manager, generation_id, ["completed"])
+
+        profile = response.data["profile"]
+        assert profile["mode"] == "sampling"
+        assert Path(profile["path"]).parent == tmp_path
+        assert "_run_inference" in Path(profile["path"]).read_text()
+
+    def test_unknown_profiler_rejected_at_submit(self):
+        """Test that an unknown profiler name is refused before queueing."""
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+
+        with pytest.raises(ValueError, match="Unknown profiler"):
+            manager.start_generation(make_request(profile="perf"))
+
+        assert not manager.generations._active
+
+    def test_sampled_profiles_bounded(self, tmp_path, monkeypatch):
+        """Test that only the newest artifacts are kept in the profile directory."""
+        monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+        monkeypatch.setattr(settings, "profile_sample_rate", 1.0)
+        monkeypatch.setattr(settings, "profile_max_files", 2)
+        manager = GenerationManager(max_workers=1, simulated_duration=0.01)
+
+        for _ in range(4):
+            generation_id = manager.start_generation(make_request(max_tokens=2))
+            wait_for_status(manager, generation_id, ["completed"])
+
+        assert len(list(tmp_path.glob("*.collapsed"))) == 2
@@ -0,0 +1,106 @@
+"""Tests for the model pipeline cache."""
+
+import threading
+import time
+
+import pytest
+
+from playai.ai.model_cache import ModelCache
+
+
+def sized_loader(sizes, calls=None):
+    """Build a loader returning placeholder pipelines with fixed sizes."""
+    def load(name):
+        if calls is not None:
+            calls.append(name)
+        return {"name": name}, sizes[name]
+    return load
+
+
+class TestModelCache:
+    """Test cases for ModelCache."""
+
+    def test_hit_after_miss(self):
+        """Test that a second acquire reuses the loaded pipeline."""
+        calls = []
+        cache = ModelCache(100, sized_loader({"a": 10}, calls))
+
+        with cache.acquire("a") as first:
+            pass
+        with cache.acquire("a") as second:
+            pass
+
+        assert first is second
+        assert calls == ["a"]
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["resident_bytes"] == 10
+
+    def test_lru_eviction(self):
+        """Test that the least recently used model is evicted over budget."""
+        cache = ModelCache(25, sized_loader({"a": 10, "b": 10, "c": 10}))
+
+        for name in ("a", "b", "a", "c"):
+            with cache.acquire(name):
+                pass
+
+        assert list(cache.resident()) == ["a", "c"]
+        assert cache.stats()["evictions"] == 1
+
+    def test_pinned_model_not_evicted(self):
+        """Test that a model in use survives eviction pressure."""
+        cache = ModelCache(15, sized_loader({"a": 10, "b": 10}))
+
+        with cache.acquire("a"):
+            with cache.acquire("b"):
+                assert set(cache.resident()) == {"a", "b"}
+                assert cache.evict("a") is False
+            assert list(cache.resident()) == ["a"]
+
+        assert cache.stats()["resident_bytes"] == 10
+
+    def test_concurrent_loads_deduplicated(self):
+        """Test that concurrent misses for one model load it only once."""
+        calls = []
+
+        def slow_loader(name):
+            calls.append(name)
+            time.sleep(0.05)
+            return object(), 1
+
+        cache = ModelCache(100, slow_loader)
+        models = []
+
+        def worker():
+            with cache.acquire("a") as model:
+                models.append(model)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ["a"]
+        assert len({id(model) for model in models}) == 1
+
+    def test_failed_load_not_cached(self):
+        """Test that a loader error propagates and a later acquire retries."""
+        attempts = []
+
+        def flaky_loader(name):
+            attempts.append(name)
+            if len(attempts) == 1:
+                raise OSError("checkpoint missing")
+            return object(), 1
+
+        cache = ModelCache(100, flaky_loader)
+
+        with pytest.raises(OSError):
+            with cache.acquire("a"):
+                pass
+        with cache.acquire("a"):
+            pass
+
+        assert len(attempts) == 2
@@ -0,0 +1,98 @@
+"""Tests for raw output buffers."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import playai
+from playai.ai.outputs import MMAP, SHM, OutputHandle, OutputStore, open_output
+
+# Reads an output handle given as JSON and prints its contents
+READ_OUTPUT = """
+import json, sys
+from playai.ai.outputs import open_output
+with open_output(json.loads(sys.argv[1])) as view:
+    print(json.dumps(view.tolist()))
+"""
+
+
+class TestOutputHandle:
+    """Test cases for OutputHandle."""
+
+    def test_dict_round_trip(self):
+        """Test that handles survive conversion to JSON-friendly dictionaries."""
+        handle = OutputHandle(MMAP, "outputs/raw/gen.raw", (2, 3), "int16", offset=8)
+
+        assert handle.nbytes == 12
+        assert handle.to_dict()["shape"] == [2, 3]
+        assert OutputHandle.from_dict(handle.to_dict()) == handle
+
+
+class TestOutputStore:
+    """Test cases for OutputStore."""
+
+    @pytest.mark.parametrize("kind", [MMAP, SHM])
+    def test_written_output_visible_to_readers(self, tmp_path, kind):
+        """Test that writes through one mapping are seen by another."""
+        store = OutputStore(tmp_path)
+        handle = store.allocate("gen-1", kind, (2, 2), "float32")
+
+        with open_output(handle, writable=True) as view:
+            view[1, 0] = 0.5
+        with open_output(handle.to_dict()) as view:
+            assert view.tolist() == [[0.0, 0.0], [0.5, 0.0]]
+
+        assert store.release("gen-1")
+        assert store.get("gen-1") is None
+        with pytest.raises(OSError):
+            with open_output(handle):
+                pass
+
+    def test_shm_output_survives_reader_processes(self, tmp_path):
+        """Test that a reader process exiting does not free the producer's block."""
+        store = OutputStore(tmp_path)
+        handle = store.allocate("gen-1", SHM, (3,), "int16")
+        with open_output(handle, writable=True) as view:
+            view[2] = 7
+        env = dict(os.environ, PYTHONPATH=str(Path(playai.__file__).parent.parent))
+
+        for _ in range(2):
+            result = subprocess.run(
+                [sys.executable, "-c", READ_OUTPUT, json.dumps(handle.to_dict())],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            assert json.loads(result.stdout) == [0, 0, 7]
+            assert "leaked" not in result.stderr
+
+        assert store.release("gen-1")
+
+    def test_mmap_is_read_only_by_default(self, tmp_path):
+        """Test that readers cannot modify the output by accident."""
+        handle = OutputStore(tmp_path).allocate("gen-1", MMAP, (4,), "uint8")
+
+        with open_output(handle) as view:
+            with pytest.raises(TypeError):
+                view[0] = 1
+
+    def test_close_keeps_mmap_files(self, tmp_path):
+        """Test that closing frees shared memory but leaves files on disk."""
+        store = OutputStore(tmp_path)
+        store.allocate("gen-1", MMAP, (4,), "uint8")
+        store.allocate("gen-2", SHM, (4,), "uint8")
+
+        store.close()
+
+        assert store.generation_ids() == ("gen-1",)
+        assert (tmp_path / "gen-1.raw").exists()
+
+    def test_rejects_unknown_dtype(self, tmp_path):
+        """Test that only known dtypes can be allocated."""
+        with pytest.raises(ValueError):
+            OutputStore(tmp_path).allocate("gen-1", SHM, (4,), "float64")
@@ -0,0 +1,107 @@
+"""Tests for the process-pool stage and shared-memory buffers."""
+
+import array
+import pickle
+from concurrent.futures import Future
+
+import pytest
+
+from playai.ai.cancellation import CancellationToken, GenerationCancelled
+from playai.ai.process_pool import ProcessStage, SharedBuffer
+from playai.ai.processing import resample_linear, to_pcm16
+
+
+class TestSharedBuffer:
+    """Test cases for SharedBuffer."""
+
+    def test_typed_view(self):
+        """Test that views are cast to the buffer's format and shape."""
+        data = array.array("f", [0.5, -1.0, 2.0, 0.0, 1.5, -0.5])
+        with SharedBuffer.from_bytes(data, shape=(2, 3), format="f") as buffer:
+            with buffer.view() as view:
+                assert view.shape == (2, 3)
+                assert view[1, 1] == 1.5
+            assert buffer.tobytes() == data.tobytes()
+
+    def test_pickles_by_name(self):
+        """Test that a pickled buffer attaches to the same memory."""
+        with SharedBuffer(4, format="B") as buffer:
+            payload = pickle.dumps(buffer)
+            assert len(payload) < 200
+
+            attached = pickle.loads(payload)
+            with attached.view() as view:
+                view[0] = 42
+            attached.close()
+
+            with buffer.view() as view:
+                assert view[0] == 42
+
+    def test_rejects_partial_items(self):
+        """Test that the size must be a whole number of items."""
+        with pytest.raises(ValueError):
+            SharedBuffer(3, format="f")
+
+
+class TestProcessingStages:
+    """Test cases for the post-processing stage functions."""
+
+    def test_resample_linear(self):
+        """Test linear interpolation to a new length."""
+        source = SharedBuffer.from_bytes(array.array("f", [0.0, 1.0, 0.0]), format="f")
+        target = SharedBuffer(5 * 4, format="f")
+        with source, target:
+            assert resample_linear(source, target) == 5
+            samples = array.array("f", target.tobytes()).tolist()
+            assert samples == [0.0, 0.5, 1.0, 0.5, 0.0]
+
+    def test_to_pcm16_clips(self):
+        """Test conversion to 16-bit PCM with clipping."""
+        samples = array.array("f", [0.0, 0.5, 2.0, -2.0])
+        source = SharedBuffer.from_bytes(samples, format="f")
+        target = SharedBuffer(4 * 2, format="h")
+        with source, target:
+            assert to_pcm16(source, target) == 2
+            pcm = array.array("h", target.tobytes()).tolist()
+            assert pcm == [0, 16383, 32767, -32767]
+
+
+class TestProcessStage:
+    """Test cases for ProcessStage."""
+
+    def test_inline(self):
+        """Test that stages run on the calling thread without workers."""
+        stage = ProcessStage(max_workers=0)
+
+        assert stage.run(sum, [1, 2, 3]) == 6
+        assert stage.stats() == {"workers": 0, "started": False, "submitted": 1}
+
+    def test_inline_errors_propagate(self):
+        """Test that a failing stage raises in the caller."""
+        with pytest.raises(ZeroDivisionError):
+            ProcessStage().run(divmod, 1, 0)
+
+    def test_worker_writes_shared_memory(self):
+        """Test that a worker process fills the caller's shared buffer."""
+        stage = ProcessStage(max_workers=1)
+        source = SharedBuffer.from_bytes(array.array("f", [0.0, 0.25, 1.0]), format="f")
+        target = SharedBuffer(3 * 2, format="h")
+        try:
+            with source, target:
+                assert stage.run(to_pcm16, source, target) == 0
+                assert array.array("h", target.tobytes()).tolist() == [0, 8191, 32767]
+            assert stage.stats()["started"]
+        finally:
+            stage.shutdown()
+
+    def test_cancelled_wait(self, monkeypatch):
+        """Test that a cancelled token stops waiting for a pending stage."""
+        stage = ProcessStage(max_workers=1, poll_interval=0.01)
+        pending = Future()
+        monkeypatch.setattr(stage, "submit", lambda fn, *args: pending)
+        token = CancellationToken()
+        token.cancel()
+
+        with pytest.raises(GenerationCancelled):
+            stage.run(sum, [1], token=token)
+        assert pending.cancelled()
@@ -0,0 +1,250 @@
+"""Tests for the SQLite generation registry."""
+
+import os
+import subprocess
+import sys
+import time
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+import pytest
+
+import playai
+from playai.ai.generator import GenerationResponse
+from playai.ai.registry import ORPHANED_ERROR, GenerationRegistry, sqlite_path
+
+
+def make_registry(path, **kwargs):
+    return GenerationRegistry(f"sqlite:///{path}", GenerationResponse, **kwargs)
+
+
+def make_response(generation_id, status="pending", success=False):
+    return GenerationResponse(
+        success=success, generation_id=generation_id, status=status
+    )
+
+
+def finish(registry, generation_id, status="completed"):
+    """Record a generation and move it to a terminal status."""
+    response = make_response(generation_id, success=True)
+    registry.add(response, "text-generation")
+    response.status = status
+    registry.save(generation_id)
+    return response
+
+
+class TestSqlitePath:
+    """Test cases for sqlite_path."""
+
+    def test_urls(self):
+        """Test database URL parsing."""
+        assert sqlite_path("sqlite:///data/playai.db") == "data/playai.db"
+        assert sqlite_path("sqlite:////var/lib/playai.db") == "/var/lib/playai.db"
+        assert sqlite_path("sqlite://") == ":memory:"
+        assert sqlite_path(None) == "outputs/playai.db"
+        assert sqlite_path("postgresql://localhost/db") == "outputs/playai.db"
+
+
+class TestGenerationRegistry:
+    """Test cases for GenerationRegistry."""
+
+    def test_shared_between_instances(self, tmp_path):
+        """Test that a second registry on the same file sees flushed state."""
+        path = tmp_path / "playai.db"
+        writer = make_registry(path)
+        response = make_response("g1")
+        writer.add(response, "text-to-image")
+        response.status = "completed"
+        response.success = True
+        response.data = {"url": "image.png"}
+        writer.save("g1")
+        writer.flush()
+
+        loaded = make_registry(path).get("g1")
+
+        assert loaded.status == "completed"
+        assert loaded.data == {"url": "image.png"}
+        assert make_registry(path).get("missing") is None
+
+    def test_cancellation_is_final(self, tmp_path):
+        """Test that a cancel from another process is not overwritten."""
+        path = tmp_path / "playai.db"
+        owner = make_registry(path)
+        response = make_response("g1")
+        owner.add(response, "text-generation")
+        owner.flush()
+
+        other = make_registry(path)
+        other.get("g1").status = "cancelled"
+        other.save("g1")
+        other.flush()
+
+        response.status = "completed"
+        owner.save("g1")
+        owner.flush()
+
+        assert owner.persisted_status("g1") == "cancelled"
+
+    def test_front_cache_bounded(self, tmp_path):
+        """Test that finished generations are evicted from memory but stay readable."""
+        registry = make_registry(tmp_path / "playai.db", cache_size=2)
+        for i in range(5):
+            response = make_response(f"g{i}", success=True)
+            registry.add(response, "text-generation")
+            response.status = "completed"
+            registry.save(f"g{i}")
+
+        assert len(registry._recent) == 2
+        assert not registry._active
+        assert registry.get("g0").status == "completed"
+
+    def test_purge(self, tmp_path):
+        """Test that purge deletes finished generations only."""
+        registry = make_registry(tmp_path / "playai.db")
+        for generation_id, status in [
+            ("a", "completed"), ("b", "failed"), ("c", "pending")
+        ]:
+            response = make_response(generation_id, status)
+            registry.add(response, "text-generation")
+            registry.save(generation_id)
+
+        assert registry.purge() == 2
+        assert registry.get("a") is None
+        assert registry.get("c").status == "pending"
+
+
+class TestOrphans:
+    """Test cases for generations left behind by exited processes."""
+
+    def test_rows_of_exited_process_failed_on_open(self, tmp_path):
+        """Test that a process's unfinished generations fail once it has exited."""
+        path = tmp_path / "playai.db"
+        code = (
+            "import sys\n"
+            "from playai.ai.generator import GenerationResponse\n"
+            "from playai.ai.registry import GenerationRegistry\n"
+            "registry = GenerationRegistry(sys.argv[1], GenerationResponse)\n"
+            "for status in ('pending', 'processing'):\n"
+            "    response = GenerationResponse(\n"
+            "        success=False, generation_id=status, status=status\n"
+            "    )\n"
+            "    registry.add(response, 'text-generation')\n"
+            "registry.flush()\n"
+        )
+        env = dict(os.environ, PYTHONPATH=str(Path(playai.__file__).parent.parent))
+        subprocess.run(
+            [sys.executable, "-c", code, f"sqlite:///{path}"], env=env, check=True
+        )
+
+        registry = make_registry(path)
+
+        for generation_id in ("pending", "processing"):
+            response = registry.get(generation_id)
+            assert response.status == "failed"
+            assert response.error == ORPHANED_ERROR
+            assert registry.snapshot(generation_id).version == 2
+
+    def test_own_rows_left_alone(self, tmp_path):
+        """Test that opening a second registry does not fail live generations."""
+        path = tmp_path / "playai.db"
+        first = make_registry(path)
+        first.add(
+            GenerationResponse(success=False, generation_id="a", status="pending"),
+            "text-generation"
+        )
+        first.flush()
+
+        assert make_registry(path).persisted_status("a") == "pending"
+
+
+class TestEviction:
+    """Test cases for TTL and size-bounded eviction."""
+
+    def test_ttl(self, tmp_path):
+        """Test that finished generations expire after the TTL."""
+        registry = make_registry(tmp_path / "playai.db", ttl=60)
+        finish(registry, "old")
+        active = make_response("active", "processing")
+        registry.add(active, "text-generation")
+        registry.flush()
+
+        assert registry.reap(now=time.time() + 30) == 0
+        assert registry.reap(now=time.time() + 61) == 1
+        assert registry.get("old") is None
+        assert registry.get("active") is active
+
+    def test_max_entries_evicts_oldest(self, tmp_path):
+        """Test that only the most recently finished generations are kept."""
+        registry = make_registry(tmp_path / "playai.db", max_entries=2)
+        for generation_id in ("a", "b", "c"):
+            finish(registry, generation_id)
+        registry.flush()
+
+        assert registry.reap() == 1
+        assert registry.get("a") is None
+        assert registry.get("b") is not None
+        assert registry.get("c") is not None
+
+    def test_sweeps_rows_from_other_processes(self, tmp_path):
+        """Test that expired rows written by another registry are deleted too."""
+        path = tmp_path / "playai.db"
+        other = make_registry(path)
+        finish(other, "foreign")
+        other.flush()
+
+        registry = make_registry(path, ttl=60)
+
+        assert registry.reap(now=time.time() + 61) == 0
+        assert registry.persisted_status("foreign") is None
+
+
+class TestSnapshots:
+    """Test cases for versioned status snapshots."""
+
+    def test_versions_increase_and_snapshots_are_immutable(self, tmp_path):
+        """Test that each change publishes a new snapshot with a higher version."""
+        registry = make_registry(tmp_path / "playai.db")
+        response = make_response("g1")
+        registry.add(response, "text-generation")
+        first = registry.snapshot("g1")
+
+        response.status = "processing"
+        registry.save("g1")
+        second = registry.snapshot("g1")
+
+        assert (first.status, first.version) == ("pending", 1)
+        assert (second.status, second.version) == ("processing", 2)
+        with pytest.raises(FrozenInstanceError):
+            second.status = "completed"
+
+    def test_snapshot_of_other_process_generation_refreshed(self, tmp_path):
+        """Test that a generation running elsewhere is not served stale."""
+        path = tmp_path / "playai.db"
+        a = make_registry(path)
+        b = make_registry(path)
+        response = make_response("g1")
+        a.add(response, "text-generation")
+        response.status = "processing"
+        a.save("g1")
+        a.flush()
+        assert b.snapshot("g1").status == "processing"
+
+        response.status = "completed"
+        response.success = True
+        a.save("g1")
+        a.flush()
+
+        assert b.persisted_status("g1") == "completed"
+        assert b.snapshot("g1").status == "completed"
+        assert b.snapshot("g1").version == a.snapshot("g1").version
+        assert b.get("g1").success is True
+
+    def test_version_persisted(self, tmp_path):
+        """Test that another registry sees the same version."""
+        path = tmp_path / "playai.db"
+        registry = make_registry(path)
+        finish(registry, "g1")
+        registry.flush()
+
+        assert make_registry(path).snapshot("g1").version == 2
+        assert make_registry(path).snapshot("missing") is None
@@ -0,0 +1,54 @@
+"""Tests for the on-disk result cache."""
+
+from playai.ai.result_cache import ResultCache, request_fingerprint
+
+
+class TestRequestFingerprint:
+    """Test cases for request_fingerprint."""
+
+    def test_unseeded_not_cacheable(self):
+        """Test that requests without a seed get no fingerprint."""
+        assert request_fingerprint("text-to-image", "cat", {"steps": 20}) is None
+
+    def test_canonical(self):
+        """Test that parameter order does not matter but every input does."""
+        def image(prompt, **parameters):
+            return request_fingerprint("text-to-image", prompt, parameters)
+
+        base = image("cat", seed=1, steps=20)
+
+        assert base == image("cat", steps=20, seed=1)
+        assert base != image("cat", seed=2, steps=20)
+        assert base != image("dog", seed=1, steps=20)
+        assert base != request_fingerprint(
+            "text-to-image", "cat", {"seed": 1, "steps": 20}, lora_name="cyberpunk"
+        )
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+
+    def test_round_trip_and_persistence(self, tmp_path):
+        """Test that stored results survive a new cache instance."""
+        ResultCache(tmp_path, 1024).put("ab12", {"url": "image.png"})
+
+        cache = ResultCache(tmp_path, 1024)
+
+        assert cache.get("ab12") == {"url": "image.png"}
+        assert cache.get("cd34") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_size_eviction_is_lru(self, tmp_path):
+        """Test that the least recently used results are deleted over budget."""
+        cache = ResultCache(tmp_path, 60)
+        cache.put("aa", {"value": "x" * 10})
+        cache.put("bb", {"value": "x" * 10})
+        cache.get("aa")
+        cache.put("cc", {"value": "x" * 10})
+
+        assert cache.get("bb") is None
+        assert cache.get("aa") is not None
+        assert cache.get("cc") is not None
+        assert cache.stats()["bytes"] <= 60
+        assert not (tmp_path / "bb" / "bb.json").exists()
@@ -0,0 +1,126 @@
+"""Tests for the generation scheduler."""
+
+import threading
+from functools import partial
+
+import pytest
+
+from playai.ai import generator
+from playai.ai.generator import GenerationManager
+from playai.ai.scheduler import GenerationScheduler, QueueFullError
+
+
+def blocker(scheduler, model_type="text-generation"):
+    """Occupy a worker until the returned event is set."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def run():
+        started.set()
+        release.wait(5)
+
+    scheduler.submit("blocker", model_type, run)
+    assert started.wait(5)
+    return release
+
+
+class TestGenerationScheduler:
+    """Test cases for GenerationScheduler."""
+
+    def test_priority_order_within_type(self):
+        """Test that higher priority jobs run first within a model type."""
+        scheduler = GenerationScheduler(max_workers=1)
+        release = blocker(scheduler)
+        order = []
+
+        for name, priority in [("low", 0), ("high", 10), ("mid", 5), ("low2", 0)]:
+            scheduler.submit(
+                name, "text-to-image", lambda n=name: order.append(n), priority
+            )
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+        assert order == ["high", "mid", "low", "low2"]
+
+    def test_short_jobs_not_starved_by_video_backlog(self):
+        """Test weighted fair sharing between model types."""
+        scheduler = GenerationScheduler(max_workers=1)
+        release = blocker(scheduler)
+        order = []
+
+        backlog = [("video", "text-to-video"), ("text", "text-generation")]
+        for kind, model_type in backlog:
+            for i in range(4):
+                scheduler.submit(f"{kind}{i}", model_type, partial(order.append, kind))
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+        assert order.index("text") <= 1
+        assert order[:5].count("text") == 4
+
+    def test_concurrency_limit_per_type(self):
+        """Test that a model type never exceeds its concurrency limit."""
+        scheduler = GenerationScheduler(
+            max_workers=4, concurrency_limits={"text-to-video": 1}
+        )
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def run():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.01)
+            with lock:
+                running[0] -= 1
+
+        for i in range(5):
+            scheduler.submit(f"video{i}", "text-to-video", run)
+        scheduler.shutdown(wait=True)
+
+        assert peak[0] == 1
+
+    def test_queue_full(self):
+        """Test that submissions beyond the queue bound are rejected."""
+        scheduler = GenerationScheduler(max_workers=1, max_queue_size=2)
+        release = blocker(scheduler)
+
+        scheduler.submit("a", "text-generation", lambda: None)
+        scheduler.submit("b", "text-generation", lambda: None)
+        with pytest.raises(QueueFullError):
+            scheduler.submit("c", "text-generation", lambda: None)
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+    def test_cancel_queued_job(self):
+        """Test that a cancelled queued job never runs."""
+        scheduler = GenerationScheduler(max_workers=1)
+        release = blocker(scheduler)
+        ran = []
+
+        scheduler.submit("a", "text-generation", lambda: ran.append("a"))
+        assert scheduler.cancel("a") is True
+        assert scheduler.queue_depth()["text-generation"] == 0
+
+        release.set()
+        scheduler.shutdown(wait=True)
+
+        assert ran == []
+
+    def test_drain_finishes_queued_jobs(self, monkeypatch):
+        """Test that a one-shot process can run what it started before exiting."""
+        scheduler = GenerationScheduler(max_workers=1)
+        manager = GenerationManager(scheduler=scheduler)
+        monkeypatch.setattr(generator, "_generation_manager", manager)
+        release = blocker(scheduler)
+        ran = []
+        scheduler.submit("a", "text-generation", lambda: ran.append("a"))
+
+        release.set()
+        generator.drain_generations()
+
+        assert ran == ["a"]
@@ -0,0 +1,172 @@
+"""Tests for the load-testing harness."""
+
+import pytest
+
+from playai.ai.generator import (
+    GenerationManager,
+    GenerationRequest,
+    GenerationResponse,
+    parse_request
+)
+from playai.ai.registry import GenerationRegistry
+from playai.bench.load import (
+    Arrival,
+    CostModel,
+    ManagerTarget,
+    load_trace,
+    parse_mix,
+    run_load,
+    save_trace,
+    synthesize
+)
+
+
+def make_manager(costs, max_workers=2, max_queue_size=64):
+    """Create a manager with an in-memory registry and fixed inference costs."""
+    return GenerationManager(
+        max_workers=max_workers,
+        max_queue_size=max_queue_size,
+        registry=GenerationRegistry("sqlite://", GenerationResponse),
+        inference_cost=CostModel(costs, jitter=0)
+    )
+
+
+def request(model_type="text-generation"):
+    """Build a generate request for a trace."""
+    return {"model_type": model_type, "prompt": "load", "parameters": {}}
+
+
+class TestTraces:
+    """Test cases for trace synthesis and trace files."""
+
+    def test_poisson_is_reproducible(self):
+        """Test that a seed fixes the trace and the rate is roughly honoured."""
+        first = synthesize(50, 20, seed=7)
+        second = synthesize(50, 20, seed=7)
+
+        assert [a.to_dict() for a in first] == [a.to_dict() for a in second]
+        assert 800 < len(first) < 1200
+        assert all(a.at < b.at for a, b in zip(first, first[1:]))
+
+    def test_mix_and_cancellation(self):
+        """Test that only mixed-in types appear and cancellations are drawn."""
+        arrivals = synthesize(
+            100, 5, mix={"text-to-image": 1, "text-to-video": 0},
+            cancel_fraction=0.5, cancel_after=0.2, seed=1
+        )
+
+        assert {a.request["model_type"] for a in arrivals} == {"text-to-image"}
+        cancelled = [a.cancel_after for a in arrivals if a.cancel_after is not None]
+        assert 0.3 * len(arrivals) < len(cancelled) < 0.7 * len(arrivals)
+        assert all(0 <= delay <= 0.2 for delay in cancelled)
+
+    def test_bursty_concentrates_arrivals(self):
+        """Test that bursty traces send most requests during bursts."""
+        arrivals = synthesize(
+            20, 100, pattern="bursty", burst_factor=4, burst_period=10, seed=3
+        )
+
+        in_bursts = sum(1 for a in arrivals if a.at % 10 < 2)
+        assert in_bursts > 0.7 * len(arrivals)
+
+    def test_unknown_pattern(self):
+        """Test that unknown arrival patterns are refused."""
+        with pytest.raises(ValueError):
+            synthesize(1, 1, pattern="sawtooth")
+
+    def test_trace_round_trip(self, tmp_path):
+        """Test that saved traces load back in time order."""
+        path = tmp_path / "trace.ndjson"
+        trace = [Arrival(1.5, request()), Arrival(0.5, request("text-to-image"), 0.25)]
+        save_trace(trace, path)
+
+        arrivals = load_trace(path)
+
+        assert [a.at for a in arrivals] == [0.5, 1.5]
+        assert arrivals[0].cancel_after == 0.25
+        assert arrivals[0].request == request("text-to-image")
+
+    def test_parse_mix(self):
+        """Test request mix parsing."""
+        assert parse_mix("text-to-image=3, text-generation=1") == {
+            "text-to-image": 3.0, "text-generation": 1.0
+        }
+        with pytest.raises(ValueError):
+            parse_mix("text-to-image")
+        with pytest.raises(ValueError):
+            parse_mix("text-to-image=0")
+
+
+class TestCostModel:
+    """Test cases for CostModel."""
+
+    def test_fixed_costs(self):
+        """Test that without jitter every request costs its scaled mean."""
+        costs = CostModel({"text-to-image": 0.4}, jitter=0, scale=0.5, default=1.0)
+
+        assert costs(GenerationRequest("text-to-image", "p", {})) == 0.2
+        assert costs(GenerationRequest("text-to-video", "p", {})) == 0.5
+
+    def test_jitter_keeps_mean(self):
+        """Test that jittered costs vary around the mean."""
+        costs = CostModel({"text-to-image": 1.0}, jitter=0.5, seed=2)
+        image = GenerationRequest("text-to-image", "p", {})
+        samples = [costs(image) for _ in range(5000)]
+
+        assert len(set(samples)) > 1
+        assert 0.9 < sum(samples) / len(samples) < 1.1
+
+
+class TestRunLoad:
+    """Test cases for run_load against an in-process manager."""
+
+    def test_report(self):
+        """Test counts, per-type latency and queue depth samples."""
+        manager = make_manager({"text-generation": 0.01, "text-to-image": 0.02})
+        arrivals = [
+            Arrival(i * 0.005, request("text-to-image" if i % 2 else "text-generation"))
+            for i in range(10)
+        ]
+
+        report = run_load(
+            arrivals, ManagerTarget(manager), sample_interval=0.01, drain_timeout=5
+        )
+
+        assert report["counts"] == {"completed": 10}
+        assert report["by_type"]["text-to-image"] == {"submitted": 5, "completed": 5}
+        assert set(report["latency"]) == {"text-generation", "text-to-image"}
+        assert report["latency"]["text-to-image"]["p50_ms"] >= 20
+        assert report["throughput_rps"] > 0
+        assert report["queue_depth"]["samples"]
+
+    def test_cancellation_and_rejection(self):
+        """Test that cancellations are timed and a full queue rejects requests."""
+        manager = make_manager(
+            {"text-to-video": 60.0}, max_workers=1, max_queue_size=1
+        )
+        arrivals = []
+        for i in range(3):
+            # Distinct batch keys, so queued requests cannot share one batch
+            data = dict(request("text-to-video"), parameters={"lora_strength": i})
+            arrivals.append(Arrival(i * 0.05, data, cancel_after=0.2))
+
+        report = run_load(arrivals, ManagerTarget(manager), drain_timeout=5)
+
+        assert report["counts"] == {"cancelled": 2, "rejected": 1}
+        assert report["cancellation"]["iterations"] == 2
+        assert report["elapsed_s"] < 5
+
+    def test_queue_depth_counts_batched_requests(self):
+        """Test that requests waiting in one batch each count towards the depth."""
+        manager = make_manager({"text-to-video": 60.0}, max_workers=1)
+        target = ManagerTarget(manager)
+        # The video occupies the only worker while the images wait in one batch
+        kinds = ["text-to-video"] + ["text-to-image"] * 3
+        ids = [manager.start_generation(parse_request(request(k))) for k in kinds]
+
+        try:
+            assert sum(manager.scheduler.queue_depth().values()) < 3
+            assert target.queue_depth()["text-to-image"] == 3
+        finally:
+            for generation_id in ids:
+                manager.cancel_generation(generation_id)
@@ -0,0 +1,141 @@
+"""Tests for the benchmark runner."""
+
+import json
+from contextlib import contextmanager
+
+import pytest
+
+from playai.bench import all_benchmarks, select
+from playai.bench.runner import (
+    Benchmark,
+    compare_reports,
+    load_report,
+    measure,
+    operation,
+    percentile,
+    run_benchmarks,
+    summarize
+)
+
+
+def report(**p50s):
+    """Build a minimal report with the given p50 latencies."""
+    benchmarks = {
+        name: {"p50_ms": value, "p95_ms": value} for name, value in p50s.items()
+    }
+    return {"benchmarks": benchmarks}
+
+
+class TestSummaries:
+    """Test cases for percentile and summarize."""
+
+    def test_nearest_rank_percentiles(self):
+        """Test percentiles over 1..100."""
+        samples = list(range(1, 101))
+
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+        assert percentile([], 50) == 0.0
+
+    def test_summarize(self):
+        """Test that summaries are computed from unsorted samples."""
+        summary = summarize([3.0, 1.0, 2.0, 4.0])
+
+        assert summary["iterations"] == 4
+        assert summary["min_ms"] == 1.0
+        assert summary["max_ms"] == 4.0
+        assert summary["mean_ms"] == 2.5
+        assert summary["p50_ms"] == 2.0
+
+
+class TestMeasure:
+    """Test cases for measure and run_benchmarks."""
+
+    def test_setup_and_iteration_cap(self):
+        """Test that setup runs once and warmup plus iterations call the operation."""
+        calls = {"setup": 0, "op": 0}
+
+        @contextmanager
+        def setup():
+            calls["setup"] += 1
+            yield lambda: calls.__setitem__("op", calls["op"] + 1)
+
+        benchmark = Benchmark("counted", setup, iterations=100, warmup=2)
+        summary = measure(benchmark, max_iterations=5)
+
+        assert summary["iterations"] == 5
+        assert calls == {"setup": 1, "op": 7}
+
+    def test_self_timed(self):
+        """Test that self-timed operations supply their own samples."""
+        benchmark = Benchmark(
+            "fixed", operation(lambda: 12.5), iterations=3, self_timed=True
+        )
+
+        assert measure(benchmark)["p99_ms"] == 12.5
+
+    def test_report(self):
+        """Test that reports hold one summary per benchmark."""
+        seen = []
+        result = run_benchmarks(
+            [Benchmark("noop", operation(lambda: None), iterations=3)],
+            progress=lambda name, summary: seen.append(name)
+        )
+
+        assert set(result["benchmarks"]) == {"noop"}
+        assert seen == ["noop"]
+        json.dumps(result)
+
+
+class TestCompareReports:
+    """Test cases for compare_reports and load_report."""
+
+    def test_flags_only_slowdowns_over_threshold(self):
+        """Test that regressions beyond the threshold are reported."""
+        baseline = report(fast=1.0, slow=1.0, gone=1.0)
+        current = report(fast=0.5, slow=1.5, new=9.0)
+
+        regressions = compare_reports(current, baseline, threshold=0.2)
+
+        assert {(r["benchmark"], r["metric"]) for r in regressions} == {
+            ("slow", "p50_ms"), ("slow", "p95_ms")
+        }
+        assert regressions[0]["change"] == 0.5
+        assert compare_reports(current, baseline, threshold=0.6) == []
+
+    def test_load_enveloped_report(self, tmp_path):
+        """Test that reports saved through the CLI envelope can be loaded."""
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({"status": "success", "data": report(a=1.0)}))
+
+        assert load_report(path) == report(a=1.0)
+
+        path.write_text(json.dumps({"status": "success", "data": None}))
+        with pytest.raises(ValueError):
+            load_report(path)
+
+
+class TestSuites:
+    """Test cases for the bundled benchmark suites."""
+
+    def test_names_unique_and_selectable(self):
+        """Test that every suite registers uniquely named benchmarks."""
+        names = [benchmark.name for benchmark in all_benchmarks()]
+
+        assert len(names) == len(set(names))
+        assert {name.split(".")[0] for name in names} == {
+            "helpers", "output", "catalog", "generation", "startup"
+        }
+        assert [b.name for b in select(all_benchmarks(), ["helpers.flatten*"])] == [
+            "helpers.flatten_dict"
+        ]
+
+    def test_in_process_suites_run(self):
+        """Test that the in-process benchmarks run end to end."""
+        benchmarks = [b for b in all_benchmarks() if not b.name.startswith("startup.")]
+
+        result = run_benchmarks(benchmarks, max_iterations=2)
+
+        summaries = result["benchmarks"].values()
+        assert all(summary["iterations"] == 2 for summary in summaries)
@@ -0,0 +1,58 @@
+"""Tests for the Prometheus metrics endpoint and the daemon client."""
+
+import asyncio
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from playai.server.client import call
+from playai.server.metrics_http import start_metrics_server
+from playai.server.socket_server import SocketServer
+
+
+class TestMetricsEndpoint:
+    """Test cases for the /metrics endpoint."""
+
+    def test_scrape(self):
+        """Test that /metrics serves the text exposition format."""
+        server = start_metrics_server(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert "# TYPE playai_generations_total counter" in body
+        assert "# TYPE playai_queue_depth gauge" in body
+
+
+class TestClient:
+    """Test cases for the synchronous daemon client."""
+
+    def test_call_metrics(self):
+        """Test reading metrics and errors from a running socket daemon."""
+        loop = asyncio.new_event_loop()
+        server = SocketServer(port=0)
+        loop.run_until_complete(server.start())
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            address = f"127.0.0.1:{server.port}"
+            data = call(address, "metrics")
+            with pytest.raises(RuntimeError):
+                call(address, "nope")
+        finally:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+        assert {"generations", "stages", "durations", "queue"} <= set(data)
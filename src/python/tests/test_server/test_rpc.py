@@ -0,0 +1,150 @@
+"""Tests for the JSON-lines RPC server."""
+
+import io
+import json
+from unittest.mock import patch
+
+from playai.ai.generator import get_generation_manager
+from playai.server.rpc import RPCServer
+
+
+def run_server(lines, **kwargs):
+    """Feed request lines through a server and return decoded responses."""
+    reader = io.StringIO("".join(json.dumps(line) + "\n" for line in lines))
+    writer = io.StringIO()
+    RPCServer(reader, writer, **kwargs).serve_forever()
+    return [json.loads(line) for line in writer.getvalue().splitlines()]
+
+
+class TestRPCServer:
+    """Test cases for RPCServer."""
+
+    def test_ping(self):
+        """Test a simple request round trip."""
+        responses = run_server([{"id": 1, "method": "ping"}])
+
+        assert responses == [
+            {"id": 1, "status": "success", "data": {"pong": True},
+             "timestamp": responses[0]["timestamp"]}
+        ]
+
+    def test_unknown_method(self):
+        """Test that unknown methods return an error with the request id."""
+        responses = run_server([{"id": "a", "method": "nope"}])
+
+        assert responses[0]["id"] == "a"
+        assert responses[0]["status"] == "error"
+        assert "Unknown method" in responses[0]["message"]
+
+    def test_invalid_json(self):
+        """Test that malformed lines are reported without stopping the server."""
+        reader = io.StringIO('{"id": 1,\n{"id": 2, "method": "ping"}\n')
+        writer = io.StringIO()
+        RPCServer(reader, writer).serve_forever()
+        responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+
+        by_id = {response["id"]: response for response in responses}
+        assert by_id[None]["status"] == "error"
+        assert by_id[2]["status"] == "success"
+
+    def test_concurrent_requests_all_answered(self):
+        """Test that many in-flight requests each get exactly one response."""
+        responses = run_server(
+            [{"id": i, "method": "list-models"} for i in range(50)],
+            max_concurrency=4
+        )
+
+        assert sorted(response["id"] for response in responses) == list(range(50))
+        assert all(response["status"] == "success" for response in responses)
+
+    def test_list_models_query(self):
+        """Test that list parameters switch to a paginated catalog query."""
+        responses = run_server([
+            {"id": 1, "method": "list-models"},
+            {
+                "id": 2,
+                "method": "list-models",
+                "params": {"model_type": "text-to-image", "limit": 1},
+            },
+        ])
+        by_id = {response["id"]: response for response in responses}
+
+        assert isinstance(by_id[1]["data"], list)
+        page = by_id[2]["data"]
+        assert len(page["items"]) == 1
+        assert page["items"][0]["model_type"] == "text-to-image"
+        assert page["total"] >= 1
+
+    def test_queue_stats(self):
+        """Test that the queue method reports depths and limits."""
+        responses = run_server([{"id": 1, "method": "queue"}])
+
+        data = responses[0]["data"]
+        assert set(data) == {
+            "pending", "queued", "running", "max_workers", "max_queue_size"
+        }
+        assert data["max_workers"] == get_generation_manager().scheduler.max_workers
+
+    def test_status_shares_manager_across_requests(self):
+        """Test that status sees generations started by an earlier request."""
+        server = RPCServer(io.StringIO(), io.StringIO())
+
+        with patch.object(get_generation_manager(), "simulated_duration", 0.01):
+            started = server.dispatch({
+                "id": 1,
+                "method": "generate",
+                "params": {"model_type": "text-generation", "prompt": "hi"}
+            })
+            generation_id = started["data"]["generation_id"]
+            status = server.dispatch({
+                "id": 2,
+                "method": "status",
+                "params": {"generation_id": generation_id}
+            })
+
+        assert status["status"] == "success"
+        assert status["data"]["generation_id"] == generation_id
+
+    def test_status_since_version(self):
+        """Test that status reports unchanged generations compactly."""
+        server = RPCServer(io.StringIO(), io.StringIO())
+
+        with patch.object(get_generation_manager(), "simulated_duration", 60.0):
+            started = server.dispatch({
+                "id": 1,
+                "method": "generate",
+                "params": {"model_type": "text-generation", "prompt": "hi"}
+            })
+            generation_id = started["data"]["generation_id"]
+            params = {"generation_id": generation_id}
+            current = server.dispatch({"id": 2, "method": "status", "params": params})
+            version = current["data"]["version"]
+            unchanged = server.dispatch({
+                "id": 3,
+                "method": "status",
+                "params": dict(params, since_version=version)
+            })
+            server.dispatch({"id": 4, "method": "cancel", "params": params})
+            changed = server.dispatch({
+                "id": 5,
+                "method": "status",
+                "params": dict(params, since_version=version)
+            })
+
+        assert unchanged["data"] == {
+            "generation_id": generation_id,
+            "version": version,
+            "changed": False
+        }
+        assert changed["data"]["changed"] is True
+        assert changed["data"]["status"] == "cancelled"
+
+    def test_shutdown(self):
+        """Test that shutdown stops reading further requests."""
+        responses = run_server([
+            {"id": 1, "method": "shutdown"},
+            {"id": 2, "method": "ping"},
+        ])
+
+        assert [response["id"] for response in responses] == [1]
+        assert responses[0]["data"] == {"shutdown": True}
@@ -0,0 +1,131 @@
+"""Tests for the asyncio socket server."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from playai.ai.generator import get_generation_manager
+from playai.server.socket_server import SocketServer
+
+
+async def request(reader, writer, message):
+    """Send one request and read one response line."""
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestSocketServer:
+    """Test cases for SocketServer."""
+
+    def test_tcp_ping(self):
+        """Test a request round trip over loopback TCP."""
+        async def scenario():
+            server = SocketServer(port=0)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            response = await request(reader, writer, {"id": 7, "method": "ping"})
+            writer.close()
+            await server.close()
+            return response
+
+        response = run(scenario())
+
+        assert response["id"] == 7
+        assert response["data"] == {"pong": True}
+
+    def test_unix_socket_many_clients(self, tmp_path):
+        """Test that several clients are served concurrently."""
+        path = str(tmp_path / "playai.sock")
+
+        async def client(index):
+            reader, writer = await asyncio.open_unix_connection(path)
+            response = await request(reader, writer, {"id": index, "method": "poll",
+                                                      "params": {"generation_id": "x"}})
+            writer.close()
+            return response
+
+        async def scenario():
+            server = SocketServer(path=path)
+            await server.start()
+            responses = await asyncio.gather(*(client(i) for i in range(20)))
+            await server.close()
+            return responses
+
+        responses = run(scenario())
+
+        assert sorted(response["id"] for response in responses) == list(range(20))
+        assert all(response["status"] == "error" for response in responses)
+
+    def test_connection_limit(self):
+        """Test that connections beyond the limit are rejected."""
+        async def scenario():
+            server = SocketServer(port=0, max_connections=1)
+            await server.start()
+            first = await asyncio.open_connection("127.0.0.1", server.port)
+            await request(*first, {"id": 1, "method": "ping"})
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            rejected = json.loads(await reader.readline())
+            first[1].close()
+            writer.close()
+            await server.close()
+            return rejected
+
+        rejected = run(scenario())
+
+        assert rejected["status"] == "error"
+        assert rejected["message"] == "Too many connections"
+
+    def test_overlong_line_rejected(self):
+        """Test that an over-long line is answered with an error, not dropped."""
+        async def scenario():
+            server = SocketServer(port=0, max_line_bytes=1024)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            ping = json.dumps({"id": 1, "method": "ping"}).encode() + b"\n"
+            writer.write(ping + b"x" * 4096 + b"\n")
+            await writer.drain()
+            responses = [json.loads(line) async for line in reader]
+            writer.close()
+            await server.close()
+            return responses
+
+        responses = {response["id"]: response for response in run(scenario())}
+
+        assert responses[1]["data"] == {"pong": True}
+        assert responses[None]["status"] == "error"
+        assert responses[None]["message"] == "Request line exceeds 1024 bytes"
+
+    def test_submit_and_subscribe(self):
+        """Test that subscribe streams progress events until the generation finishes."""
+        async def scenario():
+            server = SocketServer(port=0)
+            await server.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            started = await request(reader, writer, {
+                "id": 1,
+                "method": "submit",
+                "params": {"model_type": "text-generation", "prompt": "hi"}
+            })
+            generation_id = started["data"]["generation_id"]
+            updates = [await request(reader, writer, {
+                "id": 2,
+                "method": "subscribe",
+                "params": {"generation_id": generation_id}
+            })]
+            while not updates[-1].get("done"):
+                updates.append(json.loads(await reader.readline()))
+            writer.close()
+            await server.close()
+            return updates
+
+        with patch.object(get_generation_manager(), "simulated_duration", 0.01):
+            updates = run(scenario())
+
+        assert all(update["id"] == 2 for update in updates)
+        assert updates[-1]["event"] == "completed"
+        assert updates[-1]["data"]["data"]["type"] == "text"
@@ -10,7 +10,8 @@ from playai.utils.helpers import (
     flatten_dict,
     get_nested_value,
     sanitize_string,
-    truncate_string
+    truncate_string,
+    utc_timestamp
 )
 
 
@@ -62,6 +63,24 @@ class TestFormatResponse:
         assert result["data"] == data
         assert "timestamp" in result
     
+    def test_format_response_timestamp_format(self):
+        """Test that timestamps keep the utcnow().isoformat() + "Z" format."""
+        before = datetime.utcnow().replace(microsecond=0)
+        timestamp = format_response(None)["timestamp"]
+        after = datetime.utcnow()
+        
+        assert timestamp.endswith("Z")
+        assert before <= datetime.fromisoformat(timestamp[:-1]) <= after
+    
+    def test_utc_timestamp_monotonic_within_second(self):
+        """Test that cached date prefixes still produce increasing timestamps."""
+        stamps = [utc_timestamp() for _ in range(1000)]
+        
+        def parse(stamp):
+            return datetime.fromisoformat(stamp[:-1])
+
+        assert stamps == sorted(stamps, key=parse)
+    
     def test_format_response_with_message(self):
         """Test response formatting with message."""
         data = {"test": "data"}
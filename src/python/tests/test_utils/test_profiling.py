@@ -0,0 +1,130 @@
+"""Tests for the built-in profilers."""
+
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from playai.utils.profiling import (
+    CPROFILE,
+    MEMORY,
+    SAMPLING,
+    SamplingProfiler,
+    artifact_path,
+    profile,
+    prune
+)
+
+
+def busy(seconds):
+    """Spin for a while so the sampler sees this frame."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestProfile:
+    """Test cases for the profile context manager."""
+
+    def test_cprofile_writes_pstats(self, tmp_path):
+        """Test that cProfile artifacts load with pstats."""
+        path = tmp_path / "nested" / "run.pstats"
+        with profile(CPROFILE, path) as artifact:
+            busy(0.01)
+
+        assert artifact == path
+        stats = pstats.Stats(str(path))
+        assert any(name == "busy" for _, _, name in stats.stats)
+
+    def test_sampling_writes_collapsed_stacks(self, tmp_path):
+        """Test that collapsed stacks name the sampled function."""
+        path = tmp_path / "run.collapsed"
+        with profile(SAMPLING, path, interval=0.001):
+            busy(0.1)
+
+        lines = path.read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert any("busy (test_profiling.py" in line for line in lines)
+
+    def test_memory_writes_snapshot(self, tmp_path):
+        """Test that memory profiles load as tracemalloc snapshots and stop tracing."""
+        path = tmp_path / "run.tracemalloc"
+        with profile(MEMORY, path):
+            data = [bytearray(1024) for _ in range(100)]
+
+        snapshot = tracemalloc.Snapshot.load(str(path))
+        assert snapshot.statistics("lineno")
+        assert not tracemalloc.is_tracing()
+        del data
+
+    def test_unknown_profiler(self, tmp_path):
+        """Test that unknown profilers are refused before anything runs."""
+        with pytest.raises(ValueError):
+            with profile("perf", tmp_path / "x"):
+                pass
+
+    def test_artifact_path(self, tmp_path):
+        """Test artifact naming per profiler."""
+        path = artifact_path(tmp_path, "gen-1", SAMPLING)
+
+        assert path.parent == tmp_path
+        assert path.name.startswith("gen-1-")
+        assert path.suffix == ".collapsed"
+
+
+class TestPrune:
+    """Test cases for prune."""
+
+    def test_keeps_newest_artifacts(self, tmp_path):
+        """Test that the oldest artifacts go and other files stay."""
+        for i in range(4):
+            path = tmp_path / f"gen-{i}.collapsed"
+            path.write_text("")
+            os.utime(path, (i, i))
+        (tmp_path / "notes.txt").write_text("")
+
+        assert prune(tmp_path, 2) == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "gen-2.collapsed", "gen-3.collapsed", "notes.txt"
+        ]
+
+    def test_unbounded_and_missing_directory(self, tmp_path):
+        """Test that a zero limit keeps everything and a missing directory is fine."""
+        (tmp_path / "gen.pstats").write_text("")
+
+        assert prune(tmp_path, 0) == 0
+        assert prune(tmp_path / "missing", 1) == 0
+        assert (tmp_path / "gen.pstats").exists()
+
+
+class TestSamplingProfiler:
+    """Test cases for SamplingProfiler."""
+
+    def test_samples_only_target_thread(self):
+        """Test that another thread's stacks are sampled, not the caller's."""
+        ready = threading.Event()
+
+        def worker():
+            ready.set()
+            busy(0.1)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        ready.wait()
+        sampler = SamplingProfiler(thread.ident, interval=0.001)
+        sampler.start()
+        thread.join()
+        sampler.stop()
+
+        assert sampler.samples > 0
+        stacks = sampler.collapsed()
+        assert all(
+            stack.split(";")[-1].startswith(("busy", "worker")) or "busy" in stack
+            for stack in stacks
+        )
+        assert not any("test_samples_only_target_thread" in stack for stack in stacks)
@@ -0,0 +1,35 @@
+"""Startup regression tests for lightweight CLI commands."""
+
+import pytest
+
+from playai.utils.startup import STARTUP_COMMANDS, measure_startup, parse_importtime
+
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 | encodings
+import time:       200 |        300 |   json.decoder
+import time:       400 |        700 | json
+import time:       500 |       1500 | playai.cli
+import time:        50 |       2000 | playai.ai
+"""
+
+
+class TestParseImporttime:
+    """Test cases for parse_importtime."""
+
+    def test_counts_from_first_playai_import(self):
+        """Test that interpreter startup imports are excluded."""
+        total, modules = parse_importtime(SAMPLE)
+
+        assert total == pytest.approx(3.5)
+        assert modules["json.decoder"] == pytest.approx(0.3)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("command", sorted(STARTUP_COMMANDS))
+def test_lightweight_command_startup(command, tmp_path):
+    """Test that lightweight commands stay in budget and skip heavy imports."""
+    report = measure_startup(command, cwd=str(tmp_path))
+
+    assert report.heavy_modules == []
+    assert report.within_budget, f"{command} took {report.import_ms:.1f} ms"
@@ -0,0 +1,98 @@
+"""Tests for CLI output encodings."""
+
+import io
+import json
+import sys
+
+import pytest
+
+from playai.utils.helpers import format_response
+from playai.utils.wire import check_format, read_frames, write_response
+
+
+def encode(response, fmt):
+    """Encode a response into bytes."""
+    stream = io.BytesIO()
+    write_response(response, stream, fmt)
+    return stream.getvalue()
+
+
+class TestWriteResponse:
+    """Test cases for write_response."""
+
+    def test_pretty_and_compact_json(self):
+        """Test that both JSON formats decode to the same response."""
+        response = format_response([{"name": "a"}, {"name": "b"}])
+
+        pretty = encode(response, "pretty")
+        compact = encode(response, "json")
+
+        assert json.loads(pretty) == json.loads(compact) == response
+        assert len(compact) < len(pretty)
+        assert compact.count(b"\n") == 1
+
+    def test_ndjson_list_one_record_per_line(self):
+        """Test that list results are written one record per line."""
+        response = format_response([{"name": "a"}, {"name": "b"}])
+        lines = encode(response, "ndjson").splitlines()
+
+        assert [json.loads(line) for line in lines] == [{"name": "a"}, {"name": "b"}]
+
+    def test_ndjson_streams_iterators(self):
+        """Test that records from an iterator are written as they are produced."""
+        stream = io.BytesIO()
+        seen = []
+
+        def records():
+            for i in range(3):
+                seen.append(stream.getvalue().count(b"\n"))
+                yield {"i": i}
+
+        write_response(format_response(records()), stream, "ndjson")
+
+        assert seen == [0, 1, 2]
+        assert stream.getvalue().count(b"\n") == 3
+
+    def test_ndjson_page_trailer(self):
+        """Test that catalog pages end with their total and cursor."""
+        page = {"items": [{"name": "a"}], "total": 5, "next_cursor": "cDA="}
+        lines = encode(format_response(page), "ndjson").splitlines()
+
+        assert json.loads(lines[-1]) == {"total": 5, "next_cursor": "cDA="}
+
+    def test_ndjson_error_is_one_envelope(self):
+        """Test that errors keep their status and message."""
+        response = format_response(None, status="error", message="boom")
+        lines = encode(response, "ndjson").splitlines()
+
+        assert [json.loads(line) for line in lines] == [response]
+
+    def test_json_materializes_iterators(self):
+        """Test that non-streaming formats collect iterator data into a list."""
+        response = format_response(iter([1, 2]))
+
+        assert json.loads(encode(response, "json"))["data"] == [1, 2]
+
+    def test_msgpack_frames(self):
+        """Test that msgpack responses round-trip through length-prefixed frames."""
+        pytest.importorskip("msgpack")
+        response = format_response({"name": "a"})
+        stream = io.BytesIO(encode(response, "msgpack") * 2)
+
+        assert list(read_frames(stream)) == [response, response]
+
+
+class TestCheckFormat:
+    """Test cases for check_format."""
+
+    def test_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            check_format("xml")
+
+    def test_missing_msgpack(self, monkeypatch):
+        """Test that msgpack without the package fails with an install hint."""
+        monkeypatch.setitem(sys.modules, "msgpack", None)
+
+        with pytest.raises(ValueError, match="pip install msgpack"):
+            check_format("msgpack")